@@ -0,0 +1 @@
+"""Бенчмарки продуктивності бібліотечної системи (запуск: ``python -m benchmarks.<назва>``)."""
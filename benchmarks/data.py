@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import random
+from datetime import date, datetime, time, timedelta
+from contextlib import contextmanager
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Iterable, Iterator
+
+from flask import Flask
+from sqlalchemy import Integer, cast, func, insert, select
+from werkzeug.security import generate_password_hash
+
+from library_app import create_app
+from library_app.models import db
+from library_app.models.book import Book
+from library_app.models.notification import Notification, NotificationKind
+from library_app.models.payment import Payment
+from library_app.models.reader import Reader, ReaderCategory
+from library_app.models.rental import Rental
+from library_app.models.user import User, UserRole
+from library_app.services import notification_repository, reader_stats_repository, revenue_repository
+
+TITLE_WORDS = (
+    "Тіні", "забутих", "предків", "Кобзар", "Лісова", "пісня", "Місто", "Собор", "Сад",
+    "Дорога", "Зоря", "Вітер", "Ніч", "Сонце", "Музика", "Пам'ять", "Шлях", "Острів",
+    "Shadow", "River", "Garden", "Winter", "Silent", "Kingdom", "Stone", "Light",
+)
+AUTHORS = (
+    "Тарас Шевченко", "Леся Українка", "Іван Франко", "Ліна Костенко", "Сергій Жадан",
+    "Valerian Pidmohylny", "Mykola Khvylovy", "Оксана Забужко", "Андрій Курков",
+)
+GENRES = ("Фентезі", "Поезія", "Проза", "Драма", "Детектив", "Історія", "Наука", "Poetry")
+SYLLABLES = ("ка", "ро", "ли", "ва", "ну", "те", "ми", "за", "бо", "ші", "да", "ле", "ти", "го")
+# Рідкісні слова (≈2.7k варіантів) дають вибіркові запити поряд із частими словами.
+RARE_WORDS = tuple(a + b + c for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES)
+# Пароль усіх згенерованих користувачів; перший користувач — адміністратор.
+PASSWORD = "bench-password"
+
+
+@contextmanager
+def temporary_app(**config: object) -> Iterator[Flask]:
+    """Створює застосунок над тимчасовою SQLite-базою з чистою схемою."""
+    with TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}", **config})
+        with app.app_context():
+            db.create_all()
+            yield app
+            db.session.remove()
+            db.engine.dispose()
+
+
+def book_rows(count: int, seed: int = 20) -> Iterator[dict[str, object]]:
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield {
+            "title": " ".join((*rng.sample(TITLE_WORDS, 2), rng.choice(RARE_WORDS))),
+            "author": rng.choice(AUTHORS),
+            "genre": rng.choice(GENRES),
+            "collateral_value": float(rng.randint(50, 500)),
+            "daily_rent_price": float(rng.randint(5, 40)),
+            "available_copies": rng.randint(0, 5),
+        }
+
+
+def reader_rows(count: int, seed: int = 20) -> Iterator[dict[str, object]]:
+    rng = random.Random(seed)
+    categories = list(ReaderCategory)
+    for index in range(count):
+        yield {
+            "full_name": f"{rng.choice(AUTHORS)} {index}",
+            "address": f"вул. Бібліотечна, {rng.randint(1, 200)}",
+            "phone": f"+380{rng.randint(100000000, 999999999)}",
+            "category": rng.choice(categories),
+        }
+
+
+def rental_rows(
+    count: int, books: int, readers: int, today: date, active_share: float = 0.3, seed: int = 20
+) -> Iterator[dict[str, object]]:
+    """Оренди за останній рік; частка active_share ще не повернена (частина з них прострочена)."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        rent_date = today - timedelta(days=rng.randint(0, 365))
+        due_date = rent_date + timedelta(days=rng.choice((7, 14, 21, 30)))
+        returned = rng.random() >= active_share
+        return_date = min(due_date + timedelta(days=rng.randint(-5, 5)), today) if returned else None
+        yield {
+            "book_id": rng.randint(1, books),
+            "reader_id": rng.randint(1, readers),
+            "rent_date": rent_date,
+            "due_date": due_date,
+            "return_date": return_date,
+        }
+
+
+def user_email(reader_id: int) -> str:
+    return f"reader{reader_id}@bench.example"
+
+
+def user_rows(count: int) -> Iterator[dict[str, object]]:
+    """Облікові записи для читачів 1..count; хеш пароля обчислюється один раз."""
+    password_hash = generate_password_hash(PASSWORD)
+    for reader_id in range(1, count + 1):
+        yield {
+            "email": user_email(reader_id),
+            "password_hash": password_hash,
+            "full_name": f"Користувач {reader_id}",
+            "role": UserRole.ADMIN if reader_id == 1 else UserRole.USER,
+            "reader_id": reader_id,
+        }
+
+
+def notification_rows(
+    count: int, readers: int, rentals: int, today: date, seed: int = 20
+) -> Iterator[dict[str, object]]:
+    """Нагадування за останні 90 днів; приблизно половина вже прочитана."""
+    rng = random.Random(seed)
+    kinds = list(NotificationKind)
+    for _ in range(count):
+        day = today - timedelta(days=rng.randint(0, 90))
+        yield {
+            "reader_id": rng.randint(1, readers),
+            "rental_id": rng.randint(1, rentals),
+            "kind": rng.choice(kinds),
+            "message": f"Нагадування про книгу №{rng.randint(1, 10_000)}",
+            "created_at": datetime.combine(day, time(hour=rng.randint(8, 20))),
+            "is_read": rng.random() < 0.5,
+        }
+
+
+def _bulk_insert(model, rows: Iterable[dict[str, object]], chunk_size: int = 10_000) -> None:
+    chunk: list[dict[str, object]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            db.session.execute(insert(model), chunk)
+            chunk.clear()
+    if chunk:
+        db.session.execute(insert(model), chunk)
+    db.session.commit()
+
+
+def seed_books(count: int, seed: int = 20) -> None:
+    _bulk_insert(Book, book_rows(count, seed))
+
+
+def seed_readers(count: int, seed: int = 20) -> None:
+    _bulk_insert(Reader, reader_rows(count, seed))
+
+
+def seed_rentals(count: int, books: int, readers: int, today: date | None = None, **kwargs) -> None:
+    _bulk_insert(Rental, rental_rows(count, books, readers, today or date.today(), **kwargs))
+
+
+def seed_users(count: int) -> None:
+    _bulk_insert(User, user_rows(count))
+
+
+def seed_payments() -> None:
+    """Платіж за кожну повернену оренду: добова ставка книги × кількість днів (одним INSERT ... SELECT)."""
+    days = cast(func.julianday(Rental.return_date) - func.julianday(Rental.rent_date), Integer) + 1
+    source = (
+        select(Rental.id, Book.daily_rent_price * days, func.datetime(Rental.return_date))
+        .join(Book, Book.id == Rental.book_id)
+        .where(Rental.return_date.is_not(None))
+    )
+    db.session.execute(
+        insert(Payment).from_select(["rental_id", "total_amount", "paid_date"], source)
+    )
+    db.session.commit()
+
+
+def seed_notifications(count: int, readers: int, rentals: int, today: date | None = None, seed: int = 20) -> None:
+    _bulk_insert(Notification, notification_rows(count, readers, rentals, today or date.today(), seed))
+
+
+def seed_library(
+    books: int, readers: int, rentals: int, notifications: int, seed: int = 20
+) -> dict[str, int]:
+    """Детермінована бібліотека заданого розміру; повертає кількість рядків у кожній таблиці."""
+    today = date.today()
+    seed_books(books, seed)
+    seed_readers(readers, seed)
+    seed_users(readers)
+    seed_rentals(rentals, books, readers, today, seed=seed)
+    seed_payments()
+    revenue_repository.rebuild()
+    reader_stats_repository.rebuild()
+    seed_notifications(notifications, readers, rentals, today, seed)
+    notification_repository.recount_unread()
+    return {
+        model.__tablename__: db.session.scalar(select(func.count()).select_from(model))
+        for model in (Book, Reader, User, Rental, Payment, Notification)
+    }
+
+
+__all__ = [
+    "PASSWORD",
+    "RARE_WORDS",
+    "temporary_app",
+    "book_rows",
+    "reader_rows",
+    "rental_rows",
+    "user_rows",
+    "notification_rows",
+    "user_email",
+    "seed_books",
+    "seed_readers",
+    "seed_rentals",
+    "seed_users",
+    "seed_payments",
+    "seed_notifications",
+    "seed_library",
+]
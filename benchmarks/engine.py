@@ -0,0 +1,90 @@
+"""Змішане навантаження (читання каталогу + оренди) для різних профілів рушія БД.
+
+    python -m benchmarks.engine --profiles legacy balanced throughput --seconds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+
+from flask import current_app
+
+from benchmarks.data import seed_books, seed_readers, temporary_app
+from library_app.config import ENGINE_PROFILES
+from library_app.models import db
+from library_app.services import book_repository
+from library_app.services.rental_service import RentalError, rental_service
+
+BOOKS = 20_000
+READERS = 1_000
+SEARCHES = ("каролі", "вануте", "бошіда", "летиго", "зами")
+
+
+def run(profile: str, readers: int, writers: int, seconds: float) -> dict[str, float]:
+    with temporary_app(DATABASE_PROFILE=profile):
+        app = current_app._get_current_object()
+        seed_books(BOOKS)
+        seed_readers(READERS)
+
+        counters = {"reads": 0, "writes": 0, "errors": 0}
+        lock = threading.Lock()
+        stop = threading.Event()
+
+        def count(kind: str) -> None:
+            with lock:
+                counters[kind] += 1
+
+        def reader(offset: int) -> None:
+            with app.app_context():
+                step = offset
+                while not stop.is_set():
+                    book_repository.search_available(SEARCHES[step % len(SEARCHES)])
+                    book_repository.get(step % BOOKS + 1)
+                    count("reads")
+                    step += 1
+                db.session.remove()
+
+        def writer(offset: int) -> None:
+            with app.app_context():
+                step = offset
+                while not stop.is_set():
+                    try:
+                        rental_service.rent_book(step % BOOKS + 1, step % READERS + 1, days=7)
+                        count("writes")
+                    except RentalError:
+                        pass
+                    except Exception:  # noqa: BLE001 — "database is locked" рахуємо як збій
+                        db.session.rollback()
+                        count("errors")
+                    step += 7
+                db.session.remove()
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+        threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        return {kind: value / seconds for kind, value in counters.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--profiles", nargs="+", default=list(ENGINE_PROFILES))
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'profile':>12} {'reads/s':>10} {'writes/s':>10} {'errors/s':>10}")
+    for profile in args.profiles:
+        result = run(profile, args.readers, args.writers, args.seconds)
+        print(f"{profile:>12} {result['reads']:>10.1f} {result['writes']:>10.1f} {result['errors']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
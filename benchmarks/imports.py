@@ -0,0 +1,51 @@
+"""Швидкість масового імпорту книг із CSV.
+
+    python -m benchmarks.imports --sizes 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from benchmarks.data import book_rows, temporary_app
+from library_app.services.import_service import DEFAULT_CHUNK_SIZE, import_records, read_records
+
+COLUMNS = ("title", "author", "genre", "collateral_value", "daily_rent_price", "available_copies")
+
+
+def write_csv(path: Path, count: int) -> None:
+    with path.open("w", newline="", encoding="utf-8") as stream:
+        writer = csv.DictWriter(stream, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(book_rows(count))
+
+
+def run(size: int, chunk_size: int) -> dict[str, float]:
+    with TemporaryDirectory() as tmp, temporary_app():
+        source = Path(tmp) / "books.csv"
+        write_csv(source, size)
+        started = time.perf_counter()
+        with source.open(encoding="utf-8", newline="") as stream:
+            report = import_records("books", read_records(stream, "csv"), Path(tmp) / "errors.csv", chunk_size)
+        elapsed = time.perf_counter() - started
+        return {"imported": report.imported, "seconds": elapsed, "rows_per_s": report.imported / elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    print(f"{'books':>10} {'seconds':>10} {'rows/s':>10}")
+    for size in args.sizes:
+        result = run(size, args.chunk_size)
+        print(f"{result['imported']:>10} {result['seconds']:>10.1f} {result['rows_per_s']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Час генерації сповіщень про прострочення (NotificationService.check_all_rentals).
+
+    python -m benchmarks.notifications --active 1000 10000 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from benchmarks.data import seed_books, seed_readers, seed_rentals, temporary_app
+from library_app.services.notification_service import NotificationService
+
+BOOKS = 2_000
+READERS = 5_000
+
+
+def run(active: int) -> dict[str, float]:
+    with temporary_app():
+        seed_books(BOOKS)
+        seed_readers(READERS)
+        # Усі оренди активні; приблизно половина з них прострочена.
+        seed_rentals(active, BOOKS, READERS, active_share=1.0)
+        NotificationService.bootstrap()
+
+        started = time.perf_counter()
+        NotificationService.check_all_rentals()
+        first = time.perf_counter() - started
+
+        started = time.perf_counter()
+        NotificationService.check_all_rentals()
+        repeat = time.perf_counter() - started
+        return {"first_s": first, "repeat_s": repeat}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--active", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    args = parser.parse_args()
+
+    print(f"{'active':>10} {'first, s':>10} {'repeat, s':>10}")
+    for active in args.active:
+        result = run(active)
+        print(f"{active:>10} {result['first_s']:>10.3f} {result['repeat_s']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Порівняння латентності пошуку в каталозі: FTS5 проти ILIKE.
+
+    python -m benchmarks.search --sizes 10000 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+from benchmarks.data import seed_books, temporary_app
+from library_app.services import book_repository
+
+# Вибіркові запити (рідкісні слова, збіг за префіксом) та широкі (часті слова).
+SELECTIVE_QUERIES = ("каролі", "вануте", "бошіда", "летиго")
+BROAD_QUERIES = ("Кобзар", "лісова пісня", "Шевч", "Фентезі")
+
+
+def _measure(search, queries: tuple[str, ...], repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        for query in queries:
+            started = time.perf_counter()
+            search(query)
+            samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def run(size: int, repeats: int) -> dict[str, float]:
+    with temporary_app():
+        seed_books(size)
+        result = {}
+        for kind, queries in (("selective", SELECTIVE_QUERIES), ("broad", BROAD_QUERIES)):
+            result[f"{kind}_fts_ms"] = _measure(book_repository.search_available, queries, repeats)
+            result[f"{kind}_ilike_ms"] = _measure(book_repository._search_ilike, queries, repeats)
+        return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'books':>10} {'query':>10} {'fts, ms':>10} {'ilike, ms':>10}")
+    for size in args.sizes:
+        result = run(size, args.repeats)
+        for kind in ("selective", "broad"):
+            fts, ilike = result[f"{kind}_fts_ms"], result[f"{kind}_ilike_ms"]
+            print(f"{size:>10} {kind:>10} {fts:>10.2f} {ilike:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
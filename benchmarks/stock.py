@@ -0,0 +1,75 @@
+"""Конкурентна оренда однієї популярної книги: пропускна здатність та перевірка на перепродаж.
+
+    python -m benchmarks.stock --threads 1 4 8 --copies 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+
+from flask import current_app
+
+from benchmarks.data import seed_books, seed_readers, temporary_app
+from library_app.models import db
+from library_app.services import book_repository
+from library_app.services.rental_service import RentalError, rental_service
+
+READERS = 100
+
+
+def run(threads: int, copies: int) -> dict[str, float]:
+    with temporary_app():
+        app = current_app._get_current_object()
+        seed_books(1)
+        seed_readers(READERS)
+        book = book_repository.get(1)
+        book.available_copies = copies
+        book_repository.update()
+
+        rented: list[int] = []
+        barrier = threading.Barrier(threads + 1)
+
+        def worker(offset: int) -> None:
+            with app.app_context():
+                barrier.wait()
+                attempt = offset
+                while True:
+                    try:
+                        rental_service.rent_book(1, attempt % READERS + 1, days=7)
+                    except RentalError:
+                        break
+                    rented.append(1)
+                    attempt += threads
+                db.session.remove()
+
+        pool = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+        for thread in pool:
+            thread.start()
+        barrier.wait()
+        started = time.perf_counter()
+        for thread in pool:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        db.session.expire_all()
+        remaining = book_repository.get(1).available_copies
+        assert len(rented) == copies and remaining == 0, "oversold or lost stock"
+        return {"rentals_per_s": copies / elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--copies", type=int, default=2_000)
+    args = parser.parse_args()
+
+    print(f"{'threads':>8} {'rentals/s':>10}")
+    for threads in args.threads:
+        result = run(threads, args.copies)
+        print(f"{threads:>8} {result['rentals_per_s']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
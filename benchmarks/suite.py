@@ -0,0 +1,193 @@
+"""Наскрізні сценарії над синтетичною бібліотекою з JSON-звітом для порівняння між комітами.
+
+    python -m benchmarks.suite --scale small --output bench.json
+    python -m benchmarks.suite --scale small --output new.json --compare bench.json
+
+Кожен сценарій — HTTP-запити через тестовий клієнт Flask до бази, заповненої
+``benchmarks.data.seed_library``. Кеш каталогу вимкнено, щоб вимірювати роботу з БД.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import platform
+import sqlite3
+import statistics
+import subprocess
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable
+
+from flask.testing import FlaskClient
+from sqlalchemy import select
+
+from benchmarks.data import PASSWORD, RARE_WORDS, seed_library, temporary_app, user_email
+from library_app.models import db
+from library_app.models.book import Book
+
+SCALES = {
+    "small": {"books": 10_000, "readers": 2_000, "rentals": 50_000, "notifications": 20_000},
+    "medium": {"books": 100_000, "readers": 20_000, "rentals": 500_000, "notifications": 200_000},
+    "large": {"books": 1_000_000, "readers": 100_000, "rentals": 5_000_000, "notifications": 2_000_000},
+}
+
+
+@dataclass
+class Stats:
+    """Статистика у стилі pytest-benchmark (секунди на один виклик сценарію)."""
+
+    rounds: int
+    min: float
+    max: float
+    mean: float
+    median: float
+    stddev: float
+    ops: float
+
+    @classmethod
+    def of(cls, samples: list[float]) -> "Stats":
+        mean = statistics.fmean(samples)
+        return cls(
+            rounds=len(samples),
+            min=min(samples),
+            max=max(samples),
+            mean=mean,
+            median=statistics.median(samples),
+            stddev=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            ops=1 / mean if mean else 0.0,
+        )
+
+
+def login(client: FlaskClient, reader_id: int) -> None:
+    response = client.post("/auth/login", data={"email": user_email(reader_id), "password": PASSWORD})
+    if response.status_code != 302:
+        raise RuntimeError(f"login failed for reader {reader_id}: {response.status_code}")
+
+
+def _expect(response, *statuses: int) -> None:
+    if response.status_code not in statuses:
+        raise RuntimeError(f"{response.request.method} {response.request.path} -> {response.status_code}")
+
+
+def build_scenarios(admin: FlaskClient, reader: FlaskClient, reader_id: int) -> dict[str, Callable[[], None]]:
+    queries = itertools.cycle(RARE_WORDS[::97] + ("Кобзар", "лісова пісня", "Шевч"))
+    stocked = db.session.scalars(select(Book.id).where(Book.available_copies > 0).limit(1_000)).all()
+    books = itertools.cycle(stocked)
+    today = date.today()
+    financial = f"/reports/financial?start={today - timedelta(days=365)}&end={today}"
+    json_headers = {"Accept": "application/json"}
+
+    def catalog_search() -> None:
+        _expect(reader.get("/store/", query_string={"q": next(queries)}), 200)
+
+    def rent_return() -> None:
+        rented = admin.post("/rentals/", json={"book_id": next(books), "reader_id": reader_id, "days": 7})
+        _expect(rented, 201)
+        returned = admin.post(f"/rentals/{rented.get_json()['id']}/return", json={})
+        _expect(returned, 200)
+
+    return {
+        "catalog_search": catalog_search,
+        "rent_return": rent_return,
+        "reports_overview": lambda: _expect(admin.get("/reports/"), 200),
+        "reports_financial": lambda: _expect(admin.get(financial), 200),
+        "notifications_admin": lambda: _expect(admin.get("/notifications/"), 200),
+        "notifications_reader": lambda: _expect(reader.get("/notifications/", headers=json_headers), 200),
+    }
+
+
+def measure(scenario: Callable[[], None], rounds: int, warmup: int) -> Stats:
+    for _ in range(warmup):
+        scenario()
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        scenario()
+        samples.append(time.perf_counter() - started)
+    return Stats.of(samples)
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scale: str, rounds: int, warmup: int, only: list[str] | None, seed: int) -> dict[str, object]:
+    sizes = SCALES[scale]
+    with temporary_app(CATALOG_CACHE_BACKEND="none") as app:
+        started = time.perf_counter()
+        rows = seed_library(seed=seed, **sizes)
+        seeded_in = time.perf_counter() - started
+
+        admin, reader = app.test_client(), app.test_client()
+        reader_id = 2
+        login(admin, 1)
+        login(reader, reader_id)
+        scenarios = build_scenarios(admin, reader, reader_id)
+        results = {}
+        for name, scenario in scenarios.items():
+            if only and name not in only:
+                continue
+            results[name] = asdict(measure(scenario, rounds, warmup))
+            db.session.remove()
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "scale": scale,
+            "seed": seed,
+            "rows": rows,
+            "seed_seconds": round(seeded_in, 3),
+            "rounds": rounds,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+        },
+        "benchmarks": results,
+    }
+
+
+def compare(current: dict[str, object], baseline: dict[str, object]) -> None:
+    print(f"\nПорівняння з {baseline['meta'].get('commit') or 'baseline'} (медіана, мс):")
+    print(f"{'scenario':>22} {'before':>10} {'after':>10} {'ratio':>8}")
+    for name, stats in current["benchmarks"].items():
+        before = baseline["benchmarks"].get(name)
+        if before is None:
+            continue
+        ratio = stats["median"] / before["median"] if before["median"] else float("nan")
+        print(f"{name:>22} {before['median'] * 1000:>10.2f} {stats['median'] * 1000:>10.2f} {ratio:>7.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=20)
+    parser.add_argument("--only", nargs="+", help="запустити лише вказані сценарії")
+    parser.add_argument("--output", type=Path, help="куди записати JSON-звіт")
+    parser.add_argument("--compare", type=Path, help="попередній JSON-звіт для порівняння")
+    args = parser.parse_args()
+
+    result = run(args.scale, args.rounds, args.warmup, args.only, args.seed)
+    print(f"{'scenario':>22} {'median, ms':>11} {'mean, ms':>10} {'stddev':>8} {'ops/s':>8}")
+    for name, stats in result["benchmarks"].items():
+        print(
+            f"{name:>22} {stats['median'] * 1000:>11.2f} {stats['mean'] * 1000:>10.2f}"
+            f" {stats['stddev'] * 1000:>8.2f} {stats['ops']:>8.1f}"
+        )
+    if args.output:
+        args.output.write_text(json.dumps(result, ensure_ascii=False, indent=2, sort_keys=True) + "\n")
+    if args.compare:
+        compare(result, json.loads(args.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
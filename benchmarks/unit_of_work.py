@@ -0,0 +1,57 @@
+"""Пропускна здатність оренди/повернення: коміт на кожен виклик репозиторію проти unit of work.
+
+    python -m benchmarks.unit_of_work --operations 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from contextlib import nullcontext
+from unittest import mock
+
+from benchmarks.data import seed_books, seed_readers, temporary_app
+from library_app.services import book_repository
+from library_app.services import rental_service as rental_module
+from library_app.services.rental_service import rental_service
+
+BOOKS = 100
+READERS = 100
+
+
+def _rent_and_return(book_id: int, reader_id: int) -> None:
+    rental = rental_service.rent_book(book_id, reader_id, days=7)
+    rental_service.return_book(rental.id)
+
+
+def run(operations: int) -> dict[str, float]:
+    result = {}
+    for mode in ("commit_per_call", "unit_of_work"):
+        # Без unit_of_work() кожен add/update репозиторію комітить окремо, як раніше.
+        patched = rental_module.unit_of_work if mode == "unit_of_work" else nullcontext
+        with temporary_app(), mock.patch.object(rental_module, "unit_of_work", patched):
+            seed_books(BOOKS)
+            seed_readers(READERS)
+            for book in book_repository.all():
+                book.available_copies = operations
+            book_repository.update()
+
+            started = time.perf_counter()
+            for index in range(operations):
+                _rent_and_return(index % BOOKS + 1, index % READERS + 1)
+            result[mode] = operations / (time.perf_counter() - started)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operations", type=int, default=2_000)
+    args = parser.parse_args()
+
+    result = run(args.operations)
+    for mode, rate in result.items():
+        print(f"{mode:>16}: {rate:8.1f} rent+return/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,25 @@ from __future__ import annotations
 from datetime import datetime
 from flask import Flask, redirect, url_for
 
+from library_app.cli import register_cli
 from library_app.config import init_extensions
 from library_app.controllers.auth_controller import auth_bp
 from library_app.controllers.books_controller import books_bp
+from library_app.controllers.metrics_controller import metrics_bp
 from library_app.controllers.notifications_controller import notifications_bp
 from library_app.controllers.readers_controller import readers_bp
 from library_app.controllers.rentals_controller import rentals_bp
 from library_app.controllers.reports_controller import reports_bp
 from library_app.controllers.store_controller import store_bp
+from library_app.instrumentation import init_instrumentation
+from library_app.repositories.unit_of_work import init_unit_of_work
+from library_app.services.catalog_service import init_catalog_cache
+from library_app.services.notification_broker import init_notification_broker
 from library_app.services.notification_service import NotificationService
-from library_app.services.auth_service import current_user, is_authenticated, is_admin
+from library_app.services.profile_service import init_reader_stats_tracking
+from library_app.services.revenue_service import init_revenue_tracking
+from library_app.services.scheduler import init_scheduler
+from library_app.services.auth_service import current_user, init_user_cache, is_authenticated, is_admin
 
 
 def create_app(config: dict[str, object] | None = None) -> Flask:
@@ -19,6 +28,14 @@ def create_app(config: dict[str, object] | None = None) -> Flask:
     if config:
         app.config.update(config)
     init_extensions(app)
+    init_instrumentation(app)
+    register_cli(app)
+    init_unit_of_work(app)
+    init_catalog_cache(app)
+    init_user_cache(app)
+    init_notification_broker(app)
+    init_revenue_tracking(app)
+    init_reader_stats_tracking(app)
 
     # Register blueprints
     app.register_blueprint(auth_bp)
@@ -28,6 +45,7 @@ def create_app(config: dict[str, object] | None = None) -> Flask:
     app.register_blueprint(rentals_bp, url_prefix="/rentals")
     app.register_blueprint(reports_bp, url_prefix="/reports")
     app.register_blueprint(notifications_bp, url_prefix="/notifications")
+    app.register_blueprint(metrics_bp)
 
     # Template helpers
     @app.context_processor
@@ -45,5 +63,6 @@ def create_app(config: dict[str, object] | None = None) -> Flask:
 
     # Attach notification service (Observer pattern) to app context
     NotificationService.bootstrap()
+    init_scheduler(app)
 
     return app
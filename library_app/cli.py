@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+
+import click
+from flask import Flask, current_app
+from flask.cli import AppGroup
+
+from library_app.repositories.book_search import book_search_index
+from library_app.schema import upgrade_schema
+from library_app.services import notification_repository, reader_stats_repository, revenue_repository
+from library_app.services.import_service import (
+    DEFAULT_CHUNK_SIZE,
+    FORMATS,
+    IMPORTERS,
+    UNREADABLE_FILE_ERRORS,
+    detect_format,
+    import_records,
+    read_records,
+)
+from library_app.services.retention_service import RetentionPolicy, retention_service
+
+db_cli = AppGroup("db", help="Обслуговування схеми бази даних.")
+search_cli = AppGroup("search", help="Керування повнотекстовим індексом каталогу.")
+scheduler_cli = AppGroup("scheduler", help="Фонові задачі (перевірка прострочень).")
+reports_cli = AppGroup("reports", help="Підсумкові таблиці звітів.")
+import_cli = AppGroup("import", help="Масовий імпорт книг і читачів з CSV/JSONL.")
+notifications_cli = AppGroup("notifications", help="Обслуговування таблиці сповіщень.")
+
+
+@search_cli.command("rebuild")
+def rebuild_search_index() -> None:
+    """Перебудовує FTS5-індекс книг."""
+    indexed = book_search_index.rebuild()
+    if not book_search_index.is_available():
+        click.echo("FTS5 недоступний для цієї бази даних; пошук використовує ILIKE.")
+        return
+    click.echo(f"Проіндексовано книг: {indexed}")
+
+
+@db_cli.command("upgrade")
+def upgrade_database() -> None:
+    """Додає відсутні таблиці, колонки та індекси до наявної бази."""
+    applied = upgrade_schema()
+    if not applied:
+        click.echo("Схема актуальна.")
+        return
+    for step in applied:
+        click.echo(f"+ {step}")
+
+
+@scheduler_cli.command("run-once")
+def run_scheduler_once() -> None:
+    """Виконує задачі, для яких настав час, і завершується."""
+    executed = current_app.extensions["scheduler"].run_pending()
+    click.echo(f"Виконано: {', '.join(executed)}" if executed else "Немає задач до виконання.")
+
+
+@scheduler_cli.command("run")
+def run_scheduler() -> None:
+    """Запускає воркер планувальника до зупинки процесу."""
+    scheduler = current_app.extensions["scheduler"]
+    click.echo(f"Планувальник запущено ({scheduler.owner}).")
+    scheduler.run_forever(current_app._get_current_object())
+
+
+@reports_cli.command("rebuild-revenue")
+def rebuild_revenue() -> None:
+    """Перераховує таблицю daily_revenue з усіх платежів."""
+    rows = revenue_repository.rebuild()
+    click.echo(f"Денних підсумків: {rows}")
+
+
+@reports_cli.command("rebuild-reader-stats")
+def rebuild_reader_stats() -> None:
+    """Перераховує таблицю reader_genre_stats з усіх повернених оренд."""
+    rows = reader_stats_repository.rebuild()
+    click.echo(f"Рядків статистики читачів: {rows}")
+
+
+@import_cli.command("run")
+@click.argument("kind", type=click.Choice(sorted(IMPORTERS)))
+@click.argument("source", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--format", "fmt", type=click.Choice(FORMATS), help="За замовчуванням — за розширенням файлу.")
+@click.option("--errors", "errors_path", type=click.Path(dir_okay=False, path_type=Path), help="Файл звіту про помилки.")
+@click.option("--chunk-size", default=DEFAULT_CHUNK_SIZE, show_default=True)
+def run_import(kind: str, source: Path, fmt: str | None, errors_path: Path | None, chunk_size: int) -> None:
+    """Імпортує книги або читачів однією транзакцією: flask import run books books.csv"""
+    fmt = detect_format(source.name, fmt)
+    errors_path = errors_path or source.with_name(f"{source.name}.errors.csv")
+    with source.open(encoding="utf-8-sig", newline="") as stream:
+        try:
+            report = import_records(kind, read_records(stream, fmt), errors_path, chunk_size)
+        except UNREADABLE_FILE_ERRORS as exc:
+            raise click.ClickException(f"Файл не є коректним UTF-8 {fmt.upper()}: {exc}") from None
+    click.echo(f"Імпортовано: {report.imported}, відхилено: {report.failed}")
+    if report.error_report:
+        click.echo(f"Звіт про помилки: {report.error_report}")
+
+
+@notifications_cli.command("recount-unread")
+def recount_unread() -> None:
+    """Перераховує лічильники непрочитаних сповіщень читачів."""
+    notification_repository.recount_unread()
+    click.echo("Лічильники непрочитаних сповіщень оновлено.")
+
+
+@notifications_cli.command("retention")
+@click.option("--keep-days", type=int, help="Перевизначає NOTIFICATIONS_RETENTION_DAYS (0 — без обмеження віку).")
+@click.option("--archive/--no-archive", default=None, help="Переносити старі сповіщення в архів чи видаляти.")
+@click.option("--collapse/--no-collapse", default=None, help="Згортати повторні нагадування про прострочення.")
+def run_notification_retention(keep_days: int | None, archive: bool | None, collapse: bool | None) -> None:
+    """Згортає повторні нагадування та архівує старі сповіщення порціями."""
+    policy = RetentionPolicy.from_config(current_app.config)
+    overrides = {"keep_days": keep_days, "archive": archive, "collapse_reminders": collapse}
+    policy = replace(policy, **{name: value for name, value in overrides.items() if value is not None})
+    report = retention_service.run(policy)
+    click.echo(
+        f"Звільнено рядків: {report.reclaimed} (згорнуто {report.collapsed}, в архів {report.archived}, "
+        f"видалено {report.purged}); порцій: {report.chunks}, {report.seconds:.1f} с"
+    )
+
+
+def register_cli(app: Flask) -> None:
+    app.cli.add_command(db_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(scheduler_cli)
+    app.cli.add_command(reports_cli)
+    app.cli.add_command(import_cli)
+    app.cli.add_command(notifications_cli)
+
+
+__all__ = ["register_cli"]
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
 
 
 class Database:
@@ -20,6 +22,68 @@ class Database:
         return Database._instance
 
 
+# Профілі рушія БД: PRAGMA для кожного нового SQLite-з'єднання та параметри пулу.
+# Обирається через DATABASE_PROFILE або змінну середовища LIBRARY_DB_PROFILE.
+ENGINE_PROFILES: dict[str, dict[str, Any]] = {
+    # Налаштування SQLite за замовчуванням: rollback journal, без busy timeout.
+    "legacy": {"pragmas": {}, "pool": {}},
+    # WAL: читачі не блокуються записом; NORMAL безпечний у WAL і не робить fsync на кожен коміт.
+    "balanced": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "busy_timeout": 5000,
+            "cache_size": -16000,  # ~16 МБ
+            "temp_store": "MEMORY",
+        },
+        "pool": {"pool_size": 10, "max_overflow": 10, "pool_timeout": 10},
+    },
+    "throughput": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "busy_timeout": 10000,
+            "cache_size": -64000,  # ~64 МБ
+            "mmap_size": 268435456,  # 256 МБ
+            "temp_store": "MEMORY",
+        },
+        "pool": {"pool_size": 20, "max_overflow": 20, "pool_timeout": 10},
+    },
+}
+DEFAULT_ENGINE_PROFILE = "balanced"
+
+
+def engine_profile(app: Flask) -> dict[str, Any]:
+    name = app.config["DATABASE_PROFILE"]
+    if name not in ENGINE_PROFILES:
+        raise ValueError(f"Unknown DATABASE_PROFILE {name!r}; expected one of {sorted(ENGINE_PROFILES)}")
+    return ENGINE_PROFILES[name]
+
+
+def _engine_options(app: Flask) -> dict[str, Any]:
+    url = make_url(app.config["SQLALCHEMY_DATABASE_URI"])
+    options: dict[str, Any] = {}
+    is_memory = url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+    if not is_memory:
+        # Для SQLite у пам'яті Flask-SQLAlchemy використовує StaticPool без параметрів пулу.
+        options.update(engine_profile(app)["pool"])
+    if url.get_backend_name() == "sqlite" and not is_memory:
+        options["connect_args"] = {"check_same_thread": False}
+    return options
+
+
+def _install_pragmas(engine: Engine, pragmas: dict[str, object]) -> None:
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
 def configure_app(app: Flask) -> None:
     """Apply default configuration to the Flask application."""
     base_dir = Path(app.root_path).parent
@@ -27,6 +91,54 @@ def configure_app(app: Flask) -> None:
 
     app.config.setdefault("SQLALCHEMY_DATABASE_URI", f"sqlite:///{db_path}")
     app.config.setdefault("SQLALCHEMY_TRACK_MODIFICATIONS", False)
+    app.config.setdefault("DATABASE_PROFILE", os.getenv("LIBRARY_DB_PROFILE", DEFAULT_ENGINE_PROFILE))
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        **_engine_options(app),
+        **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}),
+    }
+    # True — кожен запит виконується однією транзакцією (див. repositories.unit_of_work).
+    app.config.setdefault("UNIT_OF_WORK_PER_REQUEST", False)
+    # Фоновий потік планувальника (крім TESTING): перевірка прострочень не виконується під час запитів.
+    # LIBRARY_SCHEDULER_ENABLED=0 — коли задачі виконує окремий процес ``flask scheduler run``.
+    app.config.setdefault("SCHEDULER_ENABLED", os.getenv("LIBRARY_SCHEDULER_ENABLED", "1") == "1")
+    app.config.setdefault("SCHEDULER_TICK_SECONDS", 30)
+    app.config.setdefault("SCHEDULER_LEASE_SECONDS", 300)
+    app.config.setdefault("OVERDUE_SWEEP_INTERVAL", 600)
+    # Інструментація: Server-Timing для кожного запиту та /metrics (Prometheus) для адміністратора.
+    app.config.setdefault("METRICS_ENABLED", os.getenv("LIBRARY_METRICS_ENABLED") == "1")
+    app.config.setdefault("METRICS_SLOW_STATEMENT_MS", 200)
+    # Найдовший строк оренди (днів) для POST /rentals/ та /rentals/batch.
+    app.config.setdefault("MAX_RENTAL_DAYS", 365)
+    # Звіти про відхилені рядки масового імпорту (POST /books/import, /readers/import).
+    app.config.setdefault("IMPORT_ERRORS_DIR", str(Path(app.instance_path) / "import-errors"))
+    # Кеш каталогу: memory (LRU у процесі), sqlite (спільний файл для кількох воркерів) або none.
+    app.config.setdefault("CATALOG_CACHE_BACKEND", os.getenv("LIBRARY_CATALOG_CACHE", "memory"))
+    app.config.setdefault("CATALOG_CACHE_TTL", 300)
+    app.config.setdefault("CATALOG_CACHE_SIZE", 256)
+    app.config.setdefault("CATALOG_CACHE_PATH", os.getenv("LIBRARY_CATALOG_CACHE_PATH"))
+    # Зберігання сповіщень: старші за N днів переносяться в архів (0 — без обмеження віку),
+    # повторні нагадування про прострочення однієї оренди згортаються в один рядок.
+    app.config.setdefault("NOTIFICATIONS_RETENTION_DAYS", int(os.getenv("LIBRARY_NOTIFICATIONS_RETENTION_DAYS", "180")))
+    app.config.setdefault("NOTIFICATIONS_COLLAPSE_REMINDERS", True)
+    app.config.setdefault("NOTIFICATIONS_ARCHIVE", True)
+    app.config.setdefault("NOTIFICATIONS_ARCHIVE_URI", os.getenv("LIBRARY_NOTIFICATIONS_ARCHIVE_URI"))
+    app.config.setdefault("NOTIFICATIONS_RETENTION_CHUNK", 1_000)
+    # Як часто планувальник застосовує політику (секунди); 0 — лише вручну: flask notifications retention.
+    app.config.setdefault(
+        "NOTIFICATIONS_RETENTION_INTERVAL", int(os.getenv("LIBRARY_NOTIFICATIONS_RETENTION_INTERVAL", "0"))
+    )
+    # SSE-потік сповіщень: як часто перечитувати лічильник і скільки подій буферизувати на клієнта.
+    app.config.setdefault("NOTIFICATIONS_STREAM_HEARTBEAT", 15)
+    app.config.setdefault("NOTIFICATIONS_STREAM_QUEUE_SIZE", 100)
+    # Кожен відкритий потік займає потік воркера: понад цю кількість на процес (0 — SSE вимкнено)
+    # /notifications/stream відповідає 503, а сторінка опитує /notifications/unread-count.
+    app.config.setdefault(
+        "NOTIFICATIONS_STREAM_MAX_CLIENTS", int(os.getenv("LIBRARY_NOTIFICATIONS_STREAM_MAX_CLIENTS", "8"))
+    )
+    app.config.setdefault("NOTIFICATIONS_POLL_INTERVAL", 60)
+    # Кеш знімків авторизованих користувачів (секунди; 0 — читати користувача з БД щоразу).
+    app.config.setdefault("USER_CACHE_TTL", 60)
+    app.config.setdefault("USER_CACHE_SIZE", 1024)
     secret = os.getenv("FLASK_SECRET_KEY") or app.config.get("SECRET_KEY") or "dev-secret-key"
     app.config["SECRET_KEY"] = secret
 
@@ -36,7 +148,18 @@ def init_extensions(app: Flask) -> None:
     configure_app(app)
     db = Database.instance()
     db.init_app(app)
+    pragmas = engine_profile(app)["pragmas"]
+    with app.app_context():
+        for engine in db.engines.values():
+            _install_pragmas(engine, pragmas)
 
 
-__all__ = ["Database", "configure_app", "init_extensions"]
+__all__ = [
+    "Database",
+    "ENGINE_PROFILES",
+    "DEFAULT_ENGINE_PROFILE",
+    "configure_app",
+    "engine_profile",
+    "init_extensions",
+]
 
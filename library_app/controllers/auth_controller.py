@@ -104,6 +104,7 @@ def logout():
 def get_profile():
     """API endpoint для отримання статистики профілю."""
     from flask import jsonify
+    from library_app.services import reader_repository
     from library_app.services.auth_service import current_user
     from library_app.services.profile_service import profile_service
     
@@ -111,10 +112,11 @@ def get_profile():
         return jsonify({"error": "Authentication required"}), 401
     
     user = current_user()
-    if user is None or user.reader is None:
+    reader = reader_repository.get(user.reader_id) if user and user.reader_id else None
+    if reader is None:
         return jsonify({"error": "Reader profile not found"}), 404
     
-    stats = profile_service.get_profile_stats(user.reader)
+    stats = profile_service.get_profile_stats(reader)
     return jsonify({
         "full_name": stats.full_name,
         "category": stats.category,
@@ -2,10 +2,13 @@ from __future__ import annotations
 
 from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
 
+from library_app.controllers.imports import handle_import, send_error_report
+from library_app.controllers.pagination import page_json, requested_page, wants_json
 from library_app.models import db
 from library_app.models.book import Book
 from library_app.services import book_repository
 from library_app.services.auth_service import admin_required
+from library_app.services.catalog_service import catalog_service
 
 books_bp = Blueprint("books", __name__)
 
@@ -16,10 +19,24 @@ def ensure_admin():
     return None
 
 
+def _book_json(book: Book) -> dict:
+    return {
+        "id": book.id,
+        "title": book.title,
+        "author": book.author,
+        "genre": book.genre,
+        "collateral_value": book.collateral_value,
+        "daily_rent_price": book.daily_rent_price,
+        "available_copies": book.available_copies,
+    }
+
+
 @books_bp.get("/")
 def list_books():
-    books = book_repository.all()
-    return render_template("books.html", books=books)
+    page = requested_page(book_repository.page)
+    if wants_json():
+        return page_json(page, _book_json)
+    return render_template("books.html", books=page.items, page=page)
 
 
 @books_bp.post("/")
@@ -51,22 +68,30 @@ def create_book():
     return redirect(url_for("books.list_books"))
 
 
+@books_bp.post("/import")
+def import_books():
+    """Масовий імпорт книг із CSV/JSONL (поле ``file``)."""
+    return handle_import("books", "books.list_books")
+
+
+@books_bp.get("/import/errors/<filename>")
+def import_errors(filename: str):
+    """Звіт про відхилені рядки імпорту (посилання з відповіді ``POST /books/import``)."""
+    return send_error_report("books", filename)
+
+
+@books_bp.get("/cache-stats")
+def cache_stats():
+    cache = catalog_service.cache()
+    return jsonify({"backend": type(cache).__name__, **cache.stats.as_dict()})
+
+
 @books_bp.get("/<int:book_id>")
 def get_book(book_id: int):
     book = book_repository.get(book_id)
     if book is None:
         return jsonify({"error": "Book not found"}), 404
-    return jsonify(
-        {
-            "id": book.id,
-            "title": book.title,
-            "author": book.author,
-            "genre": book.genre,
-            "collateral_value": book.collateral_value,
-            "daily_rent_price": book.daily_rent_price,
-            "available_copies": book.available_copies,
-        }
-    )
+    return jsonify(_book_json(book))
 
 
 @books_bp.put("/<int:book_id>")
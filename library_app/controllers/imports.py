@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import io
+from datetime import datetime
+from pathlib import Path
+
+from flask import abort, current_app, flash, jsonify, redirect, request, send_from_directory, url_for
+
+from library_app.controllers.pagination import wants_json
+from library_app.services.import_service import (
+    UNREADABLE_FILE_ERRORS,
+    detect_format,
+    import_records,
+    read_records,
+)
+
+
+def handle_import(kind: str, list_endpoint: str):
+    """Приймає multipart-файл ``file`` (CSV або JSONL) і імпортує його як ``kind``."""
+    upload = request.files.get("file")
+    if upload is None or not upload.filename:
+        return jsonify({"error": "file is required"}), 400
+    try:
+        fmt = detect_format(upload.filename, request.args.get("format") or request.form.get("format"))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    stamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S-%f")
+    error_path = Path(current_app.config["IMPORT_ERRORS_DIR"]) / f"{kind}-{stamp}.errors.csv"
+    stream = io.TextIOWrapper(upload.stream, encoding="utf-8-sig", newline="")
+    try:
+        report = import_records(kind, read_records(stream, fmt), error_path)
+    except UNREADABLE_FILE_ERRORS as exc:
+        # Імпорт уже відкочено; частковий звіт про помилки не потрібен.
+        error_path.unlink(missing_ok=True)
+        return jsonify({"error": f"file is not valid UTF-8 {fmt.upper()}: {exc}"}), 400
+
+    blueprint = list_endpoint.split(".", 1)[0]
+    report_url = (
+        url_for(f"{blueprint}.import_errors", filename=report.error_report.name) if report.error_report else None
+    )
+    if wants_json() or not request.accept_mimetypes.accept_html:
+        return jsonify(
+            {
+                "imported": report.imported,
+                "failed": report.failed,
+                "errors": [{"line": e.line, "error": e.error} for e in report.errors],
+                "error_report": report_url,
+            }
+        )
+    category = "warning" if report.failed else "success"
+    message = f"Імпортовано: {report.imported}, відхилено: {report.failed}."
+    if report_url:
+        message += f" Звіт про помилки: {report_url}"
+    flash(message, category)
+    return redirect(url_for(list_endpoint))
+
+
+def send_error_report(kind: str, filename: str):
+    """Віддає звіт про відхилені рядки з ``IMPORT_ERRORS_DIR`` (лише звіти цього ``kind``)."""
+    if not filename.startswith(f"{kind}-"):
+        abort(404)
+    directory = current_app.config["IMPORT_ERRORS_DIR"]
+    return send_from_directory(directory, filename, mimetype="text/csv", as_attachment=True)
+
+
+__all__ = ["handle_import", "send_error_report"]
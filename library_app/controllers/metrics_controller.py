@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from flask import Blueprint, Response, abort, current_app
+
+from library_app.services.auth_service import admin_required
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.get("/metrics")
+@admin_required
+def metrics():
+    registry = current_app.extensions.get("metrics")
+    if registry is None:
+        abort(404)
+    return Response(registry.render(), mimetype="text/plain; version=0.0.4")
@@ -1,14 +1,43 @@
 from __future__ import annotations
 
-from flask import Blueprint, jsonify, render_template, request
+from datetime import datetime
 
-from library_app.models import db
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    flash,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    stream_with_context,
+    url_for,
+)
+
+from library_app.controllers.pagination import page_json, requested_page, wants_json
+from library_app.models.notification import Notification
+from library_app.models.reader import ReaderCategory
+from library_app.repositories.reader_repository import ReaderSegment
 from library_app.services import notification_repository, reader_repository
-from library_app.services.auth_service import current_user, is_admin, is_authenticated, login_required
+from library_app.services.auth_service import (
+    admin_required,
+    current_user,
+    is_admin,
+    is_authenticated,
+    login_required,
+)
+from library_app.services.notification_broker import broker, event_stream
 from library_app.services.notification_service import NotificationService
+from library_app.services.scheduler import last_sweep_at
 
 notifications_bp = Blueprint("notifications", __name__)
 
+# Максимальна довжина тексту сповіщення (колонка notifications.message).
+MAX_MESSAGE_LENGTH = 512
+# Найбільший список id в одному запиті масового позначення (межа параметрів SQLite — 32766).
+MAX_BULK_IDS = 1000
+
 
 @notifications_bp.before_request
 @login_required
@@ -16,12 +45,22 @@ def ensure_authenticated():
     return None
 
 
+def _notification_json(notification: Notification) -> dict:
+    return {
+        "id": notification.id,
+        "reader_id": notification.reader_id,
+        "rental_id": notification.rental_id,
+        "kind": notification.kind,
+        "message": notification.message,
+        "is_read": notification.is_read,
+        "repeat_count": notification.repeat_count,
+        "created_at": notification.created_at.isoformat() if notification.created_at else None,
+    }
+
+
 @notifications_bp.get("/")
 def list_notifications():
-    # Автоматично перевіряємо всі оренди при відкритті сторінки
-    NotificationService.bootstrap()
-    NotificationService.check_all_rentals()
-    
+    # Сповіщення генерує фоновий планувальник (flask scheduler run); сторінка лише читає.
     user = current_user()
     if user is None:
         return render_template("notifications.html", notifications=[], readers=[], user_is_admin=False)
@@ -29,19 +68,35 @@ def list_notifications():
     # Якщо адмін - показуємо всі сповіщення з можливістю фільтру
     if is_admin():
         reader_id_filter = request.args.get("reader_id", type=int)
-        if reader_id_filter:
-            notifications = notification_repository.for_reader(reader_id_filter)
-        else:
-            notifications = notification_repository.all()
+        page = requested_page(
+            lambda limit, cursor: notification_repository.page_recent(limit, cursor, reader_id_filter)
+        )
+        if wants_json():
+            return page_json(page, _notification_json)
         readers = reader_repository.all()
-        return render_template("notifications.html", notifications=notifications, readers=readers, user_is_admin=True, selected_reader_id=reader_id_filter)
+        return render_template(
+            "notifications.html",
+            notifications=page.items,
+            page=page,
+            readers=readers,
+            user_is_admin=True,
+            selected_reader_id=reader_id_filter,
+            categories=list(ReaderCategory),
+            last_sweep_at=last_sweep_at(),
+        )
     
     # Якщо звичайний користувач - показуємо тільки його сповіщення
-    if user.reader is None:
+    if user.reader_id is None:
         return render_template("notifications.html", notifications=[], readers=[], user_is_admin=False)
     
-    notifications = notification_repository.for_reader(user.reader.id)
-    return render_template("notifications.html", notifications=notifications, readers=[], user_is_admin=False)
+    page = requested_page(
+        lambda limit, cursor: notification_repository.page_recent(limit, cursor, user.reader_id)
+    )
+    if wants_json():
+        return page_json(page, _notification_json)
+    return render_template(
+        "notifications.html", notifications=page.items, page=page, readers=[], user_is_admin=False
+    )
 
 
 @notifications_bp.post("/<int:notification_id>/mark-read")
@@ -56,11 +111,136 @@ def mark_as_read(notification_id: int):
         return jsonify({"error": "Notification not found"}), 404
     
     # Перевіряємо, чи користувач має право читати це сповіщення
-    if not is_admin() and (user.reader is None or notification.reader_id != user.reader.id):
+    if not is_admin() and (user.reader_id is None or notification.reader_id != user.reader_id):
         return jsonify({"error": "Forbidden"}), 403
     
-    notification.mark_read()
-    db.session.commit()
+    notification_repository.mark_read(notification)
     
     return jsonify({"status": "success", "is_read": True})
 
+
+class BulkSelectionError(ValueError):
+    pass
+
+
+def _bulk_selection(payload) -> tuple[int | None, list[int] | None, datetime | None]:
+    """Розбирає ``reader_id``, ``ids`` та ``before`` з JSON або форми; ``all`` — усі непрочитані."""
+    is_json = isinstance(payload, dict)
+    ids = payload.get("ids") if is_json else payload.getlist("ids")
+    before = payload.get("before")
+    reader_id = payload.get("reader_id")
+    if not ids and not before and not payload.get("all"):
+        raise BulkSelectionError("selection_required")
+    try:
+        reader_id = int(reader_id) if reader_id not in (None, "") else None
+    except (TypeError, ValueError):
+        raise BulkSelectionError("invalid_reader_id") from None
+    if ids:
+        try:
+            ids = [int(value) for value in ids]
+        except (TypeError, ValueError):
+            raise BulkSelectionError("invalid_ids") from None
+        if len(ids) > MAX_BULK_IDS:
+            raise BulkSelectionError("too_many_ids")
+    if before:
+        try:
+            before = datetime.fromisoformat(str(before))
+        except ValueError:
+            raise BulkSelectionError("invalid_before") from None
+    return reader_id, ids or None, before or None
+
+
+@notifications_bp.post("/mark-read")
+def mark_many_as_read():
+    """Масово позначає сповіщення прочитаними одним UPDATE: ``all``, список ``ids`` та/або ``before``.
+
+    Читач змінює лише власні сповіщення; адміністратор — будь-які, опційно в межах ``reader_id``.
+    """
+    user = current_user()
+    payload = request.get_json(silent=True)
+    as_json = isinstance(payload, dict) or wants_json()
+    if not isinstance(payload, dict):
+        payload = request.form
+    try:
+        reader_id, ids, before = _bulk_selection(payload)
+    except BulkSelectionError as exc:
+        if as_json:
+            return jsonify({"error": str(exc)}), 400
+        flash("Не вдалося позначити сповіщення прочитаними.", "danger")
+        return redirect(url_for("notifications.list_notifications"))
+    if not is_admin():
+        if user.reader_id is None:
+            return jsonify({"error": "reader_profile_missing"}), 400
+        reader_id = user.reader_id
+
+    updated = notification_repository.mark_read_bulk(reader_id, ids, before)
+    if as_json:
+        unread = notification_repository.unread_count(user.reader_id) if user.reader_id else 0
+        return jsonify({"updated": updated, "unread": unread})
+    flash(f"Позначено прочитаними: {updated}.", "success")
+    return redirect(url_for("notifications.list_notifications", reader_id=reader_id if is_admin() else None))
+
+
+@notifications_bp.post("/broadcast")
+@admin_required
+def broadcast():
+    """Оголошення для сегмента читачів: all, category (з ``category``), active_rentals або overdue."""
+    payload = request.get_json(silent=True)
+    as_json = isinstance(payload, dict) or wants_json()
+    if not isinstance(payload, dict):
+        payload = request.form
+    message = str(payload.get("message") or "").strip()
+    error = None
+    try:
+        segment = ReaderSegment(payload.get("segment") or ReaderSegment.ALL)
+        category = ReaderCategory(payload["category"]) if payload.get("category") else None
+    except ValueError:
+        segment, category, error = None, None, "invalid_segment"
+    if not message or len(message) > MAX_MESSAGE_LENGTH:
+        error = "invalid_message"
+    elif segment is ReaderSegment.CATEGORY and category is None:
+        error = "category_required"
+    if error:
+        if as_json:
+            return jsonify({"error": error}), 400
+        flash("Перевірте текст оголошення та сегмент читачів.", "danger")
+        return redirect(url_for("notifications.list_notifications"))
+
+    created = NotificationService.broadcast(message, segment, category)
+    if as_json:
+        return jsonify({"created": created, "segment": segment.value})
+    flash(f"Оголошення надіслано читачам: {created}.", "success")
+    return redirect(url_for("notifications.list_notifications"))
+
+
+@notifications_bp.get("/unread-count")
+def unread_count():
+    """Кількість непрочитаних сповіщень поточного читача (лічильник, без підрахунку рядків)."""
+    user = current_user()
+    count = notification_repository.unread_count(user.reader_id) if user.reader_id else 0
+    return jsonify({"unread": count})
+
+
+@notifications_bp.get("/stream")
+def stream():
+    """Server-Sent Events: ``unread`` (лічильник) та ``notification`` (нові сповіщення) для навбару."""
+    user = current_user()
+    if user.reader_id is None:
+        return jsonify({"error": "reader_profile_missing"}), 400
+    subscribers = broker()
+    queue = subscribers.subscribe(user.reader_id)
+    if queue is None:
+        # Усі слоти потоків процесу зайняті: клієнт переходить на опитування /unread-count.
+        poll_interval = current_app.config["NOTIFICATIONS_POLL_INTERVAL"]
+        response = jsonify({"error": "stream_capacity_reached", "poll": url_for("notifications.unread_count")})
+        return response, 503, {"Retry-After": str(poll_interval)}
+    heartbeat = current_app.config["NOTIFICATIONS_STREAM_HEARTBEAT"]
+    response = Response(
+        stream_with_context(event_stream(user.reader_id, queue, heartbeat)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # Слот звільняється, навіть якщо клієнт відключився до першої події.
+    response.call_on_close(lambda: subscribers.unsubscribe(user.reader_id, queue))
+    return response
+
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import Any, Callable, TypeVar
+
+from flask import abort, jsonify, make_response, request
+
+from library_app.repositories import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page
+
+T = TypeVar("T")
+
+
+def requested_page(fetch: Callable[[int, str | None], Page[T]]) -> Page[T]:
+    """Викликає ``fetch(limit, cursor)`` з параметрами ``?limit=&cursor=``; 400 для некоректного курсору."""
+    limit = request.args.get("limit", DEFAULT_PAGE_SIZE, type=int)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    try:
+        return fetch(limit, request.args.get("cursor") or None)
+    except ValueError:
+        abort(make_response(jsonify({"error": "invalid_cursor"}), 400))
+
+
+def wants_json() -> bool:
+    return request.accept_mimetypes.accept_json and not request.accept_mimetypes.accept_html
+
+
+def page_json(page: Page[T], serialize: Callable[[T], dict[str, Any]]):
+    return jsonify(
+        {
+            "items": [serialize(item) for item in page.items],
+            "limit": page.limit,
+            "next_cursor": page.next_cursor,
+        }
+    )
+
+
+__all__ = ["page_json", "requested_page", "wants_json"]
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
 
+from library_app.controllers.imports import handle_import, send_error_report
+from library_app.controllers.pagination import page_json, requested_page, wants_json
 from library_app.models import db
-from library_app.models.reader import ReaderCategory
+from library_app.models.reader import Reader, ReaderCategory
 from library_app.services import reader_repository
 from library_app.services.reader_factory import get_reader_creator
 from library_app.services.auth_service import admin_required
@@ -17,10 +19,24 @@ def ensure_admin():
     return None
 
 
+def _reader_json(reader: Reader) -> dict:
+    return {
+        "id": reader.id,
+        "full_name": reader.full_name,
+        "address": reader.address,
+        "phone": reader.phone,
+        "category": reader.category.value,
+    }
+
+
 @readers_bp.get("/")
 def list_readers():
-    readers = reader_repository.all()
-    return render_template("readers.html", readers=readers, categories=list(ReaderCategory))
+    page = requested_page(reader_repository.page)
+    if wants_json():
+        return page_json(page, _reader_json)
+    return render_template(
+        "readers.html", readers=page.items, page=page, categories=list(ReaderCategory)
+    )
 
 
 @readers_bp.post("/")
@@ -50,20 +66,24 @@ def create_reader():
     return redirect(url_for("readers.list_readers"))
 
 
+@readers_bp.post("/import")
+def import_readers():
+    """Масовий імпорт читачів із CSV/JSONL (поле ``file``)."""
+    return handle_import("readers", "readers.list_readers")
+
+
+@readers_bp.get("/import/errors/<filename>")
+def import_errors(filename: str):
+    """Звіт про відхилені рядки імпорту (посилання з відповіді ``POST /readers/import``)."""
+    return send_error_report("readers", filename)
+
+
 @readers_bp.get("/<int:reader_id>")
 def get_reader(reader_id: int):
     reader = reader_repository.get(reader_id)
     if reader is None:
         return jsonify({"error": "Reader not found"}), 404
-    return jsonify(
-        {
-            "id": reader.id,
-            "full_name": reader.full_name,
-            "address": reader.address,
-            "phone": reader.phone,
-            "category": reader.category.value,
-        }
-    )
+    return jsonify(_reader_json(reader))
 
 
 @readers_bp.put("/<int:reader_id>")
@@ -2,12 +2,21 @@ from __future__ import annotations
 
 from datetime import date
 
-from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
+from flask import Blueprint, current_app, flash, jsonify, redirect, render_template, request, url_for
 
+from library_app.controllers.pagination import page_json, requested_page, wants_json
 from library_app.models import db
+from library_app.models.rental import Rental
+from library_app.repositories.rental_repository import LoadProfile
 from library_app.services import book_repository, reader_repository, rental_repository
 from library_app.services.auth_service import admin_required
-from library_app.services.rental_service import RentalError, rental_service
+from library_app.services.rental_service import (
+    BatchItemResult,
+    RentalError,
+    RentalRequest,
+    ReturnRequest,
+    rental_service,
+)
 
 rentals_bp = Blueprint("rentals", __name__)
 
@@ -18,14 +27,38 @@ def ensure_admin():
     return None
 
 
+def _rental_days(raw: object) -> int:
+    """Строк оренди з запиту: ціле число від 1 до ``MAX_RENTAL_DAYS``."""
+    days = int(raw)
+    max_days = current_app.config["MAX_RENTAL_DAYS"]
+    if not 1 <= days <= max_days:
+        raise ValueError(f"days must be between 1 and {max_days}")
+    return days
+
+
+def _rental_json(rental: Rental) -> dict:
+    return {
+        "id": rental.id,
+        "book_id": rental.book_id,
+        "reader_id": rental.reader_id,
+        "rent_date": rental.rent_date.isoformat(),
+        "due_date": rental.due_date.isoformat(),
+        "return_date": rental.return_date.isoformat() if rental.return_date else None,
+        "fine_amount": rental.fine_amount,
+    }
+
+
 @rentals_bp.get("/")
 def list_rentals():
-    rentals = rental_repository.all()
+    page = requested_page(rental_repository.page_with_details)
+    if wants_json():
+        return page_json(page, _rental_json)
     books = book_repository.find_available()
     readers = reader_repository.all()
     return render_template(
         "rentals.html",
-        rentals=rentals,
+        rentals=page.items,
+        page=page,
         books=books,
         readers=readers,
         view="all",
@@ -40,15 +73,15 @@ def create_rental():
             rental = rental_service.rent_book(
                 book_id=int(payload["book_id"]),
                 reader_id=int(payload["reader_id"]),
-                days=int(payload.get("days", 14)),
+                days=_rental_days(payload.get("days", 14)),
             )
         else:
             rental = rental_service.rent_book(
                 book_id=int(request.form["book_id"]),
                 reader_id=int(request.form["reader_id"]),
-                days=int(request.form.get("days", 14)),
+                days=_rental_days(request.form.get("days", 14)),
             )
-    except RentalError as exc:
+    except (RentalError, ValueError) as exc:
         db.session.rollback()
         if payload:
             return jsonify({"error": str(exc)}), 400
@@ -126,16 +159,106 @@ def return_rental(rental_id: int):
     return redirect(url_for("rentals.list_rentals"))
 
 
+MAX_BATCH_ITEMS = 500
+
+
+def _batch_items() -> list[dict] | None:
+    payload = request.get_json(silent=True)
+    items = payload.get("items") if isinstance(payload, dict) else None
+    if not isinstance(items, list) or not 0 < len(items) <= MAX_BATCH_ITEMS:
+        return None
+    return items
+
+
+def _run_batch(items: list[dict], parse, execute) -> list[BatchItemResult]:
+    """Розбирає позиції, виконує коректні одним викликом сервісу та повертає результати в порядку запиту."""
+    results: dict[int, BatchItemResult] = {}
+    parsed: list[tuple[int, object]] = []
+    for index, item in enumerate(items):
+        try:
+            parsed.append((index, parse(item)))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            results[index] = BatchItemResult(index, error="Invalid item")
+    if parsed:
+        for (index, _), result in zip(parsed, execute([req for _, req in parsed])):
+            result.index = index
+            results[index] = result
+    return [results[index] for index in range(len(items))]
+
+
+def _batch_response(results: list[BatchItemResult], describe):
+    failed = [result for result in results if not result.ok]
+    body = {
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed),
+        "results": [
+            {"index": r.index, "status": "ok", **describe(r)}
+            if r.ok
+            else {"index": r.index, "status": "error", "error": r.error}
+            for r in results
+        ],
+    }
+    return jsonify(body), (207 if failed else 200)
+
+
+@rentals_bp.post("/batch")
+def create_rentals_batch():
+    """Видача стосу книг: {"items": [{"book_id", "reader_id", "days"}]}."""
+    items = _batch_items()
+    if items is None:
+        return jsonify({"error": f"items must be a list of 1..{MAX_BATCH_ITEMS} objects"}), 400
+
+    def parse(item: dict) -> RentalRequest:
+        return RentalRequest(
+            book_id=int(item["book_id"]),
+            reader_id=int(item["reader_id"]),
+            days=_rental_days(item.get("days", 14)),
+        )
+
+    results = _run_batch(items, parse, rental_service.rent_books)
+    return _batch_response(
+        results,
+        lambda r: {"rental_id": r.rental.id, "due_date": r.rental.due_date.isoformat()},
+    )
+
+
+@rentals_bp.post("/batch-return")
+def return_rentals_batch():
+    """Пакетне повернення: {"items": [{"rental_id", "return_date", "damage_amount", "damage_comment"}]}."""
+    items = _batch_items()
+    if items is None:
+        return jsonify({"error": f"items must be a list of 1..{MAX_BATCH_ITEMS} objects"}), 400
+
+    def parse(item: dict) -> ReturnRequest:
+        return ReturnRequest(
+            rental_id=int(item["rental_id"]),
+            return_date=date.fromisoformat(item["return_date"]) if item.get("return_date") else None,
+            damage_amount=float(item.get("damage_amount", 0) or 0),
+            damage_comment=item.get("damage_comment") or None,
+        )
+
+    results = _run_batch(items, parse, rental_service.return_books)
+    return _batch_response(
+        results,
+        lambda r: {
+            "rental_id": r.rental.id,
+            "amount_due": r.summary.amount_due,
+            "discount_applied": r.summary.discount_applied,
+            "fine_amount": r.summary.fine_amount,
+            "damage_amount": r.summary.damage_amount,
+            "days_rented": r.summary.days_rented,
+        },
+    )
+
+
 @rentals_bp.post("/check-overdue")
 def trigger_overdue_check():
     rental_service.check_overdue_rentals()
     payload = request.get_json(silent=True)
-    overdue = rental_repository.overdue_rentals()
+    overdue = rental_repository.overdue_rentals(load=LoadProfile.JOINED)
 
-    wants_json = payload is not None or (
-        request.accept_mimetypes.accept_json and not request.accept_mimetypes.accept_html
-    )
-    if wants_json:
+    as_json = payload is not None or wants_json()
+    if as_json:
         return jsonify(
             {
                 "status": "notifications dispatched",
@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from datetime import date
 
-from flask import Blueprint, jsonify, render_template, request
+from flask import Blueprint, Response, jsonify, render_template, request, stream_with_context
 
-from library_app.services.report_service import report_service
+from library_app.services.report_service import PaymentGrouping, report_service
 from library_app.services.auth_service import admin_required
+from library_app.services.export_service import ENCODERS, EXPORTS, export_rows, gzip_chunks
 
 reports_bp = Blueprint("reports", __name__)
 
@@ -18,7 +19,7 @@ def ensure_admin():
 
 @reports_bp.get("/")
 def overview():
-    inventory = report_service.book_inventory_report()
+    inventory = report_service.iter_book_inventory()
     overdue = report_service.overdue_report()
     readers_info = report_service.readers_rental_report()
     return render_template(
@@ -35,13 +36,49 @@ def financial_report():
     end = request.args.get("end")
     if not start or not end:
         return jsonify({"error": "start and end dates required"}), 400
-    start_date = date.fromisoformat(start)
-    end_date = date.fromisoformat(end)
+    try:
+        start_date = date.fromisoformat(start)
+        end_date = date.fromisoformat(end)
+    except ValueError:
+        return jsonify({"error": "dates must be YYYY-MM-DD"}), 400
+    group_by = request.args.get("group_by")
+    groupings = [grouping.value for grouping in PaymentGrouping]
+    if group_by and group_by not in groupings:
+        return jsonify({"error": f"group_by must be one of {groupings}"}), 400
+
     summary = report_service.financial_report(start_date, end_date)
-    return jsonify(
-        {
-            "total_income": summary.total_income,
-            "payments_count": summary.payments_count,
-        }
-    )
+    body = {
+        "total_income": summary.total_income,
+        "payments_count": summary.payments_count,
+    }
+    if group_by:
+        body["group_by"] = group_by
+        body["buckets"] = [
+            {"key": bucket.key, "total_income": bucket.total_income, "payments_count": bucket.payments_count}
+            for bucket in report_service.financial_breakdown(start_date, end_date, PaymentGrouping(group_by))
+        ]
+    return jsonify(body)
+
+
+@reports_bp.get("/export/<name>")
+def export_report(name: str):
+    """Потоковий експорт: ?format=csv|ndjson&start=YYYY-MM-DD&end=YYYY-MM-DD&gzip=1."""
+    if name not in EXPORTS:
+        return jsonify({"error": f"unknown export; expected one of {sorted(EXPORTS)}"}), 404
+    fmt = request.args.get("format", "csv")
+    if fmt not in ENCODERS:
+        return jsonify({"error": f"format must be one of {sorted(ENCODERS)}"}), 400
+    try:
+        start = date.fromisoformat(request.args["start"]) if request.args.get("start") else None
+        end = date.fromisoformat(request.args["end"]) if request.args.get("end") else None
+    except ValueError:
+        return jsonify({"error": "dates must be YYYY-MM-DD"}), 400
 
+    chunks = ENCODERS[fmt](EXPORTS[name].columns, export_rows(name, start, end))
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    headers = {"Content-Disposition": f'attachment; filename="{name}-{date.today().isoformat()}.{fmt}"'}
+    if request.args.get("gzip") == "1" or "gzip" in request.accept_encodings:
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+        chunks = gzip_chunks(chunks)
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
 
-from library_app.services import book_repository, rental_repository
+from library_app.repositories.rental_repository import LoadProfile
+from library_app.services import rental_repository
 from library_app.services.auth_service import current_user, login_required
+from library_app.services.catalog_service import catalog_service
 from library_app.services.rental_service import RentalError, rental_service
 
 store_bp = Blueprint("store", __name__, url_prefix="/store")
@@ -12,10 +14,7 @@ store_bp = Blueprint("store", __name__, url_prefix="/store")
 @store_bp.get("/")
 def catalog():
     query = request.args.get("q", "").strip()
-    if query:
-        books = book_repository.search_available(query)
-    else:
-        books = book_repository.find_available()
+    books = catalog_service.available_books(query)
     return render_template("store/catalog.html", books=books, query=query)
 
 
@@ -23,7 +22,7 @@ def catalog():
 @login_required
 def rent_book():
     user = current_user()
-    if user is None or user.reader is None:
+    if user is None or user.reader_id is None:
         if request.is_json:
             return jsonify({"error": "reader_profile_missing"}), 400
         flash("Не вдалося визначити профіль читача.", "danger")
@@ -46,7 +45,7 @@ def rent_book():
     try:
         rental = rental_service.rent_book(
             book_id=int(book_id),
-            reader_id=user.reader.id,
+            reader_id=user.reader_id,
             days=int(days),
         )
     except RentalError as exc:
@@ -76,13 +75,13 @@ def rent_book():
 @login_required
 def my_rentals():
     user = current_user()
-    if user is None or user.reader is None:
+    if user is None or user.reader_id is None:
         if request.accept_mimetypes.accept_json:
             return jsonify({"error": "reader_profile_missing"}), 400
         flash("Не вдалося визначити профіль читача.", "danger")
         return redirect(url_for("store.catalog"))
 
-    rentals = rental_repository.for_reader(user.reader.id)
+    rentals = rental_repository.for_reader(user.reader_id, load=LoadProfile.JOINED)
     if request.accept_mimetypes.accept_json and not request.accept_mimetypes.accept_html:
         return jsonify(
             [
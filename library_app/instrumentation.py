@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from flask import Flask, Response, g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from library_app.models import db
+
+logger = logging.getLogger(__name__)
+
+_G_KEY = "request_metrics"
+# Атрибут контексту виконання з часом старту інструкції: контекст живе рівно одну інструкцію,
+# тож інструкція, що впала з помилкою, не залишає застарілого значення для наступних.
+_START_ATTR = "_metrics_query_start"
+
+
+@dataclass
+class RequestMetrics:
+    started_at: float = field(default_factory=time.perf_counter)
+    statements: int = 0
+    db_time: float = 0.0
+    slowest_time: float = 0.0
+    slowest_statement: str | None = None
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.statements += 1
+        self.db_time += elapsed
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+
+
+@dataclass
+class EndpointTotals:
+    requests: int = 0
+    duration: float = 0.0
+    statements: int = 0
+    db_time: float = 0.0
+    slowest: float = 0.0
+
+
+class MetricsRegistry:
+    """Накопичені метрики за (endpoint, method, status) з моменту запуску процесу."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._totals: dict[tuple[str, str, int], EndpointTotals] = defaultdict(EndpointTotals)
+        # Довільні лічильники фонових задач: (назва, мітки) -> значення.
+        self._counters: dict[tuple[str, tuple[tuple[str, str], ...]], float] = defaultdict(float)
+        self._counter_help: dict[str, str] = {}
+
+    def observe(self, endpoint: str, method: str, status: int, duration: float, metrics: RequestMetrics) -> None:
+        with self._lock:
+            totals = self._totals[(endpoint, method, status)]
+            totals.requests += 1
+            totals.duration += duration
+            totals.statements += metrics.statements
+            totals.db_time += metrics.db_time
+            totals.slowest = max(totals.slowest, metrics.slowest_time)
+
+    def increment(self, name: str, help_text: str, value: float = 1, **labels: str) -> None:
+        with self._lock:
+            self._counter_help[name] = help_text
+            self._counters[(name, tuple(sorted(labels.items())))] += value
+
+    def render(self) -> str:
+        """Текстовий формат Prometheus (exposition format 0.0.4)."""
+        series = [
+            ("library_http_requests_total", "counter", "HTTP requests handled.", "requests"),
+            ("library_http_request_seconds_total", "counter", "Total view time, seconds.", "duration"),
+            ("library_db_statements_total", "counter", "SQL statements executed by requests.", "statements"),
+            ("library_db_seconds_total", "counter", "Total SQL execution time, seconds.", "db_time"),
+            ("library_db_slowest_statement_seconds", "gauge", "Slowest single SQL statement, seconds.", "slowest"),
+        ]
+        with self._lock:
+            items = sorted(self._totals.items())
+            counters = sorted(self._counters.items())
+            counter_help = dict(self._counter_help)
+        lines: list[str] = []
+        for name, kind, help_text, attribute in series:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (endpoint, method, status), totals in items:
+                labels = f'endpoint="{endpoint}",method="{method}",status="{status}"'
+                lines.append(f"{name}{{{labels}}} {getattr(totals, attribute):.6g}")
+        for name, help_text in sorted(counter_help.items()):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for (counter, labels), value in counters:
+                if counter == name:
+                    rendered = ",".join(f'{key}="{label}"' for key, label in labels)
+                    lines.append(f"{name}{{{rendered}}} {value:.6g}")
+        return "\n".join(lines) + "\n"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None:
+        setattr(context, _START_ATTR, time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = getattr(context, _START_ATTR, None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    metrics = g.get(_G_KEY) if has_app_context() else None
+    if metrics is not None:
+        metrics.record(statement, elapsed)
+
+
+def _install_engine_listeners(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _server_timing(metrics: RequestMetrics, duration: float) -> str:
+    return ", ".join(
+        [
+            f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.statements} statements"',
+            f"db-slowest;dur={metrics.slowest_time * 1000:.2f}",
+            f"app;dur={duration * 1000:.2f}",
+        ]
+    )
+
+
+def init_instrumentation(app: Flask) -> MetricsRegistry | None:
+    """За ``METRICS_ENABLED`` рахує SQL-інструкції та час кожного запиту.
+
+    Вимкнена інструментація не реєструє жодних хуків, тому не має накладних витрат.
+    """
+    if not app.config["METRICS_ENABLED"]:
+        return None
+    registry = MetricsRegistry()
+    app.extensions["metrics"] = registry
+    slow_threshold = app.config["METRICS_SLOW_STATEMENT_MS"] / 1000
+    with app.app_context():
+        for engine in db.engines.values():
+            _install_engine_listeners(engine)
+
+    @app.before_request
+    def start_request_metrics() -> None:
+        g.setdefault(_G_KEY, RequestMetrics())
+
+    @app.after_request
+    def finish_request_metrics(response: Response) -> Response:
+        metrics: RequestMetrics | None = g.pop(_G_KEY, None)
+        if metrics is None:
+            return response
+        duration = time.perf_counter() - metrics.started_at
+        response.headers["Server-Timing"] = _server_timing(metrics, duration)
+        registry.observe(
+            request.endpoint or "unknown", request.method, response.status_code, duration, metrics
+        )
+        if metrics.slowest_time >= slow_threshold:
+            logger.warning(
+                "Slow SQL statement on %s (%.1f ms): %s",
+                request.path,
+                metrics.slowest_time * 1000,
+                metrics.slowest_statement,
+            )
+        return response
+
+    return registry
+
+
+__all__ = ["MetricsRegistry", "RequestMetrics", "init_instrumentation"]
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, Float, Integer, String
+from sqlalchemy import DateTime, Float, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from library_app.models import db
@@ -10,6 +10,7 @@ from library_app.models import db
 
 class Book(db.Model):
     __tablename__ = "books"
+    __table_args__ = (Index("ix_books_available_copies", "available_copies"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
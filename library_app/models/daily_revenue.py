@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import Date, Enum, Float, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from library_app.models import db
+from library_app.models.reader import ReaderCategory
+
+
+class DailyRevenue(db.Model):
+    """Денний підсумок платежів у розрізі категорії читача та жанру книги.
+
+    Оновлюється інкрементально під час повернення книг; ``flask reports rebuild-revenue``
+    перераховує його з таблиці ``payments``.
+    """
+
+    __tablename__ = "daily_revenue"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    category: Mapped[ReaderCategory] = mapped_column(Enum(ReaderCategory), primary_key=True)
+    genre: Mapped[str] = mapped_column(String(128), primary_key=True)
+    payments_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_amount: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+
+__all__ = ["DailyRevenue"]
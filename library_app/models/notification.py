@@ -1,21 +1,40 @@
 from __future__ import annotations
 
 from datetime import datetime
+from enum import StrEnum
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from library_app.models import db
 
 
+class NotificationKind(StrEnum):
+    DUE_TODAY = "due_today"
+    OVERDUE = "overdue"
+    BROADCAST = "broadcast"
+
+
 class Notification(db.Model):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_reader_created", "reader_id", "created_at"),
+        Index("ix_notifications_reader_unread", "reader_id", "is_read"),
+        Index("ix_notifications_created_rental", "created_at", "rental_id"),
+        Index("ix_notifications_rental", "rental_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     reader_id: Mapped[int] = mapped_column(ForeignKey("readers.id"), nullable=False)
+    rental_id: Mapped[int | None] = mapped_column(
+        ForeignKey("rentals.id", ondelete="SET NULL"), nullable=True
+    )
+    kind: Mapped[str | None] = mapped_column(String(32), nullable=True)
     message: Mapped[str] = mapped_column(String(512), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     is_read: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Скільки щоденних нагадувань про прострочення згорнуто в цей рядок (див. retention_service).
+    repeat_count: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
 
     reader: Mapped["Reader"] = relationship("Reader", back_populates="notifications")
 
@@ -23,5 +42,24 @@ class Notification(db.Model):
         self.is_read = True
 
 
-__all__ = ["Notification"]
+class NotificationArchive(db.Model):
+    """Сповіщення, старші за строк зберігання; id — той самий, що був у ``notifications``.
+
+    Без зовнішніх ключів, щоб архів переживав видалення читачів і оренд і міг жити в окремій базі.
+    """
+
+    __tablename__ = "notifications_archive"
+    __table_args__ = (Index("ix_notifications_archive_reader_created", "reader_id", "created_at"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    reader_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    rental_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    kind: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    message: Mapped[str] = mapped_column(String(512), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    is_read: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    repeat_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
 
+__all__ = ["Notification", "NotificationArchive", "NotificationKind"]
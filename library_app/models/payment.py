@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from library_app.models import db
@@ -10,11 +10,16 @@ from library_app.models import db
 
 class Payment(db.Model):
     __tablename__ = "payments"
+    __table_args__ = (
+        Index("ix_payments_paid_date", "paid_date"),
+        Index("ix_payments_rental_id", "rental_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    rental_id: Mapped[int] = mapped_column(ForeignKey("rentals.id"), nullable=False)
-    total_amount: Mapped[float] = mapped_column(Float, nullable=False)
-    paid_date: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # active_history: попередні значення потрібні, щоб виправити підсумок у daily_revenue.
+    rental_id: Mapped[int] = mapped_column(ForeignKey("rentals.id"), nullable=False, active_history=True)
+    total_amount: Mapped[float] = mapped_column(Float, nullable=False, active_history=True)
+    paid_date: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, active_history=True)
 
     rental: Mapped["Rental"] = relationship("Rental", back_populates="payments")
 
@@ -30,6 +30,8 @@ class Reader(db.Model):
         Enum(ReaderCategory), default=ReaderCategory.REGULAR, nullable=False
     )
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Лічильник непрочитаних сповіщень; підтримує NotificationRepository у тій самій транзакції.
+    unread_notifications: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
     rentals: Mapped[list["Rental"]] = relationship(
         "Rental", back_populates="reader", cascade="all, delete-orphan"
@@ -37,6 +39,10 @@ class Reader(db.Model):
     notifications: Mapped[list["Notification"]] = relationship(
         "Notification", back_populates="reader", cascade="all, delete-orphan"
     )
+    # Без passive_deletes: SQLite не перевіряє зовнішні ключі, тож рядки статистики видаляє ORM.
+    genre_stats: Mapped[list["ReaderGenreStats"]] = relationship(
+        "ReaderGenreStats", cascade="all, delete-orphan"
+    )
     user: Mapped["User"] = relationship("User", back_populates="reader", uselist=False)
 
     def __repr__(self) -> str:
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from library_app.models import db
+
+
+class ReaderGenreStats(db.Model):
+    """Кількість прочитаних (повернених) книг читача в кожному жанрі.
+
+    Оновлюється інкрементально під час повернення книг; ``first_rental_id`` — найменший id
+    повернутої оренди жанру, за ним розв'язується нічия при виборі улюбленого жанру.
+    ``flask reports rebuild-reader-stats`` перераховує таблицю з таблиці ``rentals``.
+    """
+
+    __tablename__ = "reader_genre_stats"
+
+    reader_id: Mapped[int] = mapped_column(ForeignKey("readers.id", ondelete="CASCADE"), primary_key=True)
+    genre: Mapped[str] = mapped_column(String(128), primary_key=True)
+    books_read: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    first_rental_id: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+__all__ = ["ReaderGenreStats"]
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import date, datetime
 
-from sqlalchemy import Date, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Date, DateTime, Float, ForeignKey, Index, Integer, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from library_app.models import db
@@ -10,10 +10,22 @@ from library_app.models import db
 
 class Rental(db.Model):
     __tablename__ = "rentals"
+    __table_args__ = (
+        Index("ix_rentals_reader_return", "reader_id", "return_date"),
+        Index("ix_rentals_book_return", "book_id", "return_date"),
+        # Часткий індекс лише по активних орендах: прострочення та нагадування.
+        Index(
+            "ix_rentals_active_due_date",
+            "due_date",
+            sqlite_where=text("return_date IS NULL"),
+            postgresql_where=text("return_date IS NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    book_id: Mapped[int] = mapped_column(ForeignKey("books.id"), nullable=False)
-    reader_id: Mapped[int] = mapped_column(ForeignKey("readers.id"), nullable=False)
+    # active_history: стара книга/читач потрібні, щоб перенести платежі в daily_revenue.
+    book_id: Mapped[int] = mapped_column(ForeignKey("books.id"), nullable=False, active_history=True)
+    reader_id: Mapped[int] = mapped_column(ForeignKey("readers.id"), nullable=False, active_history=True)
     rent_date: Mapped[date] = mapped_column(Date, default=date.today, nullable=False)
     due_date: Mapped[date] = mapped_column(Date, nullable=False)
     return_date: Mapped[date | None] = mapped_column(Date, nullable=True)
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
-from typing import Generic, Iterable, Optional, Type, TypeVar
+from typing import Any, Generic, Iterable, Iterator, Optional, Sequence, Type, TypeVar
 
-from sqlalchemy import Select
+from sqlalchemy import Row, Select, inspect, select, tuple_
 
 from library_app.models import db
+from library_app.repositories.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    Page,
+    decode_cursor,
+    encode_cursor,
+)
+from library_app.repositories.unit_of_work import in_unit_of_work, unit_of_work
 
 ModelType = TypeVar("ModelType", bound=db.Model)
 
@@ -18,24 +26,91 @@ class BaseRepository(Generic[ModelType]):
     def get(self, model_id: int) -> Optional[ModelType]:
         return self.model_class.query.get(model_id)
 
+    def get_many(self, model_ids: Iterable[int]) -> dict[int, ModelType]:
+        """Завантажує кілька записів одним запитом ``IN``; повертає словник id -> запис."""
+        ids = set(model_ids)
+        if not ids:
+            return {}
+        pk = inspect(self.model_class).primary_key[0]
+        rows = self.filter(select(self.model_class).where(pk.in_(ids)))
+        return {getattr(row, pk.key): row for row in rows}
+
     def all(self) -> Iterable[ModelType]:
         return self.model_class.query.all()
 
+    def page(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+        stmt: Select | None = None,
+        order_by: Sequence[Any] = (),
+        descending: bool = False,
+    ) -> Page[ModelType]:
+        """Keyset-пагінація: ``WHERE (ключ) > (курсор) ORDER BY ключ LIMIT n``.
+
+        Ключ — колонки ``order_by`` плюс первинний ключ як тай-брейк, тож сторінки стабільні
+        під час вставок, а вартість запиту не залежить від номера сторінки.
+        """
+        pk = inspect(self.model_class).primary_key[0]
+        keys = [*order_by, getattr(self.model_class, pk.key)]
+        stmt = stmt if stmt is not None else select(self.model_class)
+        if cursor:
+            values = decode_cursor(cursor, keys)
+            if len(keys) == 1:
+                column, bound = keys[0], values[0]
+            else:
+                column, bound = tuple_(*keys), tuple_(*values)
+            stmt = stmt.where(column < bound if descending else column > bound)
+        stmt = stmt.order_by(*(key.desc() if descending else key.asc() for key in keys))
+        rows = list(self.filter(stmt.limit(limit + 1)))
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([getattr(rows[-1], key.key) for key in keys])
+        return Page(rows, limit, next_cursor)
+
     def add(self, instance: ModelType) -> ModelType:
         db.session.add(instance)
-        db.session.commit()
+        self._save()
+        return instance
+
+    def stage(self, instance: ModelType) -> ModelType:
+        """Додає запис до сесії без flush/commit — для пакетних операцій."""
+        db.session.add(instance)
         return instance
 
     def delete(self, instance: ModelType) -> None:
         db.session.delete(instance)
-        db.session.commit()
+        self._save()
 
     def update(self) -> None:
-        db.session.commit()
+        self._save()
+
+    def _save(self) -> None:
+        # У межах unit_of_work() комітить зовнішній блок; тут достатньо flush.
+        if in_unit_of_work():
+            db.session.flush()
+        else:
+            db.session.commit()
 
     def filter(self, select_stmt: Select) -> Iterable[ModelType]:
         return db.session.execute(select_stmt).scalars().all()
 
-
-__all__ = ["BaseRepository"]
+    def stream(self, select_stmt: Select, chunk_size: int = 1000) -> Iterator[Row]:
+        """Віддає рядки курсором порціями по ``chunk_size`` (``yield_per``), не тримаючи всю вибірку в пам'яті."""
+        result = db.session.execute(select_stmt.execution_options(yield_per=chunk_size))
+        try:
+            yield from result
+        finally:
+            result.close()
+
+
+__all__ = [
+    "BaseRepository",
+    "DEFAULT_PAGE_SIZE",
+    "MAX_PAGE_SIZE",
+    "Page",
+    "unit_of_work",
+    "in_unit_of_work",
+]
 
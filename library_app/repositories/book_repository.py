@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-from sqlalchemy import or_, select
+from sqlalchemy import Row, Select, func, literal_column, or_, select, table, update
 
+from library_app.models import db
 from library_app.models.book import Book
+from library_app.models.rental import Rental
 from library_app.repositories import BaseRepository
+from library_app.repositories.book_search import FTS_TABLE, RANK_WEIGHTS, book_search_index
+
+_fts = table(FTS_TABLE, literal_column("rowid"))
 
 
 class BookRepository(BaseRepository[Book]):
@@ -14,7 +19,42 @@ class BookRepository(BaseRepository[Book]):
         stmt = select(Book).where(Book.available_copies > 0)
         return list(self.filter(stmt))
 
+    def reserve_copy(self, book_id: int) -> bool:
+        """Атомарно списує один примірник; False, якщо вільних примірників немає."""
+        stmt = (
+            update(Book)
+            .where(Book.id == book_id, Book.available_copies > 0)
+            .values(available_copies=Book.available_copies - 1)
+            .execution_options(synchronize_session="fetch")
+        )
+        return db.session.execute(stmt).rowcount == 1
+
+    def release_copy(self, book_id: int, copies: int = 1) -> None:
+        stmt = (
+            update(Book)
+            .where(Book.id == book_id)
+            .values(available_copies=Book.available_copies + copies)
+            .execution_options(synchronize_session="fetch")
+        )
+        db.session.execute(stmt)
+
     def search_available(self, query: str) -> list[Book]:
+        match = book_search_index.match_expression(query)
+        if match and book_search_index.is_available():
+            return self._search_fulltext(match)
+        return self._search_ilike(query)
+
+    def _search_fulltext(self, match: str) -> list[Book]:
+        fts_rowid = literal_column(f"{FTS_TABLE}.rowid")
+        stmt = (
+            select(Book)
+            .join(_fts, fts_rowid == Book.id)
+            .where(literal_column(FTS_TABLE).op("MATCH")(match), Book.available_copies > 0)
+            .order_by(func.bm25(literal_column(FTS_TABLE), *RANK_WEIGHTS), Book.id)
+        )
+        return list(self.filter(stmt))
+
+    def _search_ilike(self, query: str) -> list[Book]:
         pattern = f"%{query.strip()}%"
         stmt = select(Book).where(
             Book.available_copies > 0,
@@ -22,6 +62,28 @@ class BookRepository(BaseRepository[Book]):
         )
         return list(self.filter(stmt))
 
+    def inventory_rows(self, after_id: int | None = None, limit: int | None = None) -> list[Row]:
+        """Повертає (id, title, author, available_copies, lent_out), впорядковані за id."""
+        stmt = self.inventory_query()
+        if after_id is not None:
+            stmt = stmt.where(Book.id > after_id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return list(db.session.execute(stmt))
+
+    def inventory_query(self) -> Select:
+        return (
+            select(
+                Book.id,
+                Book.title,
+                Book.author,
+                Book.available_copies,
+                func.count(Rental.id).filter(Rental.return_date.is_(None)).label("lent_out"),
+            )
+            .outerjoin(Rental, Rental.book_id == Book.id)
+            .group_by(Book.id)
+            .order_by(Book.id)
+        )
 
-__all__ = ["BookRepository"]
 
+__all__ = ["BookRepository"]
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import re
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+
+from library_app.models import db
+from library_app.models.book import Book
+
+FTS_TABLE = "books_fts"
+
+# Ваги bm25 для колонок title, author, genre: збіг у назві важливіший за жанр.
+RANK_WEIGHTS = (10.0, 5.0, 1.0)
+
+_INSTALL_STATEMENTS = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, author, genre,
+        content='books', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, author, genre)
+        VALUES (new.id, new.title, new.author, new.genre);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, author, genre)
+        VALUES ('delete', old.id, old.title, old.author, old.genre);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS books_fts_au AFTER UPDATE OF title, author, genre ON books BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, author, genre)
+        VALUES ('delete', old.id, old.title, old.author, old.genre);
+        INSERT INTO {FTS_TABLE}(rowid, title, author, genre)
+        VALUES (new.id, new.title, new.author, new.genre);
+    END
+    """,
+)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class BookSearchIndex:
+    """Повнотекстовий індекс каталогу на основі SQLite FTS5.
+
+    Індекс синхронізується з таблицею ``books`` тригерами, тож вставки,
+    оновлення та видалення через ORM чи сирий SQL не потребують окремої логіки.
+    На інших СУБД індекс вважається недоступним, і пошук повертається до ILIKE.
+    """
+
+    def __init__(self) -> None:
+        self._available: WeakKeyDictionary[Engine, bool] = WeakKeyDictionary()
+
+    def install(self, connection: Connection) -> bool:
+        if connection.dialect.name != "sqlite":
+            return False
+        try:
+            for statement in _INSTALL_STATEMENTS:
+                connection.exec_driver_sql(statement)
+        except OperationalError:
+            # SQLite зібрано без FTS5 — залишаємось на ILIKE.
+            self._available[connection.engine] = False
+            return False
+        self._available[connection.engine] = True
+        return True
+
+    def drop(self, connection: Connection) -> None:
+        if connection.dialect.name != "sqlite":
+            return
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+        self._available.pop(connection.engine, None)
+
+    def rebuild(self) -> int:
+        """Створює індекс (за потреби) і переіндексовує всі книги."""
+        with db.engine.begin() as connection:
+            if not self.install(connection):
+                return 0
+            connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+            return connection.exec_driver_sql("SELECT count(*) FROM books").scalar_one()
+
+    def is_available(self) -> bool:
+        engine = db.engine
+        if engine not in self._available:
+            available = False
+            if engine.dialect.name == "sqlite":
+                with engine.connect() as connection:
+                    available = connection.execute(
+                        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                        {"name": FTS_TABLE},
+                    ).first() is not None
+            self._available[engine] = available
+        return self._available[engine]
+
+    @staticmethod
+    def match_expression(query: str) -> str | None:
+        """Перетворює запит користувача на префіксний FTS5-вираз (усі слова обов'язкові)."""
+        tokens = _TOKEN_RE.findall(query)
+        if not tokens:
+            return None
+        return " ".join(f'"{token}"*' for token in tokens)
+
+
+book_search_index = BookSearchIndex()
+
+
+@event.listens_for(Book.__table__, "after_create")
+def _install_search_index(target, connection: Connection, **kw) -> None:
+    book_search_index.install(connection)
+
+
+@event.listens_for(Book.__table__, "before_drop")
+def _drop_search_index(target, connection: Connection, **kw) -> None:
+    book_search_index.drop(connection)
+
+
+__all__ = ["BookSearchIndex", "book_search_index", "FTS_TABLE"]
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+
+from library_app.models import db
+from library_app.models.job_lease import JobLease
+from library_app.repositories import BaseRepository
+
+
+class JobLeaseRepository(BaseRepository[JobLease]):
+    def __init__(self) -> None:
+        super().__init__(JobLease)
+
+    def _ensure(self, name: str) -> None:
+        if db.session.get(JobLease, name) is not None:
+            return
+        try:
+            with db.session.begin_nested():
+                db.session.add(JobLease(name=name))
+        except IntegrityError:
+            pass  # інший воркер створив запис паралельно
+
+    def try_acquire(
+        self, name: str, owner: str, now: datetime, lease_for: timedelta, due_before: datetime
+    ) -> bool:
+        """Атомарно захоплює задачу, якщо вона вільна (або lease прострочено) і вже настав час запуску."""
+        self._ensure(name)
+        stmt = (
+            update(JobLease)
+            .where(
+                JobLease.name == name,
+                or_(JobLease.owner.is_(None), JobLease.owner == owner, JobLease.lease_expires_at < now),
+                or_(JobLease.last_run_at.is_(None), JobLease.last_run_at <= due_before),
+            )
+            .values(owner=owner, lease_expires_at=now + lease_for)
+            .execution_options(synchronize_session=False)
+        )
+        acquired = db.session.execute(stmt).rowcount == 1
+        self._save()
+        return acquired
+
+    def release(self, name: str, owner: str, finished_at: datetime, result: str) -> None:
+        stmt = (
+            update(JobLease)
+            .where(JobLease.name == name, JobLease.owner == owner)
+            .values(owner=None, lease_expires_at=None, last_run_at=finished_at, last_result=result[:255])
+            .execution_options(synchronize_session=False)
+        )
+        db.session.execute(stmt)
+        self._save()
+
+    def last_run_at(self, name: str) -> datetime | None:
+        lease = db.session.get(JobLease, name)
+        return lease.last_run_at if lease else None
+
+
+__all__ = ["JobLeaseRepository"]
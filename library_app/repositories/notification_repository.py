@@ -1,17 +1,105 @@
 from __future__ import annotations
 
-from datetime import date
+from collections import Counter
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Collection, Iterable
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import (
+    ColumnElement,
+    Insert,
+    Row,
+    Select,
+    Update,
+    and_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+)
 
-from library_app.models.notification import Notification
-from library_app.repositories import BaseRepository
+from library_app.models import db
+from library_app.models.notification import Notification, NotificationArchive, NotificationKind
+from library_app.models.reader import Reader
+from library_app.repositories import BaseRepository, Page
+
+# Ключ session.info з подіями (reader_id, подія, дані), які публікуються підписникам після коміту.
+EVENTS_KEY = "notification_events"
+# reader_id події, адресованої всім підписникам (масова розсилка).
+BROADCAST_READERS = None
+# Колонки, що переносяться в ``notifications_archive`` (плюс ``archived_at``).
+ARCHIVED_COLUMNS = ("id", "reader_id", "rental_id", "kind", "message", "created_at", "is_read", "repeat_count")
+
+
+def recount_unread_statement() -> Update:
+    """UPDATE, що перераховує ``readers.unread_notifications`` з таблиці сповіщень."""
+    readers = Reader.__table__
+    unread = (
+        select(func.count(Notification.id))
+        .where(Notification.reader_id == readers.c.id, Notification.is_read.is_(False))
+        .scalar_subquery()
+    )
+    return readers.update().values(unread_notifications=unread)
+
+
+def _utc_midnight(day: date) -> datetime:
+    """Локальна північ ``day`` як наївний UTC-час — у тій самій шкалі, що ``created_at``."""
+    return datetime.combine(day, time.min).astimezone(timezone.utc).replace(tzinfo=None)
 
 
 class NotificationRepository(BaseRepository[Notification]):
     def __init__(self) -> None:
         super().__init__(Notification)
 
+    def add(self, notification: Notification) -> Notification:
+        self._record_created([notification])
+        return super().add(notification)
+
+    def unread_count(self, reader_id: int) -> int:
+        """Значення лічильника читача — один запит за первинним ключем."""
+        stmt = select(Reader.unread_notifications).where(Reader.id == reader_id)
+        return db.session.scalar(stmt) or 0
+
+    def mark_read(self, notification: Notification) -> bool:
+        return self.mark_read_where(Notification.id == notification.id) > 0
+
+    def mark_read_bulk(
+        self,
+        reader_id: int | None = None,
+        ids: Collection[int] | None = None,
+        before: datetime | None = None,
+    ) -> int:
+        """Позначає прочитаними сповіщення читача (None — усіх), за списком id та/або створені до ``before``."""
+        criteria = []
+        if reader_id is not None:
+            criteria.append(Notification.reader_id == reader_id)
+        if ids is not None:
+            criteria.append(Notification.id.in_(ids))
+        if before is not None:
+            criteria.append(Notification.created_at < before)
+        return self.mark_read_where(*criteria)
+
+    def mark_read_where(self, *criteria: ColumnElement[bool]) -> int:
+        """Один ``UPDATE ... WHERE is_read = 0 RETURNING reader_id``; лічильники зменшуються рівно на змінені рядки."""
+        stmt = (
+            update(Notification)
+            .where(Notification.is_read.is_(False), *criteria)
+            .values(is_read=True)
+            .returning(Notification.reader_id)
+        )
+        changed = Counter(db.session.execute(stmt).scalars())
+        self._adjust_unread(Counter({reader_id: -count for reader_id, count in changed.items()}))
+        self._queue_events((reader_id, "read", {"count": count}) for reader_id, count in changed.items())
+        self._save()
+        return changed.total()
+
+    def recount_unread(self) -> None:
+        """Перераховує лічильники всіх читачів (після змін в обхід репозиторію)."""
+        db.session.execute(recount_unread_statement())
+        self._save()
+
     def unread_for_reader(self, reader_id: int) -> list[Notification]:
         stmt = select(Notification).where(
             Notification.reader_id == reader_id, Notification.is_read.is_(False)
@@ -33,6 +121,189 @@ class NotificationRepository(BaseRepository[Notification]):
         stmt = select(Notification).where(Notification.reader_id == reader_id).order_by(Notification.created_at.desc())
         return list(self.filter(stmt))
 
+    def page_recent(
+        self, limit: int, cursor: str | None = None, reader_id: int | None = None
+    ) -> Page[Notification]:
+        """Сторінка сповіщень від найновіших; опційно лише для одного читача."""
+        stmt = select(Notification)
+        if reader_id is not None:
+            stmt = stmt.where(Notification.reader_id == reader_id)
+        return self.page(limit, cursor, stmt, order_by=[Notification.created_at], descending=True)
+
+    def rental_ids_notified_on(self, check_date: date) -> set[int]:
+        """Оренди, за якими вже є сповіщення за вказаний день (одним запитом).
+
+        ``check_date`` — локальна дата (як ``date.today()``), а ``created_at`` зберігається в UTC,
+        тож межі локальної доби переводяться в UTC.
+        """
+        start, end = (_utc_midnight(day) for day in (check_date, check_date + timedelta(days=1)))
+        stmt = select(Notification.rental_id).where(
+            Notification.created_at >= start,
+            Notification.created_at < end,
+            Notification.rental_id.is_not(None),
+        )
+        return set(db.session.execute(stmt).scalars())
+
+    def add_many(self, notifications: list[Notification]) -> int:
+        """Вставляє пакет сповіщень одним executemany та одним комітом (без повернення id)."""
+        if not notifications:
+            return 0
+        rows = [
+            {
+                "reader_id": notification.reader_id,
+                "rental_id": notification.rental_id,
+                "kind": notification.kind,
+                "message": notification.message,
+            }
+            for notification in notifications
+        ]
+        self._record_created(notifications)
+        db.session.execute(insert(Notification), rows)
+        self._save()
+        return len(rows)
+
+    def broadcast(self, reader_ids: Select, message: str, kind: str = NotificationKind.BROADCAST) -> int:
+        """Створює сповіщення кожному читачеві з ``reader_ids`` одним ``INSERT ... SELECT``.
+
+        Лічильники оновлюються ще одним ``UPDATE readers ... WHERE id IN (...)`` у тій самій транзакції;
+        підписники SSE отримують сигнал перечитати лічильник.
+        """
+        ids = reader_ids.subquery()
+        source = select(
+            ids.c[0],
+            literal(kind),
+            literal(message),
+            literal(datetime.utcnow()),
+            literal(False),
+            literal(1),
+        )
+        columns = ["reader_id", "kind", "message", "created_at", "is_read", "repeat_count"]
+        created = db.session.execute(Notification.__table__.insert().from_select(columns, source)).rowcount
+        readers = Reader.__table__
+        db.session.execute(
+            readers.update()
+            .where(readers.c.id.in_(select(ids.c[0])))
+            .values(unread_notifications=readers.c.unread_notifications + 1)
+        )
+        self._queue_events([(BROADCAST_READERS, "broadcast", {"kind": kind, "message": message})])
+        self._save()
+        return created
+
+    def reminder_groups(self, after_rental_id: int, limit: int) -> list[Row]:
+        """Оренди з кількома нагадуваннями про прострочення (keyset за rental_id).
+
+        Рядки: (rental_id, keep_id — найновіше нагадування, repeats — сумарний repeat_count).
+        """
+        stmt = (
+            select(
+                Notification.rental_id,
+                func.max(Notification.id).label("keep_id"),
+                func.sum(Notification.repeat_count).label("repeats"),
+            )
+            .where(Notification.kind == NotificationKind.OVERDUE, Notification.rental_id > after_rental_id)
+            .group_by(Notification.rental_id)
+            .having(func.count() > 1)
+            .order_by(Notification.rental_id)
+            .limit(limit)
+        )
+        return list(db.session.execute(stmt))
+
+    def collapse_reminders(self, groups: list[Row]) -> int:
+        """Залишає для кожної оренди лише найновіше нагадування з сумарним ``repeat_count``.
+
+        Старші рядки видаляються; нові нагадування, вставлені після вибірки груп, мають більший id
+        і не зачіпаються. Коміт виконує викликач.
+        """
+        if not groups:
+            return 0
+        table = Notification.__table__
+        db.session.execute(
+            table.update().where(table.c.id == bindparam("keep")).values(repeat_count=bindparam("repeats")),
+            [{"keep": group.keep_id, "repeats": group.repeats} for group in groups],
+        )
+        return self.delete_where(
+            Notification.kind == NotificationKind.OVERDUE,
+            Notification.rental_id.in_([group.rental_id for group in groups]),
+            Notification.id.not_in([group.keep_id for group in groups]),
+            Notification.id <= max(group.keep_id for group in groups),
+        )
+
+    def expired_window(self, cutoff: datetime, limit: int) -> list[ColumnElement[bool]]:
+        """Умови для наступної порції (до ``limit``) сповіщень, створених до ``cutoff``; [] — порцій більше немає.
+
+        Порція — діапазон id, тож копіювання в архів і видалення бачать ті самі рядки без списку параметрів.
+        """
+        ids = (
+            select(Notification.id)
+            .where(Notification.created_at < cutoff)
+            .order_by(Notification.id)
+            .limit(limit)
+            .subquery()
+        )
+        low, high = db.session.execute(select(func.min(ids.c.id), func.max(ids.c.id))).one()
+        if low is None:
+            return []
+        return [Notification.id.between(low, high), Notification.created_at < cutoff]
+
+    def archive_statement(self, criteria: list[ColumnElement[bool]], archived_at: datetime) -> Insert:
+        """INSERT ... SELECT порції сповіщень у ``notifications_archive`` тієї самої бази."""
+        columns = [getattr(Notification, name) for name in ARCHIVED_COLUMNS]
+        source = select(*columns, literal(archived_at).label("archived_at")).where(*criteria)
+        return NotificationArchive.__table__.insert().from_select([*ARCHIVED_COLUMNS, "archived_at"], source)
+
+    def archive_rows(self, criteria: list[ColumnElement[bool]]) -> list[dict[str, Any]]:
+        """Порція сповіщень як словники для перенесення в окрему базу архіву."""
+        columns = [getattr(Notification, name) for name in ARCHIVED_COLUMNS]
+        return [dict(row._mapping) for row in db.session.execute(select(*columns).where(*criteria))]
+
+    def delete_where(self, *criteria: ColumnElement[bool]) -> int:
+        """``DELETE ... RETURNING reader_id, is_read``: лічильники зменшуються на видалені непрочитані. Без коміту."""
+        stmt = (
+            delete(Notification)
+            .where(*criteria)
+            .returning(Notification.reader_id, Notification.is_read)
+            .execution_options(synchronize_session=False)
+        )
+        removed = db.session.execute(stmt).all()
+        unread = Counter(reader_id for reader_id, is_read in removed if not is_read)
+        self._adjust_unread(Counter({reader_id: -count for reader_id, count in unread.items()}))
+        self._queue_events((reader_id, "removed", {"count": count}) for reader_id, count in unread.items())
+        return len(removed)
+
+    def _record_created(self, notifications: Iterable[Notification]) -> None:
+        unread: Counter[int] = Counter()
+        events = []
+        for notification in notifications:
+            if not notification.is_read:
+                unread[notification.reader_id] += 1
+            events.append(
+                (notification.reader_id, "notification", {"kind": notification.kind, "message": notification.message})
+            )
+        self._adjust_unread(unread)
+        self._queue_events(events)
+
+    def _adjust_unread(self, deltas: Counter[int]) -> None:
+        """Змінює лічильники читачів на ``deltas`` одним executemany ``UPDATE readers``."""
+        rows = [{"reader": reader_id, "delta": delta} for reader_id, delta in deltas.items() if delta]
+        if not rows:
+            return
+        readers = Reader.__table__
+        stmt = (
+            readers.update()
+            .where(readers.c.id == bindparam("reader"))
+            .values(unread_notifications=readers.c.unread_notifications + bindparam("delta"))
+        )
+        db.session.execute(stmt, rows)
+
+    def _queue_events(self, events: Iterable[tuple[int, str, dict[str, Any]]]) -> None:
+        db.session.info.setdefault(EVENTS_KEY, []).extend(events)
+
 
-__all__ = ["NotificationRepository"]
+__all__ = [
+    "ARCHIVED_COLUMNS",
+    "BROADCAST_READERS",
+    "EVENTS_KEY",
+    "NotificationRepository",
+    "recount_unread_statement",
+]
 
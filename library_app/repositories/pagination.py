@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Generic, Sequence, TypeVar
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+T = TypeVar("T")
+
+
+@dataclass
+class Page(Generic[T]):
+    """Сторінка keyset-пагінації: ``next_cursor`` вказує на останній рядок сторінки."""
+
+    items: list[T]
+    limit: int
+    next_cursor: str | None = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_plain(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[Any]) -> list[Any]:
+    """Розбирає курсор і приводить значення до типів ключових колонок; ValueError для некоректного."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise ValueError("Invalid cursor")
+    try:
+        return [None if value is None else _typed(key.type.python_type, value) for key, value in zip(keys, values)]
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _typed(python_type: type, value: Any) -> Any:
+    """Значення курсору з JSON у тип колонки; TypeError, якщо тип не збігається."""
+    if python_type in (date, datetime) or issubclass(python_type, Enum):
+        if not isinstance(value, str):
+            raise TypeError(f"expected ISO string, got {type(value).__name__}")
+        return python_type.fromisoformat(value) if python_type in (date, datetime) else python_type(value)
+    if python_type is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if type(value) is not python_type:
+        raise TypeError(f"expected {python_type.__name__}, got {type(value).__name__}")
+    return value
+
+
+__all__ = ["DEFAULT_PAGE_SIZE", "MAX_PAGE_SIZE", "Page", "decode_cursor", "encode_cursor"]
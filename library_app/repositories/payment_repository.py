@@ -1,23 +1,63 @@
 from __future__ import annotations
 
 from datetime import date, datetime
+from enum import StrEnum
 
-from sqlalchemy import between, select
+from sqlalchemy import Select, between, select
 
+from library_app.models.book import Book
 from library_app.models.payment import Payment
+from library_app.models.reader import Reader
+from library_app.models.rental import Rental
 from library_app.repositories import BaseRepository
 
 
+class PaymentGrouping(StrEnum):
+    DAY = "day"
+    WEEK = "week"  # ключ — дата понеділка
+    MONTH = "month"
+    CATEGORY = "category"  # категорія читача
+    GENRE = "genre"  # жанр книги
+
+
+def _period(start: date, end: date):
+    return between(
+        Payment.paid_date,
+        datetime.combine(start, datetime.min.time()),
+        datetime.combine(end, datetime.max.time()),
+    )
+
+
 class PaymentRepository(BaseRepository[Payment]):
     def __init__(self) -> None:
         super().__init__(Payment)
 
     def between_dates(self, start: date, end: date) -> list[Payment]:
-        start_dt = datetime.combine(start, datetime.min.time())
-        end_dt = datetime.combine(end, datetime.max.time())
-        stmt = select(Payment).where(between(Payment.paid_date, start_dt, end_dt))
+        stmt = select(Payment).where(_period(start, end))
         return list(self.filter(stmt))
 
-
-__all__ = ["PaymentRepository"]
-
+    def export_query(self, start: date | None = None, end: date | None = None) -> Select:
+        """Платежі з контекстом оренди (книга, читач, категорія) у порядку id."""
+        stmt = (
+            select(
+                Payment.id,
+                Payment.paid_date,
+                Payment.total_amount,
+                Payment.rental_id,
+                Book.title.label("book_title"),
+                Reader.full_name.label("reader_name"),
+                Reader.category.label("reader_category"),
+            )
+            .join(Rental, Rental.id == Payment.rental_id)
+            .join(Book, Book.id == Rental.book_id)
+            .join(Reader, Reader.id == Rental.reader_id)
+            .order_by(Payment.id)
+        )
+        if start is not None:
+            stmt = stmt.where(Payment.paid_date >= datetime.combine(start, datetime.min.time()))
+        if end is not None:
+            stmt = stmt.where(Payment.paid_date <= datetime.combine(end, datetime.max.time()))
+        return stmt
+
+
+__all__ = ["PaymentGrouping", "PaymentRepository"]
@@ -1,11 +1,23 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from datetime import date, datetime
+from enum import StrEnum
 
+from sqlalchemy import Row, Select, func, select
+
+from library_app.models import db
 from library_app.models.reader import Reader, ReaderCategory
+from library_app.models.rental import Rental
 from library_app.repositories import BaseRepository
 
 
+class ReaderSegment(StrEnum):
+    ALL = "all"
+    CATEGORY = "category"
+    ACTIVE_RENTALS = "active_rentals"
+    OVERDUE = "overdue"
+
+
 class ReaderRepository(BaseRepository[Reader]):
     def __init__(self) -> None:
         super().__init__(Reader)
@@ -14,6 +26,45 @@ class ReaderRepository(BaseRepository[Reader]):
         stmt = select(Reader).where(Reader.category == category)
         return list(self.filter(stmt))
 
+    def segment_query(
+        self, segment: ReaderSegment, category: ReaderCategory | None = None, today: date | None = None
+    ) -> Select:
+        """SELECT id читачів сегмента — для ``INSERT ... SELECT`` без завантаження читачів у Python."""
+        if segment is ReaderSegment.ALL:
+            return select(Reader.id)
+        if segment is ReaderSegment.CATEGORY:
+            if category is None:
+                raise ValueError("category segment requires a category")
+            return select(Reader.id).where(Reader.category == category)
+        active = select(Rental.reader_id).where(Rental.return_date.is_(None)).distinct()
+        if segment is ReaderSegment.OVERDUE:
+            active = active.where(Rental.due_date < (today or date.today()))
+        return active
+
+    def rental_summaries(self) -> list[Row]:
+        """Повертає (id, full_name, category, total_rentals, active_rentals) для кожного читача."""
+        return list(db.session.execute(self.summaries_query()))
+
+    def summaries_query(self, start: date | None = None, end: date | None = None) -> Select:
+        """Запит для ``rental_summaries``; start/end обмежують дату реєстрації читача."""
+        stmt = (
+            select(
+                Reader.id,
+                Reader.full_name,
+                Reader.category,
+                func.count(Rental.id).label("total_rentals"),
+                func.count(Rental.id).filter(Rental.return_date.is_(None)).label("active_rentals"),
+            )
+            .outerjoin(Rental, Rental.reader_id == Reader.id)
+            .group_by(Reader.id)
+            .order_by(Reader.id)
+        )
+        if start is not None:
+            stmt = stmt.where(Reader.created_at >= datetime.combine(start, datetime.min.time()))
+        if end is not None:
+            stmt = stmt.where(Reader.created_at <= datetime.combine(end, datetime.max.time()))
+        return stmt
+
 
-__all__ = ["ReaderRepository"]
+__all__ = ["ReaderRepository", "ReaderSegment"]
 
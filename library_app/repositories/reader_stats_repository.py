@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Iterable
+
+from sqlalchemy import Insert, Row, Select, delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from library_app.models import db
+from library_app.models.book import Book
+from library_app.models.reader_genre_stats import ReaderGenreStats
+from library_app.models.rental import Rental
+from library_app.repositories import BaseRepository
+
+ReaderGenreKey = tuple[int, str]
+
+
+def backfill_statement(reader_ids: Select | None = None) -> Insert:
+    """INSERT ... SELECT, що агрегує повернені оренди в ``reader_genre_stats`` (цільові рядки мають бути видалені).
+
+    ``reader_ids`` — SELECT читачів, якими обмежується перерахунок.
+    """
+    source = (
+        select(Rental.reader_id, Book.genre, func.count(Rental.id), func.min(Rental.id))
+        .join(Book, Book.id == Rental.book_id)
+        .where(Rental.return_date.is_not(None))
+        .group_by(Rental.reader_id, Book.genre)
+    )
+    if reader_ids is not None:
+        source = source.where(Rental.reader_id.in_(reader_ids))
+    columns = ["reader_id", "genre", "books_read", "first_rental_id"]
+    return ReaderGenreStats.__table__.insert().from_select(columns, source)
+
+
+class ReaderStatsRepository(BaseRepository[ReaderGenreStats]):
+    def __init__(self) -> None:
+        super().__init__(ReaderGenreStats)
+
+    def record(self, returns: Iterable[tuple[ReaderGenreKey, int]]) -> None:
+        """Додає повернення ((читач, жанр), id оренди) до статистики одним upsert.
+
+        Коміт виконує викликач разом із транзакцією, що закрила оренди.
+        """
+        counts: Counter[ReaderGenreKey] = Counter()
+        first_ids: dict[ReaderGenreKey, int] = {}
+        for key, rental_id in returns:
+            counts[key] += 1
+            first_ids[key] = min(rental_id, first_ids.get(key, rental_id))
+        if not counts:
+            return
+        dialect = db.session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        # Скалярний min(a, b) у SQLite відповідає least(a, b) у PostgreSQL.
+        smallest = func.least if dialect == "postgresql" else func.min
+        stmt = insert(ReaderGenreStats)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ReaderGenreStats.reader_id, ReaderGenreStats.genre],
+            set_={
+                "books_read": ReaderGenreStats.books_read + stmt.excluded.books_read,
+                "first_rental_id": smallest(ReaderGenreStats.first_rental_id, stmt.excluded.first_rental_id),
+            },
+        )
+        rows = [
+            {
+                "reader_id": reader_id,
+                "genre": genre,
+                "books_read": count,
+                "first_rental_id": first_ids[(reader_id, genre)],
+            }
+            for (reader_id, genre), count in counts.items()
+        ]
+        db.session.execute(stmt, rows)
+
+    def rebuild(self) -> int:
+        """Перераховує статистику з таблиці ``rentals``; повертає кількість рядків."""
+        db.session.execute(delete(ReaderGenreStats))
+        db.session.execute(backfill_statement())
+        self._save()
+        return db.session.scalar(select(func.count()).select_from(ReaderGenreStats))
+
+    def rebuild_readers(self, reader_ids: Select) -> None:
+        """Перераховує статистику лише читачів з ``reader_ids``; коміт виконує викликач."""
+        stmt = delete(ReaderGenreStats).where(ReaderGenreStats.reader_id.in_(reader_ids))
+        db.session.execute(stmt.execution_options(synchronize_session=False))
+        db.session.execute(backfill_statement(reader_ids))
+
+    def profile(self, reader_id: int) -> Row | None:
+        """(books_read, favorite_genre) одним запитом за первинним ключем; None — читач ще нічого не повернув."""
+        stmt = (
+            select(
+                func.sum(ReaderGenreStats.books_read).over().label("books_read"),
+                ReaderGenreStats.genre.label("favorite_genre"),
+            )
+            .where(ReaderGenreStats.reader_id == reader_id)
+            .order_by(ReaderGenreStats.books_read.desc(), ReaderGenreStats.first_rental_id)
+            .limit(1)
+        )
+        return db.session.execute(stmt).first()
+
+
+__all__ = ["ReaderGenreKey", "ReaderStatsRepository", "backfill_statement"]
@@ -1,11 +1,32 @@
 from __future__ import annotations
 
 from datetime import date
+from enum import StrEnum
 
-from sqlalchemy import and_, select
+from sqlalchemy import Row, Select, and_, func, select
+from sqlalchemy.orm import joinedload, selectinload
 
+from library_app.models import db
+from library_app.models.book import Book
+from library_app.models.reader import Reader
 from library_app.models.rental import Rental
-from library_app.repositories import BaseRepository
+from library_app.repositories import BaseRepository, Page
+
+
+class LoadProfile(StrEnum):
+    """Як завантажувати книгу та читача разом з орендами."""
+
+    LAZY = "lazy"  # окремий SELECT при першому зверненні (N+1 у циклах)
+    JOINED = "joined"  # LEFT JOIN в тому ж запиті — для сторінок та невеликих списків
+    SELECTIN = "selectin"  # два додаткові запити IN (...) — для великих вибірок
+
+
+def with_profile(stmt: Select, load: LoadProfile) -> Select:
+    if load is LoadProfile.JOINED:
+        return stmt.options(joinedload(Rental.book), joinedload(Rental.reader))
+    if load is LoadProfile.SELECTIN:
+        return stmt.options(selectinload(Rental.book), selectinload(Rental.reader))
+    return stmt
 
 
 class RentalRepository(BaseRepository[Rental]):
@@ -16,19 +37,101 @@ class RentalRepository(BaseRepository[Rental]):
         stmt = select(Rental).where(Rental.return_date.is_(None))
         return list(self.filter(stmt))
 
-    def overdue_rentals(self, reference_date: date | None = None) -> list[Rental]:
+    def overdue_rentals(
+        self, reference_date: date | None = None, load: LoadProfile = LoadProfile.LAZY
+    ) -> list[Rental]:
         ref_date = reference_date or date.today()
         stmt = select(Rental).where(
             and_(Rental.return_date.is_(None), Rental.due_date < ref_date)
         )
+        return list(self.filter(with_profile(stmt, load)))
+
+    def overdue_rows(self, reference_date: date) -> list[Row]:
+        """Проєкція прострочених оренд: (id, due_date, book_title, reader_name) одним запитом без ORM-об'єктів."""
+        return list(db.session.execute(self.overdue_query(reference_date)))
+
+    def overdue_query(self, reference_date: date) -> Select:
+        return (
+            select(
+                Rental.id,
+                Rental.due_date,
+                Book.title.label("book_title"),
+                Reader.full_name.label("reader_name"),
+            )
+            .join(Book, Book.id == Rental.book_id)
+            .join(Reader, Reader.id == Rental.reader_id)
+            .where(Rental.return_date.is_(None), Rental.due_date < reference_date)
+            .order_by(Rental.due_date, Rental.id)
+        )
+
+    def history_query(self, start: date | None = None, end: date | None = None) -> Select:
+        """Проєкція історії оренд з назвою книги та іменем читача; start/end — за датою видачі."""
+        stmt = (
+            select(
+                Rental.id,
+                Rental.rent_date,
+                Rental.due_date,
+                Rental.return_date,
+                Rental.book_id,
+                Book.title.label("book_title"),
+                Rental.reader_id,
+                Reader.full_name.label("reader_name"),
+                Rental.fine_amount,
+                Rental.damage_amount,
+            )
+            .join(Book, Book.id == Rental.book_id)
+            .join(Reader, Reader.id == Rental.reader_id)
+            .order_by(Rental.id)
+        )
+        if start is not None:
+            stmt = stmt.where(Rental.rent_date >= start)
+        if end is not None:
+            stmt = stmt.where(Rental.rent_date <= end)
+        return stmt
+
+    def page_with_details(
+        self, limit: int, cursor: str | None = None, load: LoadProfile = LoadProfile.JOINED
+    ) -> Page[Rental]:
+        return self.page(limit, cursor, with_profile(select(Rental), load))
+
+    def due_or_overdue(self, reference_date: date) -> list[Rental]:
+        """Активні оренди з терміном повернення сьогодні або раніше (разом із книгами)."""
+        stmt = (
+            select(Rental)
+            .where(Rental.return_date.is_(None), Rental.due_date <= reference_date)
+            .options(selectinload(Rental.book))
+        )
         return list(self.filter(stmt))
 
-    def for_reader(self, reader_id: int, active_only: bool = False) -> list[Rental]:
+    def with_details(self, rental_ids: set[int]) -> dict[int, Rental]:
+        """Оренди за списком id разом із книгами та читачами (три запити незалежно від кількості)."""
+        if not rental_ids:
+            return {}
+        stmt = (
+            select(Rental)
+            .where(Rental.id.in_(rental_ids))
+            .options(selectinload(Rental.book), selectinload(Rental.reader))
+        )
+        return {rental.id: rental for rental in self.filter(stmt)}
+
+    def for_reader(
+        self, reader_id: int, active_only: bool = False, load: LoadProfile = LoadProfile.LAZY
+    ) -> list[Rental]:
         stmt = select(Rental).where(Rental.reader_id == reader_id)
         if active_only:
             stmt = stmt.where(Rental.return_date.is_(None))
-        return list(self.filter(stmt))
+        return list(self.filter(with_profile(stmt, load)))
+
+    def book_counts_by_reader(self) -> list[Row]:
+        """Повертає (reader_id, book_title, rental_count) у порядку першої оренди книги."""
+        stmt = (
+            select(Rental.reader_id, Book.title.label("book_title"), func.count(Rental.id).label("rental_count"))
+            .join(Book, Book.id == Rental.book_id)
+            .group_by(Rental.reader_id, Book.title)
+            .order_by(Rental.reader_id, func.min(Rental.id))
+        )
+        return list(db.session.execute(stmt))
 
 
-__all__ = ["RentalRepository"]
+__all__ = ["LoadProfile", "RentalRepository", "with_profile"]
 
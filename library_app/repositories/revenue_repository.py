@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from collections import Counter
+from datetime import date
+from typing import Iterable
+
+from sqlalchemy import Insert, Row, Select, delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from library_app.models import db
+from library_app.models.book import Book
+from library_app.models.daily_revenue import DailyRevenue
+from library_app.models.payment import Payment
+from library_app.models.reader import Reader, ReaderCategory
+from library_app.models.rental import Rental
+from library_app.repositories import BaseRepository
+from library_app.repositories.payment_repository import PaymentGrouping
+
+RevenueKey = tuple[date, ReaderCategory, str]
+
+
+def backfill_statement(days: Select | None = None) -> Insert:
+    """INSERT ... SELECT, що агрегує платежі в ``daily_revenue`` (цільові рядки мають бути видалені).
+
+    ``days`` — SELECT днів (``date(paid_date)``), якими обмежується перерахунок.
+    """
+    day = func.date(Payment.paid_date)
+    source = (
+        select(
+            day,
+            Reader.category,
+            Book.genre,
+            func.count(Payment.id),
+            func.sum(Payment.total_amount),
+        )
+        .join(Rental, Rental.id == Payment.rental_id)
+        .join(Reader, Reader.id == Rental.reader_id)
+        .join(Book, Book.id == Rental.book_id)
+        .group_by(day, Reader.category, Book.genre)
+    )
+    if days is not None:
+        source = source.where(day.in_(days))
+    columns = ["day", "category", "genre", "payments_count", "total_amount"]
+    return DailyRevenue.__table__.insert().from_select(columns, source)
+
+
+class RevenueRepository(BaseRepository[DailyRevenue]):
+    def __init__(self) -> None:
+        super().__init__(DailyRevenue)
+
+    def record(self, payments: Iterable[tuple[RevenueKey, float]], sign: int = 1) -> None:
+        """Додає платежі ((день, категорія, жанр), сума) до денних підсумків одним upsert.
+
+        ``sign=-1`` віднімає видалені чи виправлені платежі; підсумки без платежів видаляються.
+        Коміт виконує викликач разом із транзакцією, що змінила платежі.
+        """
+        amounts: Counter[RevenueKey] = Counter()
+        counts: Counter[RevenueKey] = Counter()
+        for key, amount in payments:
+            amounts[key] += sign * amount
+            counts[key] += sign
+        if not counts:
+            return
+        dialect = db.session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(DailyRevenue)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DailyRevenue.day, DailyRevenue.category, DailyRevenue.genre],
+            set_={
+                "payments_count": DailyRevenue.payments_count + stmt.excluded.payments_count,
+                "total_amount": DailyRevenue.total_amount + stmt.excluded.total_amount,
+            },
+        )
+        rows = [
+            {
+                "day": day,
+                "category": category,
+                "genre": genre,
+                "payments_count": counts[(day, category, genre)],
+                "total_amount": amount,
+            }
+            for (day, category, genre), amount in amounts.items()
+        ]
+        db.session.execute(stmt, rows)
+        if sign < 0:
+            days = {day for day, _, _ in counts}
+            db.session.execute(
+                delete(DailyRevenue).where(DailyRevenue.day.in_(days), DailyRevenue.payments_count <= 0)
+            )
+
+    def rebuild(self) -> int:
+        """Перераховує підсумки з таблиці ``payments``; повертає кількість рядків."""
+        db.session.execute(delete(DailyRevenue))
+        db.session.execute(backfill_statement())
+        self._save()
+        return db.session.scalar(select(func.count()).select_from(DailyRevenue))
+
+    def rebuild_days(self, days: Select) -> None:
+        """Перераховує підсумки лише за дні з ``days``; коміт виконує викликач."""
+        stmt = delete(DailyRevenue).where(DailyRevenue.day.in_(days))
+        db.session.execute(stmt.execution_options(synchronize_session=False))
+        db.session.execute(backfill_statement(days))
+
+    def totals_between(self, start: date, end: date) -> Row:
+        stmt = select(
+            func.coalesce(func.sum(DailyRevenue.total_amount), 0.0).label("total"),
+            func.coalesce(func.sum(DailyRevenue.payments_count), 0).label("count"),
+        ).where(DailyRevenue.day.between(start, end))
+        return db.session.execute(stmt).one()
+
+    def grouped_totals(self, start: date, end: date, group_by: PaymentGrouping) -> list[Row]:
+        """(bucket, total, count) з денних підсумків — O(днів × категорій × жанрів), а не O(платежів)."""
+        buckets = {
+            PaymentGrouping.DAY: DailyRevenue.day,
+            PaymentGrouping.WEEK: func.date(DailyRevenue.day, "weekday 0", "-6 days"),
+            PaymentGrouping.MONTH: func.strftime("%Y-%m", DailyRevenue.day),
+            PaymentGrouping.CATEGORY: DailyRevenue.category,
+            PaymentGrouping.GENRE: DailyRevenue.genre,
+        }
+        bucket = buckets[group_by]
+        stmt = (
+            select(
+                bucket.label("bucket"),
+                func.sum(DailyRevenue.total_amount).label("total"),
+                func.sum(DailyRevenue.payments_count).label("count"),
+            )
+            .where(DailyRevenue.day.between(start, end))
+            .group_by(bucket)
+            .order_by(bucket)
+        )
+        return list(db.session.execute(stmt))
+
+
+__all__ = ["RevenueKey", "RevenueRepository", "backfill_statement"]
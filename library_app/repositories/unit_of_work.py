@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from flask import Flask, Response
+from sqlalchemy.orm import SessionTransaction
+
+from library_app.models import db
+
+_DEPTH_KEY = "unit_of_work_depth"
+
+
+def in_unit_of_work() -> bool:
+    return db.session.info.get(_DEPTH_KEY, 0) > 0
+
+
+@contextmanager
+def unit_of_work() -> Iterator[None]:
+    """Об'єднує операції репозиторіїв в одну транзакцію.
+
+    Усередині блоку ``add``/``delete``/``update`` лише виконують flush; коміт
+    відбувається один раз при виході з зовнішнього блоку, а виняток відкочує
+    всю транзакцію. Вкладений блок працює в SAVEPOINT: його виняток відкочує
+    лише власні зміни, навіть якщо викликач перехопить виняток і продовжить.
+    """
+    session = db.session
+    depth = session.info.get(_DEPTH_KEY, 0)
+    savepoint = _begin_savepoint() if depth > 0 else None
+    session.info[_DEPTH_KEY] = depth + 1
+    try:
+        yield
+    except BaseException:
+        session.info[_DEPTH_KEY] = depth
+        if savepoint is not None:
+            savepoint.rollback()
+        else:
+            session.rollback()
+        raise
+    session.info[_DEPTH_KEY] = depth
+    if savepoint is not None:
+        savepoint.commit()
+    else:
+        session.commit()
+
+
+def _begin_savepoint() -> SessionTransaction:
+    session = db.session
+    # pysqlite відкриває транзакцію лише перед DML; SAVEPOINT поза BEGIN сам став би
+    # зовнішньою транзакцією, і його RELEASE закомітив би зміни повз зовнішній блок.
+    connection = session.connection()
+    if getattr(connection.connection.dbapi_connection, "in_transaction", True) is False:
+        connection.exec_driver_sql("BEGIN")
+    return session.begin_nested()
+
+
+def init_unit_of_work(app: Flask) -> None:
+    """За ``UNIT_OF_WORK_PER_REQUEST`` увесь запит виконується однією транзакцією."""
+    if not app.config["UNIT_OF_WORK_PER_REQUEST"]:
+        return
+
+    @app.before_request
+    def begin_request_unit_of_work() -> None:
+        db.session.info[_DEPTH_KEY] = db.session.info.get(_DEPTH_KEY, 0) + 1
+
+    @app.after_request
+    def commit_request_unit_of_work(response: Response) -> Response:
+        db.session.info[_DEPTH_KEY] = 0
+        # Відповідь з помилкою (4xx/5xx) не залишає в базі часткових змін обробника.
+        if response.status_code >= 400:
+            db.session.rollback()
+        else:
+            db.session.commit()
+        return response
+
+    @app.teardown_request
+    def rollback_request_unit_of_work(exc: BaseException | None) -> None:
+        if exc is not None or db.session.info.get(_DEPTH_KEY, 0) > 0:
+            db.session.info[_DEPTH_KEY] = 0
+            db.session.rollback()
+
+
+__all__ = ["unit_of_work", "in_unit_of_work", "init_unit_of_work"]
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn
+
+from library_app.models import db
+from library_app.models.daily_revenue import DailyRevenue
+from library_app.models.reader_genre_stats import ReaderGenreStats
+from library_app.repositories.book_search import FTS_TABLE, book_search_index
+from library_app.repositories.notification_repository import recount_unread_statement
+from library_app.repositories.reader_stats_repository import backfill_statement as backfill_reader_stats
+from library_app.repositories.revenue_repository import backfill_statement as backfill_revenue
+
+# Підсумкові таблиці, які після створення заповнюються з наявних даних.
+_BACKFILLS = {
+    DailyRevenue.__tablename__: backfill_revenue,
+    ReaderGenreStats.__tablename__: backfill_reader_stats,
+}
+# Денормалізовані колонки, які після додавання заповнюються з наявних даних.
+_COLUMN_BACKFILLS = {
+    "readers.unread_notifications": recount_unread_statement,
+}
+
+
+def _add_missing_columns(connection: Connection) -> list[str]:
+    applied: list[str] = []
+    inspector = inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present:
+                continue
+            ddl = CreateColumn(column).compile(dialect=connection.dialect)
+            connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+            applied.append(f"column {table.name}.{column.name}")
+    return applied
+
+
+def _create_missing_indexes(connection: Connection) -> list[str]:
+    applied: list[str] = []
+    inspector = inspect(connection)
+    for table in db.metadata.sorted_tables:
+        present = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in present:
+                index.create(bind=connection)
+                applied.append(f"index {index.name}")
+    return applied
+
+
+def _ensure_search_index(connection: Connection) -> list[str]:
+    if connection.dialect.name != "sqlite" or FTS_TABLE in inspect(connection).get_table_names():
+        return []
+    if not book_search_index.install(connection):
+        return []
+    connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return [f"search index {FTS_TABLE}"]
+
+
+def upgrade_schema() -> list[str]:
+    """Доводить наявну базу до поточної схеми без втрати даних.
+
+    Створює відсутні таблиці, додає нові колонки через ``ALTER TABLE ADD COLUMN``,
+    будує відсутні індекси та FTS-індекс каталогу, заповнює щойно створені підсумкові таблиці. Повторний запуск нічого не змінює.
+    Повертає перелік застосованих кроків.
+    """
+    applied: list[str] = []
+    with db.engine.begin() as connection:
+        existing_tables = set(inspect(connection).get_table_names())
+        db.metadata.create_all(bind=connection)
+        applied += [
+            f"table {table.name}"
+            for table in db.metadata.sorted_tables
+            if table.name not in existing_tables
+        ]
+        added_columns = _add_missing_columns(connection)
+        applied += added_columns
+        for column_name, backfill in _COLUMN_BACKFILLS.items():
+            if f"column {column_name}" in added_columns:
+                connection.execute(backfill())
+                applied.append(f"backfill {column_name}")
+        applied += _create_missing_indexes(connection)
+        applied += _ensure_search_index(connection)
+        for table_name, backfill in _BACKFILLS.items():
+            if table_name not in existing_tables:
+                connection.execute(backfill())
+                applied.append(f"backfill {table_name}")
+    return applied
+
+
+__all__ = ["upgrade_schema"]
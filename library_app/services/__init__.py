@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from library_app.repositories.book_repository import BookRepository
+from library_app.repositories.job_lease_repository import JobLeaseRepository
 from library_app.repositories.notification_repository import NotificationRepository
 from library_app.repositories.payment_repository import PaymentRepository
 from library_app.repositories.reader_repository import ReaderRepository
+from library_app.repositories.reader_stats_repository import ReaderStatsRepository
 from library_app.repositories.rental_repository import RentalRepository
+from library_app.repositories.revenue_repository import RevenueRepository
 from library_app.repositories.user_repository import UserRepository
 
 book_repository = BookRepository()
@@ -13,6 +16,9 @@ rental_repository = RentalRepository()
 payment_repository = PaymentRepository()
 notification_repository = NotificationRepository()
 user_repository = UserRepository()
+job_lease_repository = JobLeaseRepository()
+revenue_repository = RevenueRepository()
+reader_stats_repository = ReaderStatsRepository()
 
 __all__ = [
     "book_repository",
@@ -21,5 +27,8 @@ __all__ = [
     "payment_repository",
     "notification_repository",
     "user_repository",
+    "job_lease_repository",
+    "revenue_repository",
+    "reader_stats_repository",
 ]
 
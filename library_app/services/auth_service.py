@@ -3,12 +3,17 @@ from __future__ import annotations
 from dataclasses import dataclass
 from functools import wraps
 
-from flask import flash, g, jsonify, redirect, request, session, url_for
+from flask import Flask, current_app, flash, g, has_app_context, jsonify, redirect, request, session, url_for
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
 from werkzeug.security import check_password_hash, generate_password_hash
 
+from library_app.models import db
 from library_app.models.reader import Reader, ReaderCategory
 from library_app.models.user import User, UserRole
+from library_app.repositories import unit_of_work
 from library_app.services import reader_repository, user_repository
+from library_app.services.cache import CacheBackend, create_cache
 
 
 @dataclass
@@ -18,7 +23,28 @@ class AuthResult:
     user: User | None = None
 
 
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Незмінні дані авторизованого користувача, потрібні запиту; зберігаються у кеші між запитами."""
+
+    id: int
+    email: str
+    full_name: str
+    role: UserRole
+    reader_id: int | None
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(user.id, user.email, user.full_name, user.role, user.reader_id)
+
+    def is_admin(self) -> bool:
+        return self.role == UserRole.ADMIN
+
+
 SESSION_USER_KEY = "user_id"
+_DIRTY_KEY = "user_cache_dirty"
+# Позначка «скинути весь кеш» у множині змінених користувачів.
+_ALL_USERS = None
 
 
 def register_user(
@@ -37,22 +63,23 @@ def register_user(
     if not user_repository.has_admin():
         role = UserRole.ADMIN
 
-    reader = Reader(
-        full_name=full_name,
-        address=address,
-        phone=phone,
-        category=ReaderCategory.REGULAR,
-    )
-    reader_repository.add(reader)
-
-    user = User(
-        email=email_normalized,
-        full_name=full_name,
-        password_hash=generate_password_hash(password),
-        role=role,
-        reader_id=reader.id,
-    )
-    user_repository.add(user)
+    with unit_of_work():
+        reader = Reader(
+            full_name=full_name,
+            address=address,
+            phone=phone,
+            category=ReaderCategory.REGULAR,
+        )
+        reader_repository.add(reader)
+
+        user = User(
+            email=email_normalized,
+            full_name=full_name,
+            password_hash=generate_password_hash(password),
+            role=role,
+            reader_id=reader.id,
+        )
+        user_repository.add(user)
     return AuthResult(True, "Реєстрацію успішно завершено.", user)
 
 
@@ -64,23 +91,48 @@ def authenticate(email: str, password: str) -> AuthResult:
     return AuthResult(True, "Вхід виконано.", user)
 
 
+def _user_cache() -> CacheBackend:
+    return current_app.extensions["user_cache"]
+
+
+def _cache_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
 def login_user(user: User) -> None:
     session[SESSION_USER_KEY] = user.id
+    _user_cache().set(_cache_key(user.id), UserSnapshot.from_user(user))
 
 
 def logout_user() -> None:
-    session.pop(SESSION_USER_KEY, None)
+    user_id = session.pop(SESSION_USER_KEY, None)
+    if user_id is not None:
+        _user_cache().delete(_cache_key(user_id))
 
 
-def load_logged_in_user() -> None:
-    user_id = session.get(SESSION_USER_KEY)
-    if user_id is None:
-        g.current_user = None
-    else:
-        g.current_user = user_repository.get(user_id)
+def _is_static_request() -> bool:
+    endpoint = request.endpoint or ""
+    return endpoint == "static" or endpoint.endswith(".static")
 
 
-def current_user() -> User | None:
+def load_logged_in_user() -> None:
+    """Кладе в ``g`` знімок користувача сесії: з кешу, а за промаху — одним запитом до БД."""
+    g.current_user = None
+    user_id = session.get(SESSION_USER_KEY)
+    if user_id is None or _is_static_request():
+        return
+    cache = _user_cache()
+    snapshot = cache.get(_cache_key(user_id))
+    if snapshot is None:
+        user = user_repository.get(user_id)
+        if user is None:
+            return
+        snapshot = UserSnapshot.from_user(user)
+        cache.set(_cache_key(user_id), snapshot)
+    g.current_user = snapshot
+
+
+def current_user() -> UserSnapshot | None:
     return getattr(g, "current_user", None)
 
 
@@ -126,6 +178,59 @@ def admin_required(view):
     return wrapped_view
 
 
+def _mark_dirty(session_: Session | None, user_id: int | None) -> None:
+    if session_ is not None:
+        session_.info.setdefault(_DIRTY_KEY, set()).add(user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target: User) -> None:
+    _mark_dirty(object_session(target), target.id)
+
+
+@event.listens_for(Reader, "after_delete")
+def _reader_deleted(mapper, connection, target: Reader) -> None:
+    # Знімок не містить полів читача, але видалення залишає reader_id користувача недійсним.
+    _mark_dirty(object_session(target), _ALL_USERS)
+
+
+def _orm_execute(orm_execute_state) -> None:
+    if orm_execute_state.is_select:
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ in (User, Reader):
+        _mark_dirty(orm_execute_state.session, _ALL_USERS)
+
+
+def _after_commit(session_: Session) -> None:
+    user_ids = session_.info.pop(_DIRTY_KEY, None)
+    if not user_ids or not has_app_context() or "user_cache" not in current_app.extensions:
+        return
+    cache = _user_cache()
+    if _ALL_USERS in user_ids:
+        cache.clear()
+        return
+    for user_id in user_ids:
+        cache.delete(_cache_key(user_id))
+
+
+def _after_rollback(session_: Session) -> None:
+    session_.info.pop(_DIRTY_KEY, None)
+
+
+def init_user_cache(app: Flask) -> CacheBackend:
+    """Кеш знімків користувачів у процесі; TTL обмежує застарівання між воркерами."""
+    ttl = app.config["USER_CACHE_TTL"]
+    cache = create_cache("memory" if ttl else "none", ttl=ttl, max_entries=app.config["USER_CACHE_SIZE"])
+    app.extensions["user_cache"] = cache
+    if not event.contains(db.session, "do_orm_execute", _orm_execute):
+        event.listen(db.session, "do_orm_execute", _orm_execute)
+        event.listen(db.session, "after_commit", _after_commit)
+        event.listen(db.session, "after_rollback", _after_rollback)
+    return cache
+
+
 __all__ = [
     "register_user",
     "authenticate",
@@ -138,5 +243,7 @@ __all__ = [
     "login_required",
     "admin_required",
     "AuthResult",
+    "UserSnapshot",
+    "init_user_cache",
 ]
 
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "invalidations": self.invalidations}
+
+
+class CacheBackend(ABC):
+    """Кеш із TTL та лічильниками влучань; конкретне сховище обирається конфігурацією."""
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Any | None:
+        value = self._get(key)
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._set(key, value, time.time() + self.ttl)
+
+    def delete(self, key: str) -> None:
+        self.stats.invalidations += 1
+        self._delete(key)
+
+    def clear(self) -> None:
+        self.stats.invalidations += 1
+        self._clear()
+
+    @abstractmethod
+    def _get(self, key: str) -> Any | None: ...
+
+    @abstractmethod
+    def _set(self, key: str, value: Any, expires_at: float) -> None: ...
+
+    @abstractmethod
+    def _delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def _clear(self) -> None: ...
+
+
+class NullCache(CacheBackend):
+    def _get(self, key: str) -> Any | None:
+        return None
+
+    def _set(self, key: str, value: Any, expires_at: float) -> None:
+        pass
+
+    def _delete(self, key: str) -> None:
+        pass
+
+    def _clear(self) -> None:
+        pass
+
+
+class LRUCache(CacheBackend):
+    """Кеш у пам'яті процесу з витісненням найдавніше використаних записів."""
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key: str, value: Any, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache(CacheBackend):
+    """Локальний кеш у файлі SQLite, спільний для кількох процесів на одному сервері."""
+
+    def __init__(self, ttl: float, path: str) -> None:
+        super().__init__(ttl)
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, expires_at REAL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def _get(self, key: str) -> Any | None:
+        row = self._connection().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at >= ?", (key, time.time())
+        ).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def _set(self, key: str, value: Any, expires_at: float) -> None:
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, pickle.dumps(value), expires_at),
+            )
+
+    def _delete(self, key: str) -> None:
+        with self._connection() as connection:
+            connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def _clear(self) -> None:
+        with self._connection() as connection:
+            connection.execute("DELETE FROM cache")
+
+
+def create_cache(backend: str, ttl: float, max_entries: int, path: str | None = None) -> CacheBackend:
+    if backend == "memory":
+        return LRUCache(ttl, max_entries)
+    if backend == "sqlite":
+        if not path:
+            raise ValueError("SQLite cache backend requires a path")
+        return SQLiteCache(ttl, path)
+    if backend == "none":
+        return NullCache(ttl)
+    raise ValueError(f"Unknown cache backend {backend!r}")
+
+
+__all__ = [
+    "CacheBackend",
+    "CacheStats",
+    "LRUCache",
+    "NullCache",
+    "SQLiteCache",
+    "create_cache",
+]
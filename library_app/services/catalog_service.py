@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from flask import Flask, current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from library_app.models import db
+from library_app.models.book import Book
+from library_app.services import book_repository
+from library_app.services.cache import CacheBackend, create_cache
+
+CATALOG_FIELDS = (
+    "title",
+    "author",
+    "genre",
+    "collateral_value",
+    "daily_rent_price",
+    "available_copies",
+)
+_DIRTY_KEY = "catalog_dirty"
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """Незмінний знімок книги для вітрини; безпечно зберігається у кеші між запитами."""
+
+    id: int
+    title: str
+    author: str
+    genre: str
+    collateral_value: float
+    daily_rent_price: float
+    available_copies: int
+
+    @classmethod
+    def from_book(cls, book: Book) -> "CatalogEntry":
+        return cls(book.id, *(getattr(book, field) for field in CATALOG_FIELDS))
+
+
+class CatalogService:
+    """Read-through кеш каталогу: ключ — пошуковий запит, скидання — після коміту змін книг."""
+
+    def cache(self) -> CacheBackend:
+        return current_app.extensions["catalog_cache"]
+
+    def available_books(self, query: str = "") -> list[CatalogEntry]:
+        key = f"catalog:{query.casefold()}"
+        cache = self.cache()
+        entries = cache.get(key)
+        if entries is None:
+            books = book_repository.search_available(query) if query else book_repository.find_available()
+            entries = [CatalogEntry.from_book(book) for book in books]
+            cache.set(key, entries)
+        return entries
+
+    def invalidate(self) -> None:
+        if has_app_context() and "catalog_cache" in current_app.extensions:
+            self.cache().clear()
+
+
+catalog_service = CatalogService()
+
+
+def _mark_dirty(session: Session | None) -> None:
+    if session is not None:
+        session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Book, "after_insert")
+@event.listens_for(Book, "after_delete")
+def _book_row_changed(mapper, connection, target: Book) -> None:
+    _mark_dirty(object_session(target))
+
+
+@event.listens_for(Book, "after_update")
+def _book_updated(mapper, connection, target: Book) -> None:
+    state = db.inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in CATALOG_FIELDS):
+        _mark_dirty(object_session(target))
+
+
+def _orm_execute(orm_execute_state) -> None:
+    # Масові UPDATE/DELETE/INSERT (reserve_copy, release_copy, імпорт) оминають події маперів.
+    if orm_execute_state.is_select:
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ is Book:
+        _mark_dirty(orm_execute_state.session)
+
+
+def _after_commit(session: Session) -> None:
+    if session.info.pop(_DIRTY_KEY, False):
+        catalog_service.invalidate()
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_DIRTY_KEY, None)
+
+
+def init_catalog_cache(app: Flask) -> CacheBackend:
+    cache = create_cache(
+        app.config["CATALOG_CACHE_BACKEND"],
+        ttl=app.config["CATALOG_CACHE_TTL"],
+        max_entries=app.config["CATALOG_CACHE_SIZE"],
+        path=app.config["CATALOG_CACHE_PATH"],
+    )
+    app.extensions["catalog_cache"] = cache
+    if not event.contains(db.session, "do_orm_execute", _orm_execute):
+        event.listen(db.session, "do_orm_execute", _orm_execute)
+        event.listen(db.session, "after_commit", _after_commit)
+        event.listen(db.session, "after_rollback", _after_rollback)
+    return cache
+
+
+__all__ = ["CatalogEntry", "CatalogService", "catalog_service", "init_catalog_cache"]
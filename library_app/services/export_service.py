@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Callable, Iterable, Iterator
+
+from sqlalchemy import Select
+
+from library_app.repositories import BaseRepository
+from library_app.services import (
+    book_repository,
+    payment_repository,
+    reader_repository,
+    rental_repository,
+)
+
+# Скільки рядків накопичувати перед відправкою шматка відповіді.
+CHUNK_ROWS = 500
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    """Потоковий експорт: запит-проєкція та порядок колонок у файлі."""
+
+    repository: BaseRepository
+    query: Callable[[date | None, date | None], Select]
+    columns: tuple[str, ...]
+
+
+# start/end: payments — дата платежу, rentals — дата видачі, readers — дата реєстрації,
+# overdue — end як дата, на яку рахується прострочення; inventory — без фільтрів.
+EXPORTS: dict[str, ExportSpec] = {
+    "inventory": ExportSpec(
+        book_repository,
+        lambda start, end: book_repository.inventory_query(),
+        ("id", "title", "author", "available_copies", "lent_out"),
+    ),
+    "overdue": ExportSpec(
+        rental_repository,
+        lambda start, end: rental_repository.overdue_query(end or date.today()),
+        ("id", "due_date", "book_title", "reader_name"),
+    ),
+    "readers": ExportSpec(
+        reader_repository,
+        reader_repository.summaries_query,
+        ("id", "full_name", "category", "total_rentals", "active_rentals"),
+    ),
+    "payments": ExportSpec(
+        payment_repository,
+        payment_repository.export_query,
+        ("id", "paid_date", "total_amount", "rental_id", "book_title", "reader_name", "reader_category"),
+    ),
+    "rentals": ExportSpec(
+        rental_repository,
+        rental_repository.history_query,
+        (
+            "id",
+            "rent_date",
+            "due_date",
+            "return_date",
+            "book_id",
+            "book_title",
+            "reader_id",
+            "reader_name",
+            "fine_amount",
+            "damage_amount",
+        ),
+    ),
+}
+
+
+def _plain(value: object) -> object:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def export_rows(name: str, start: date | None = None, end: date | None = None) -> Iterator[tuple]:
+    spec = EXPORTS[name]
+    for row in spec.repository.stream(spec.query(start, end)):
+        yield tuple(_plain(row._mapping[column]) for column in spec.columns)
+
+
+def encode_csv(columns: tuple[str, ...], rows: Iterable[tuple]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def encode_ndjson(columns: tuple[str, ...], rows: Iterable[tuple]) -> Iterator[str]:
+    lines: list[str] = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+        if len(lines) >= CHUNK_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines.clear()
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def gzip_chunks(chunks: Iterable[str]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # 31 — контейнер gzip
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+ENCODERS = {"csv": encode_csv, "ndjson": encode_ndjson}
+
+
+__all__ = ["EXPORTS", "ENCODERS", "ExportSpec", "encode_csv", "encode_ndjson", "export_rows", "gzip_chunks"]
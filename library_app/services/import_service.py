@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import csv
+import json
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Callable, Iterable, Iterator
+
+from sqlalchemy import insert
+
+from library_app.models import db
+from library_app.models.book import Book
+from library_app.models.reader import Reader, ReaderCategory
+from library_app.repositories import unit_of_work
+from library_app.services.reader_factory import get_reader_creator
+
+DEFAULT_CHUNK_SIZE = 5_000
+# Скільки помилок повертати у відповіді; повний перелік — у файлі звіту.
+MAX_REPORTED_ERRORS = 20
+FORMATS = ("csv", "jsonl")
+# Помилки всього файлу (не окремого рядка): неправильне кодування чи зламаний CSV.
+UNREADABLE_FILE_ERRORS = (UnicodeDecodeError, csv.Error)
+
+
+@dataclass
+class RowError:
+    line: int
+    error: str
+    record: dict[str, Any] | str
+
+
+@dataclass
+class ImportReport:
+    kind: str
+    imported: int = 0
+    failed: int = 0
+    errors: list[RowError] = field(default_factory=list)
+    error_report: Path | None = None
+
+    @property
+    def total(self) -> int:
+        return self.imported + self.failed
+
+
+def detect_format(filename: str | None, explicit: str | None = None) -> str:
+    if explicit:
+        fmt = explicit.lower()
+    else:
+        suffix = Path(filename or "").suffix.lower()
+        fmt = "jsonl" if suffix in (".jsonl", ".ndjson") else "csv"
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {list(FORMATS)}")
+    return fmt
+
+
+def read_records(stream: IO[str], fmt: str) -> Iterator[tuple[int, dict[str, Any] | str]]:
+    """Читає записи по одному: (номер рядка, словник) або (номер рядка, сирий рядок) для битого JSON."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            yield line_no, line.rstrip("\n")
+            continue
+        yield line_no, record if isinstance(record, dict) else line.rstrip("\n")
+
+
+def _text(record: dict[str, Any], name: str, max_length: int) -> str:
+    value = str(record.get(name) or "").strip()
+    if not value:
+        raise ValueError(f"{name} is required")
+    if len(value) > max_length:
+        raise ValueError(f"{name} is longer than {max_length} characters")
+    return value
+
+
+def _number(record: dict[str, Any], name: str, cast: Callable[[Any], float | int], default=None):
+    raw = record.get(name)
+    if raw in (None, ""):
+        if default is None:
+            raise ValueError(f"{name} is required")
+        return default
+    try:
+        value = cast(raw)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a number") from None
+    if not math.isfinite(value):
+        raise ValueError(f"{name} must be a finite number")
+    if value < 0:
+        raise ValueError(f"{name} must not be negative")
+    return value
+
+
+def book_row(record: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "title": _text(record, "title", 255),
+        "author": _text(record, "author", 255),
+        "genre": _text(record, "genre", 128),
+        "collateral_value": _number(record, "collateral_value", float),
+        "daily_rent_price": _number(record, "daily_rent_price", float),
+        "available_copies": _number(record, "available_copies", int, default=1),
+    }
+
+
+def reader_row(record: dict[str, Any]) -> dict[str, Any]:
+    raw_category = str(record.get("category") or ReaderCategory.REGULAR).strip().lower()
+    try:
+        category = ReaderCategory(raw_category)
+    except ValueError:
+        raise ValueError(f"category must be one of {[c.value for c in ReaderCategory]}") from None
+    reader = get_reader_creator(category).create_reader(
+        full_name=_text(record, "full_name", 255),
+        address=_text(record, "address", 255),
+        phone=_text(record, "phone", 32),
+    )
+    return {
+        "full_name": reader.full_name,
+        "address": reader.address,
+        "phone": reader.phone,
+        "category": reader.category,
+    }
+
+
+IMPORTERS: dict[str, tuple[type[db.Model], Callable[[dict[str, Any]], dict[str, Any]]]] = {
+    "books": (Book, book_row),
+    "readers": (Reader, reader_row),
+}
+
+
+class _ErrorReport:
+    """CSV зі змістом відхилених рядків; файл створюється лише за першої помилки."""
+
+    def __init__(self, path: Path | None) -> None:
+        self.path = path
+        self._file: IO[str] | None = None
+        self._writer = None
+
+    def write(self, error: RowError) -> None:
+        if self.path is None:
+            return
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(["line", "error", "record"])
+        record = error.record if isinstance(error.record, str) else json.dumps(error.record, ensure_ascii=False)
+        self._writer.writerow([error.line, error.error, record])
+
+    def close(self) -> Path | None:
+        if self._file is None:
+            return None
+        self._file.close()
+        return self.path
+
+
+def import_records(
+    kind: str,
+    records: Iterable[tuple[int, dict[str, Any] | str]],
+    error_path: Path | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> ImportReport:
+    """Перевіряє записи та вставляє коректні порціями ``executemany`` в одній транзакції.
+
+    Некоректні рядки пропускаються й потрапляють у звіт ``error_path``; помилка бази
+    відкочує весь імпорт.
+    """
+    model, to_row = IMPORTERS[kind]
+    report = ImportReport(kind)
+    errors = _ErrorReport(error_path)
+    chunk: list[dict[str, Any]] = []
+    try:
+        with unit_of_work():
+            for line, record in records:
+                try:
+                    if not isinstance(record, dict):
+                        raise ValueError("invalid JSON object")
+                    chunk.append(to_row(record))
+                except ValueError as exc:
+                    error = RowError(line, str(exc), record)
+                    report.failed += 1
+                    errors.write(error)
+                    if len(report.errors) < MAX_REPORTED_ERRORS:
+                        report.errors.append(error)
+                    continue
+                if len(chunk) >= chunk_size:
+                    db.session.execute(insert(model), chunk)
+                    report.imported += len(chunk)
+                    chunk.clear()
+            if chunk:
+                db.session.execute(insert(model), chunk)
+                report.imported += len(chunk)
+    finally:
+        report.error_report = errors.close()
+    return report
+
+
+__all__ = [
+    "DEFAULT_CHUNK_SIZE",
+    "FORMATS",
+    "IMPORTERS",
+    "ImportReport",
+    "RowError",
+    "UNREADABLE_FILE_ERRORS",
+    "book_row",
+    "detect_format",
+    "import_records",
+    "read_records",
+    "reader_row",
+]
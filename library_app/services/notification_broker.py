@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections import defaultdict
+from queue import Empty, Full, Queue
+from typing import Any, Iterator
+
+from flask import Flask, current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from library_app.models import db
+from library_app.repositories.notification_repository import EVENTS_KEY
+from library_app.services import notification_repository
+
+BrokerEvent = tuple[str, dict[str, Any]]
+
+
+class NotificationBroker:
+    """Розсилає події сповіщень SSE-підписникам у межах процесу.
+
+    Кожен підписник має власну обмежену чергу; повільний клієнт втрачає події, а не блокує
+    видавця — актуальний лічильник він однаково отримає з БД на наступному heartbeat.
+    """
+
+    def __init__(self, queue_size: int = 100, max_subscribers: int | None = None) -> None:
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._subscribers: dict[int, set[Queue[BrokerEvent]]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, reader_id: int) -> Queue[BrokerEvent] | None:
+        """Черга подій читача; None — досягнуто ``max_subscribers`` (клієнт має опитувати лічильник)."""
+        queue: Queue[BrokerEvent] = Queue(self.queue_size)
+        with self._lock:
+            if self.max_subscribers is not None and self._count() >= self.max_subscribers:
+                return None
+            self._subscribers[reader_id].add(queue)
+        return queue
+
+    def unsubscribe(self, reader_id: int, queue: Queue[BrokerEvent]) -> None:
+        with self._lock:
+            queues = self._subscribers.get(reader_id)
+            if queues is None:
+                return
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[reader_id]
+
+    def publish(self, reader_id: int | None, name: str, data: dict[str, Any]) -> None:
+        """Подія для підписників читача; ``reader_id=None`` — для всіх (масова розсилка)."""
+        with self._lock:
+            if reader_id is None:
+                queues = [queue for queues in self._subscribers.values() for queue in queues]
+            else:
+                queues = list(self._subscribers.get(reader_id, ()))
+        for queue in queues:
+            try:
+                queue.put_nowait((name, data))
+            except Full:
+                pass
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def _count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+
+def broker() -> NotificationBroker:
+    return current_app.extensions["notification_broker"]
+
+
+def _sse(name: str, data: dict[str, Any]) -> str:
+    return f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def event_stream(reader_id: int, queue: Queue[BrokerEvent], heartbeat: float) -> Iterator[str]:
+    """Потік SSE: ``unread`` з лічильником при кожній зміні та ``notification`` для нових сповіщень.
+
+    Масові розсилки лише будять потік: чи входить читач у сегмент, видно зі зміни лічильника.
+
+    Лічильник перечитується після кожної події та на heartbeat, тож сповіщення, створені
+    іншим процесом (наприклад, ``flask scheduler run``), з'являються не пізніше ніж за heartbeat.
+    ``queue`` — результат ``broker().subscribe(reader_id)``; потік відписується при завершенні.
+    """
+    subscribers = broker()
+    try:
+        last_count = None
+        while True:
+            count = notification_repository.unread_count(reader_id)
+            db.session.close()  # не тримати з'єднання пулу, поки потік чекає на події
+            if count != last_count:
+                last_count = count
+                yield _sse("unread", {"unread": count})
+            try:
+                name, data = queue.get(timeout=heartbeat)
+            except Empty:
+                yield ": keepalive\n\n"
+                continue
+            if name == "notification":
+                yield _sse(name, data)
+    finally:
+        subscribers.unsubscribe(reader_id, queue)
+
+
+def _after_commit(session: Session) -> None:
+    events = session.info.pop(EVENTS_KEY, None)
+    if not events or not has_app_context() or "notification_broker" not in current_app.extensions:
+        return
+    subscribers = broker()
+    for reader_id, name, data in events:
+        subscribers.publish(reader_id, name, data)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(EVENTS_KEY, None)
+
+
+def init_notification_broker(app: Flask) -> NotificationBroker:
+    subscribers = NotificationBroker(
+        app.config["NOTIFICATIONS_STREAM_QUEUE_SIZE"], app.config["NOTIFICATIONS_STREAM_MAX_CLIENTS"]
+    )
+    app.extensions["notification_broker"] = subscribers
+    if not event.contains(db.session, "after_commit", _after_commit):
+        event.listen(db.session, "after_commit", _after_commit)
+        event.listen(db.session, "after_rollback", _after_rollback)
+    return subscribers
+
+
+__all__ = ["NotificationBroker", "broker", "event_stream", "init_notification_broker"]
@@ -4,10 +4,12 @@ from abc import ABC, abstractmethod
 from datetime import date
 from typing import Any, ClassVar
 
-from library_app.models.notification import Notification
+from library_app.models.notification import Notification, NotificationKind
+from library_app.models.reader import ReaderCategory
 from library_app.models.rental import Rental
 from library_app.repositories.notification_repository import NotificationRepository
-from library_app.services import notification_repository
+from library_app.repositories.reader_repository import ReaderSegment
+from library_app.services import notification_repository, reader_repository
 
 
 class NotificationObserver(ABC):
@@ -16,6 +18,15 @@ class NotificationObserver(ABC):
         """React on notification events."""
 
 
+def _save(repo: NotificationRepository, notification: Notification, payload: dict[str, Any]) -> None:
+    # Пакетна перевірка передає "batch" і зберігає все одним комітом.
+    batch: list[Notification] | None = payload.get("batch")
+    if batch is not None:
+        batch.append(notification)
+    else:
+        repo.add(notification)
+
+
 class OverdueRentalObserver(NotificationObserver):
     def __init__(self, repo: NotificationRepository) -> None:
         self.repo = repo
@@ -33,8 +44,13 @@ class OverdueRentalObserver(NotificationObserver):
                 f"Книга {rental.book.title} прострочена на {days_overdue} дн{'ів' if days_overdue > 1 else 'я'}⚠️ "
                 f"Дата повернення: {rental.due_date:%d.%m.%Y}."
             )
-            notification = Notification(reader_id=rental.reader_id, message=message)
-            self.repo.add(notification)
+            notification = Notification(
+                reader_id=rental.reader_id,
+                rental_id=rental.id,
+                kind=NotificationKind.OVERDUE,
+                message=message,
+            )
+            _save(self.repo, notification, payload)
 
 
 class DueDateRentalObserver(NotificationObserver):
@@ -46,8 +62,13 @@ class DueDateRentalObserver(NotificationObserver):
             return
         rental: Rental = payload["rental"]
         message = f"Сьогодні останній день оренди⚠️ Книга {rental.book.title} має бути повернена сьогодні ({rental.due_date:%d.%m.%Y})"
-        notification = Notification(reader_id=rental.reader_id, message=message)
-        self.repo.add(notification)
+        notification = Notification(
+            reader_id=rental.reader_id,
+            rental_id=rental.id,
+            kind=NotificationKind.DUE_TODAY,
+            message=message,
+        )
+        _save(self.repo, notification, payload)
 
 
 class NotificationService:
@@ -75,34 +96,31 @@ class NotificationService:
         cls._dispatch("rental_due_today", payload)
 
     @classmethod
-    def check_all_rentals(cls) -> None:
+    def check_all_rentals(cls, today: date | None = None) -> int:
         """Перевіряє всі активні оренди та генерує сповіщення для прострочених та тих, що мають бути повернені сьогодні.
-        Генерує сповіщення щодня для прострочених оренд."""
+        Генерує сповіщення щодня для прострочених оренд; за одну оренду — не більше одного на день.
+        Повертає кількість створених сповіщень."""
         from library_app.services import rental_repository
-        
-        today = date.today()
-        active_rentals = rental_repository.active_rentals()
-        
-        for rental in active_rentals:
-            if rental.return_date is not None:
-                continue  # Пропускаємо вже повернуті
-            
-            days_diff = (today - rental.due_date).days
-            
-            # Якщо сьогодні день повернення або прострочка
-            if days_diff >= 0:
-                # Перевіряємо, чи вже є сповіщення за сьогодні для цієї оренди
-                existing_notifications = cls._repo.get_by_reader_and_date(rental.reader_id, today)
-                rental_notified_today = any(
-                    f"'{rental.book.title}'" in notif.message for notif in existing_notifications
-                )
-                
-                if not rental_notified_today:
-                    if days_diff == 0:
-                        cls.notify_due_today(rental)
-                    else:
-                        # Для прострочених - генеруємо сповіщення з кількістю днів прострочки
-                        cls.notify_overdue(rental)
+
+        today = today or date.today()
+        already_notified = cls._repo.rental_ids_notified_on(today)
+        batch: list[Notification] = []
+
+        for rental in rental_repository.due_or_overdue(today):
+            if rental.id in already_notified:
+                continue
+            event = "rental_due_today" if rental.due_date == today else "rental_overdue"
+            cls._dispatch(event, {"rental": rental, "today": today, "batch": batch})
+
+        return cls._repo.add_many(batch)
+
+    @classmethod
+    def broadcast(
+        cls, message: str, segment: ReaderSegment, category: ReaderCategory | None = None
+    ) -> int:
+        """Оголошення для сегмента читачів одним ``INSERT ... SELECT``; повертає кількість сповіщень."""
+        readers = reader_repository.segment_query(segment, category)
+        return cls._repo.broadcast(readers, message)
 
     @classmethod
     def _dispatch(cls, event: str, payload: dict[str, Any]) -> None:
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-from collections import Counter
 from dataclasses import dataclass
 
+from flask import Flask
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from library_app.models import db
+from library_app.models.book import Book
 from library_app.models.reader import Reader
-from library_app.services import rental_repository
+from library_app.models.rental import Rental
+from library_app.services import reader_stats_repository
 
 
 @dataclass
@@ -17,33 +23,37 @@ class ProfileStats:
 
 class ProfileService:
     def get_profile_stats(self, reader: Reader) -> ProfileStats:
-        """Отримує статистику профілю читача."""
-        # Отримуємо всі оренди читача
-        rentals = rental_repository.for_reader(reader.id, active_only=False)
-        
-        # Підраховуємо кількість прочитаних книг (повернених)
-        books_read = sum(1 for rental in rentals if rental.is_returned)
-        
-        # Знаходимо улюблений жанр
-        favorite_genre = None
-        if rentals:
-            genre_counter = Counter()
-            for rental in rentals:
-                if rental.is_returned:  # Тільки прочитані книги
-                    genre_counter[rental.book.genre] += 1
-            
-            if genre_counter:
-                favorite_genre = genre_counter.most_common(1)[0][0]
-        
+        """Отримує статистику профілю читача з таблиці ``reader_genre_stats``."""
+        # Улюблений жанр — найчастіший серед повернених книг; за нічиєї — той, що прочитано раніше.
+        stats = reader_stats_repository.profile(reader.id)
         return ProfileStats(
             full_name=reader.full_name,
             category=reader.category.value,
-            books_read=books_read,
-            favorite_genre=favorite_genre or "Ще не визначено",
+            books_read=stats.books_read if stats else 0,
+            favorite_genre=stats.favorite_genre if stats else "Ще не визначено",
         )
 
 
-profile_service = ProfileService()
+def _after_flush(session: Session, flush_context) -> None:
+    """Зміна жанру книги переносить її прочитання в інший рядок ``reader_genre_stats``.
+
+    Після flush у базі вже новий жанр, тож статистика читачів, які повертали ці книги,
+    перераховується з ``rentals`` — так само, як це зробив би повний ``rebuild``.
+    """
+    books = [
+        obj.id for obj in session.dirty if isinstance(obj, Book) and inspect(obj).attrs.genre.history.has_changes()
+    ]
+    if not books:
+        return
+    readers = select(Rental.reader_id).where(Rental.book_id.in_(books), Rental.return_date.is_not(None)).distinct()
+    reader_stats_repository.rebuild_readers(readers)
+
 
-__all__ = ["ProfileService", "ProfileStats", "profile_service"]
+def init_reader_stats_tracking(app: Flask) -> None:
+    if not event.contains(db.session, "after_flush", _after_flush):
+        event.listen(db.session, "after_flush", _after_flush)
+
+
+profile_service = ProfileService()
 
+__all__ = ["ProfileService", "ProfileStats", "init_reader_stats_tracking", "profile_service"]
@@ -1,15 +1,21 @@
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass
 from datetime import date, timedelta
 
 from library_app.models.payment import Payment
 from library_app.models.rental import Rental
+from library_app.repositories import unit_of_work
+from library_app.repositories.reader_stats_repository import ReaderGenreKey
+from library_app.repositories.revenue_repository import RevenueKey
 from library_app.services import (
     book_repository,
     payment_repository,
     reader_repository,
+    reader_stats_repository,
     rental_repository,
+    revenue_repository,
 )
 from library_app.services.discount_strategy import DiscountContext, strategy_for_category
 from library_app.services.notification_service import NotificationService
@@ -27,26 +33,68 @@ class RentalSummary:
     fine_amount: float
     damage_amount: float
     days_rented: int
+    payment: Payment | None = None
+
+
+@dataclass
+class RentalRequest:
+    book_id: int
+    reader_id: int
+    days: int = 14
+
+
+@dataclass
+class ReturnRequest:
+    rental_id: int
+    return_date: date | None = None
+    damage_amount: float = 0.0
+    damage_comment: str | None = None
+
+
+@dataclass
+class BatchItemResult:
+    index: int
+    rental: Rental | None = None
+    summary: RentalSummary | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _revenue_entry(rental: Rental, payment: Payment) -> tuple[RevenueKey, float]:
+    """Ключ денного підсумку для платежу; ``paid_date`` заповнюється під час flush."""
+    key = (payment.paid_date.date(), rental.reader.category, rental.book.genre)
+    return key, payment.total_amount
+
+
+def _reader_stats_entry(rental: Rental) -> tuple[ReaderGenreKey, int]:
+    return (rental.reader_id, rental.book.genre), rental.id
 
 
 class RentalService:
     def rent_book(self, book_id: int, reader_id: int, days: int) -> Rental:
+        with unit_of_work():
+            return self._rent_book(book_id, reader_id, days)
+
+    def _rent_book(self, book_id: int, reader_id: int, days: int) -> Rental:
         book = book_repository.get(book_id)
         reader = reader_repository.get(reader_id)
 
         if book is None or reader is None:
             raise RentalError("Book or reader not found")
 
-        if book.available_copies <= 0:
+        # Умовний UPDATE замість перевірки в Python: паралельні запити не продадуть
+        # останній примірник двічі.
+        if not book_repository.reserve_copy(book.id):
             raise RentalError("No available copies")
 
         rent_date = date.today()
         due_date = rent_date + timedelta(days=days)
 
-        book.decrease_stock()
         rental = Rental(book_id=book.id, reader_id=reader.id, rent_date=rent_date, due_date=due_date)
         rental_repository.add(rental)
-        book_repository.update()
         return rental
 
     def return_book(
@@ -55,10 +103,35 @@ class RentalService:
         return_date: date | None = None,
         damage_amount: float = 0.0,
         damage_comment: str | None = None,
+    ) -> RentalSummary:
+        with unit_of_work():
+            return self._return_book(rental_id, return_date, damage_amount, damage_comment)
+
+    def _return_book(
+        self,
+        rental_id: int,
+        return_date: date | None,
+        damage_amount: float,
+        damage_comment: str | None,
     ) -> RentalSummary:
         rental = rental_repository.get(rental_id)
         if rental is None:
             raise RentalError("Rental not found")
+        summary = self._close_rental(rental, return_date, damage_amount, damage_comment)
+        book_repository.release_copy(rental.book_id)
+        payment_repository.add(summary.payment)
+        revenue_repository.record([_revenue_entry(rental, summary.payment)])
+        reader_stats_repository.record([_reader_stats_entry(rental)])
+        return summary
+
+    def _close_rental(
+        self,
+        rental: Rental,
+        return_date: date | None,
+        damage_amount: float,
+        damage_comment: str | None,
+    ) -> RentalSummary:
+        """Закриває оренду та розраховує платіж; залишок книги оновлює викликач."""
         if rental.is_returned:
             raise RentalError("Rental already closed")
 
@@ -66,8 +139,6 @@ class RentalService:
         rental.return_date = return_dt
 
         book = rental.book
-        book.increase_stock()
-
         days_rented = max((return_dt - rental.rent_date).days, 1)
         base_amount = book.daily_rent_price * days_rented
 
@@ -89,11 +160,6 @@ class RentalService:
 
         total = discounted_amount + fine + damage_amount
 
-        payment = Payment(rental_id=rental.id, total_amount=total)
-        payment_repository.add(payment)
-        rental_repository.update()
-        book_repository.update()
-
         summary = RentalSummary(
             rental=rental,
             amount_due=total,
@@ -101,15 +167,78 @@ class RentalService:
             fine_amount=fine,
             damage_amount=damage_amount,
             days_rented=days_rented,
+            payment=Payment(rental_id=rental.id, total_amount=total),
         )
         return summary
 
+    def rent_books(self, requests: list[RentalRequest]) -> list[BatchItemResult]:
+        """Видає пакет книг однією транзакцією; невдалі позиції не зупиняють решту."""
+        with unit_of_work():
+            books = book_repository.get_many({item.book_id for item in requests})
+            readers = reader_repository.get_many({item.reader_id for item in requests})
+            rent_date = date.today()
+            results: list[BatchItemResult] = []
+            for index, item in enumerate(requests):
+                if item.book_id not in books or item.reader_id not in readers:
+                    results.append(BatchItemResult(index, error="Book or reader not found"))
+                    continue
+                if not book_repository.reserve_copy(item.book_id):
+                    results.append(BatchItemResult(index, error="No available copies"))
+                    continue
+                rental = Rental(
+                    book_id=item.book_id,
+                    reader_id=item.reader_id,
+                    rent_date=rent_date,
+                    due_date=rent_date + timedelta(days=item.days),
+                )
+                rental_repository.stage(rental)
+                results.append(BatchItemResult(index, rental=rental))
+            rental_repository.update()
+        return results
+
+    def return_books(self, requests: list[ReturnRequest]) -> list[BatchItemResult]:
+        """Приймає пакет повернень однією транзакцією з розрахунком знижок і штрафів."""
+        with unit_of_work():
+            rentals = rental_repository.with_details({item.rental_id for item in requests})
+            released: Counter[int] = Counter()
+            results: list[BatchItemResult] = []
+            for index, item in enumerate(requests):
+                rental = rentals.get(item.rental_id)
+                if rental is None:
+                    results.append(BatchItemResult(index, error="Rental not found"))
+                    continue
+                try:
+                    summary = self._close_rental(
+                        rental, item.return_date, item.damage_amount, item.damage_comment
+                    )
+                except RentalError as exc:
+                    results.append(BatchItemResult(index, error=str(exc)))
+                    continue
+                payment_repository.stage(summary.payment)
+                released[rental.book_id] += 1
+                results.append(BatchItemResult(index, rental=rental, summary=summary))
+            for book_id, copies in released.items():
+                book_repository.release_copy(book_id, copies)
+            payment_repository.update()
+            revenue_repository.record(
+                _revenue_entry(result.rental, result.summary.payment) for result in results if result.ok
+            )
+            reader_stats_repository.record(_reader_stats_entry(result.rental) for result in results if result.ok)
+        return results
+
     def check_overdue_rentals(self) -> None:
-        for rental in rental_repository.overdue_rentals():
-            NotificationService.notify_overdue(rental)
+        NotificationService.check_all_rentals()
 
 
 rental_service = RentalService()
 
-__all__ = ["RentalService", "RentalSummary", "RentalError", "rental_service"]
+__all__ = [
+    "RentalService",
+    "RentalSummary",
+    "RentalRequest",
+    "ReturnRequest",
+    "BatchItemResult",
+    "RentalError",
+    "rental_service",
+]
 
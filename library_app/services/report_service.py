@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import date
-from typing import Any
+from typing import Any, Iterator
 
-from library_app.services import book_repository, payment_repository, rental_repository
+from library_app.repositories.payment_repository import PaymentGrouping
+from library_app.services import (
+    book_repository,
+    reader_repository,
+    rental_repository,
+    revenue_repository,
+)
 
 
 @dataclass
@@ -13,6 +20,7 @@ class BookInventoryItem:
     author: str
     available_copies: int
     lent_out: int
+    book_id: int | None = None
 
 
 @dataclass
@@ -29,6 +37,13 @@ class FinancialSummary:
     payments_count: int
 
 
+@dataclass
+class FinancialBucket:
+    key: str  # дата дня/понеділка тижня, YYYY-MM, категорія читача або жанр
+    total_income: float
+    payments_count: int
+
+
 @dataclass
 class ReaderRentalInfo:
     reader_id: int
@@ -40,72 +55,76 @@ class ReaderRentalInfo:
 
 
 class ReportService:
-    def book_inventory_report(self) -> list[BookInventoryItem]:
-        items: list[BookInventoryItem] = []
-        for book in book_repository.all():
-            lent_out = sum(1 for rent in book.rentals if not rent.is_returned)
-            items.append(
-                BookInventoryItem(
-                    title=book.title,
-                    author=book.author,
-                    available_copies=book.available_copies,
-                    lent_out=lent_out,
-                )
+    def book_inventory_report(
+        self, limit: int | None = None, after_id: int | None = None
+    ) -> list[BookInventoryItem]:
+        """Сторінка звіту за фондом (keyset за id книги); без limit — увесь фонд."""
+        return [
+            BookInventoryItem(
+                title=row.title,
+                author=row.author,
+                available_copies=row.available_copies,
+                lent_out=row.lent_out,
+                book_id=row.id,
             )
-        return items
+            for row in book_repository.inventory_rows(after_id=after_id, limit=limit)
+        ]
+
+    def iter_book_inventory(self, chunk_size: int = 500) -> Iterator[BookInventoryItem]:
+        """Потоково віддає звіт за фондом порціями, не тримаючи весь каталог у пам'яті."""
+        after_id: int | None = None
+        while True:
+            chunk = self.book_inventory_report(limit=chunk_size, after_id=after_id)
+            yield from chunk
+            if len(chunk) < chunk_size:
+                return
+            after_id = chunk[-1].book_id
 
     def overdue_report(self) -> list[OverdueRentalItem]:
         items: list[OverdueRentalItem] = []
         today = date.today()
-        for rental in rental_repository.overdue_rentals(today):
-            days_overdue = (today - rental.due_date).days
+        for row in rental_repository.overdue_rows(today):
             items.append(
                 OverdueRentalItem(
-                    reader=rental.reader.full_name,
-                    book=rental.book.title,
-                    due_date=rental.due_date,
-                    days_overdue=days_overdue,
+                    reader=row.reader_name,
+                    book=row.book_title,
+                    due_date=row.due_date,
+                    days_overdue=(today - row.due_date).days,
                 )
             )
         return items
 
     def financial_report(self, start: date, end: date) -> FinancialSummary:
-        payments = payment_repository.between_dates(start, end)
-        total = sum(payment.total_amount for payment in payments)
-        return FinancialSummary(total_income=total, payments_count=len(payments))
+        """Підсумок за цілі дні [start, end] з таблиці ``daily_revenue``."""
+        totals = revenue_repository.totals_between(start, end)
+        return FinancialSummary(total_income=float(totals.total), payments_count=totals.count)
+
+    def financial_breakdown(
+        self, start: date, end: date, group_by: PaymentGrouping
+    ) -> list[FinancialBucket]:
+        return [
+            FinancialBucket(key=str(row.bucket), total_income=float(row.total), payments_count=row.count)
+            for row in revenue_repository.grouped_totals(start, end, group_by)
+        ]
 
     def readers_rental_report(self) -> list[ReaderRentalInfo]:
-        from library_app.services import reader_repository
-        from collections import Counter
-        
-        readers_info: list[ReaderRentalInfo] = []
-        
-        for reader in reader_repository.all():
-            rentals = rental_repository.for_reader(reader.id, active_only=False)
-            active_rentals = rental_repository.for_reader(reader.id, active_only=True)
-            
-            # Підрахунок кількості оренд по кожній книзі
-            book_counter = Counter()
-            for rental in rentals:
-                book_counter[rental.book.title] += 1
-            
-            book_rentals = [
-                {"book_title": title, "rental_count": count}
-                for title, count in book_counter.items()
-            ]
-            
-            readers_info.append(
-                ReaderRentalInfo(
-                    reader_id=reader.id,
-                    reader_name=reader.full_name,
-                    reader_category=reader.category.value,
-                    total_rentals=len(rentals),
-                    active_rentals=len(active_rentals),
-                    book_rentals=book_rentals,
-                )
+        book_rentals: dict[int, list[dict[str, Any]]] = defaultdict(list)
+        for row in rental_repository.book_counts_by_reader():
+            book_rentals[row.reader_id].append(
+                {"book_title": row.book_title, "rental_count": row.rental_count}
+            )
+
+        return [
+            ReaderRentalInfo(
+                reader_id=row.id,
+                reader_name=row.full_name,
+                reader_category=row.category.value,
+                total_rentals=row.total_rentals,
+                active_rentals=row.active_rentals,
+                book_rentals=book_rentals.get(row.id, []),
             )
-        
-        return readers_info
+            for row in reader_repository.rental_summaries()
+        ]
 
 
 report_service = ReportService()
@@ -115,6 +134,8 @@ __all__ = [
     "BookInventoryItem",
     "OverdueRentalItem",
     "FinancialSummary",
+    "FinancialBucket",
+    "PaymentGrouping",
     "ReaderRentalInfo",
     "report_service",
 ]
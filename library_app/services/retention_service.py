@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Mapping
+
+from flask import current_app, has_app_context
+from sqlalchemy import Engine, create_engine
+
+from library_app.models import db
+from library_app.models.notification import NotificationArchive
+from library_app.services import notification_repository
+
+logger = logging.getLogger(__name__)
+
+_archive_engines: dict[str, Engine] = {}
+_archive_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Правила зберігання сповіщень.
+
+    ``keep_days`` — вік, після якого сповіщення переносяться в архів (0 — зберігати без обмежень);
+    ``archive_uri`` — окрема база архіву (None — таблиця ``notifications_archive`` у поточній).
+    """
+
+    keep_days: int
+    collapse_reminders: bool = True
+    archive: bool = True
+    archive_uri: str | None = None
+    chunk_size: int = 1_000
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> "RetentionPolicy":
+        return cls(
+            keep_days=config["NOTIFICATIONS_RETENTION_DAYS"],
+            collapse_reminders=config["NOTIFICATIONS_COLLAPSE_REMINDERS"],
+            archive=config["NOTIFICATIONS_ARCHIVE"],
+            archive_uri=config["NOTIFICATIONS_ARCHIVE_URI"],
+            chunk_size=config["NOTIFICATIONS_RETENTION_CHUNK"],
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.collapse_reminders or self.keep_days > 0
+
+
+@dataclass
+class RetentionReport:
+    collapsed: int = 0
+    archived: int = 0
+    purged: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+
+    @property
+    def reclaimed(self) -> int:
+        """Скільки рядків прибрано з ``notifications``."""
+        return self.collapsed + self.archived + self.purged
+
+    def summary(self) -> str:
+        return (
+            f"reclaimed {self.reclaimed} (collapsed {self.collapsed}, archived {self.archived}, "
+            f"purged {self.purged}) in {self.chunks} chunks, {self.seconds:.1f}s"
+        )
+
+
+def _archive_engine(uri: str) -> Engine:
+    with _archive_lock:
+        engine = _archive_engines.get(uri)
+        if engine is None:
+            engine = create_engine(uri)
+            NotificationArchive.__table__.create(engine, checkfirst=True)
+            _archive_engines[uri] = engine
+        return engine
+
+
+class RetentionService:
+    """Згортає повторні нагадування та переносить старі сповіщення в архів короткими транзакціями.
+
+    Кожна порція (``chunk_size`` оренд або сповіщень) комітиться окремо, тож блокування запису
+    тримається мілісекунди, а перерваний запуск просто продовжиться наступного разу.
+    """
+
+    def run(self, policy: RetentionPolicy, now: datetime | None = None) -> RetentionReport:
+        report = RetentionReport()
+        started = time.perf_counter()
+        if policy.collapse_reminders:
+            self._collapse(policy, report)
+        if policy.keep_days > 0:
+            cutoff = (now or datetime.utcnow()) - timedelta(days=policy.keep_days)
+            self._expire(policy, cutoff, report)
+        report.seconds = time.perf_counter() - started
+        logger.info("Notification retention: %s", report.summary())
+        _record_metrics(report)
+        return report
+
+    def _collapse(self, policy: RetentionPolicy, report: RetentionReport) -> None:
+        after_rental_id = 0
+        while groups := notification_repository.reminder_groups(after_rental_id, policy.chunk_size):
+            report.collapsed += notification_repository.collapse_reminders(groups)
+            db.session.commit()
+            report.chunks += 1
+            after_rental_id = groups[-1].rental_id
+
+    def _expire(self, policy: RetentionPolicy, cutoff: datetime, report: RetentionReport) -> None:
+        while criteria := notification_repository.expired_window(cutoff, policy.chunk_size):
+            archived_at = datetime.utcnow()
+            if policy.archive and policy.archive_uri:
+                # Спершу коміт в архівну базу, потім видалення: повтор після збою лише перезапише ті самі id.
+                rows = notification_repository.archive_rows(criteria)
+                with _archive_engine(policy.archive_uri).begin() as connection:
+                    if rows:
+                        connection.execute(
+                            NotificationArchive.__table__.insert().prefix_with("OR REPLACE"),
+                            [{**row, "archived_at": archived_at} for row in rows],
+                        )
+            elif policy.archive:
+                db.session.execute(notification_repository.archive_statement(criteria, archived_at))
+            removed = notification_repository.delete_where(*criteria)
+            db.session.commit()
+            if policy.archive:
+                report.archived += removed
+            else:
+                report.purged += removed
+            report.chunks += 1
+
+
+def _record_metrics(report: RetentionReport) -> None:
+    registry = current_app.extensions.get("metrics") if has_app_context() else None
+    if registry is None:
+        return
+    for reason in ("collapsed", "archived", "purged"):
+        registry.increment(
+            "library_notifications_reclaimed_total",
+            "Notification rows removed by the retention job.",
+            getattr(report, reason),
+            reason=reason,
+        )
+
+
+retention_service = RetentionService()
+
+
+def run_retention() -> str:
+    """Задача планувальника: застосовує політику з конфігурації застосунку."""
+    return retention_service.run(RetentionPolicy.from_config(current_app.config)).summary()
+
+
+__all__ = [
+    "RetentionPolicy",
+    "RetentionReport",
+    "RetentionService",
+    "retention_service",
+    "run_retention",
+]
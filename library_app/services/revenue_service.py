@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from flask import Flask
+from sqlalchemy import event, func, inspect, or_, select
+from sqlalchemy.orm import Session
+
+from library_app.models import db
+from library_app.models.book import Book
+from library_app.models.payment import Payment
+from library_app.models.reader import Reader
+from library_app.models.rental import Rental
+from library_app.repositories.revenue_repository import RevenueKey
+from library_app.services import revenue_repository
+
+# Поля, зміна яких переносить платіж в інший денний підсумок.
+_PAYMENT_FIELDS = ("rental_id", "total_amount", "paid_date")
+_RENTAL_FIELDS = ("reader_id", "book_id")
+
+
+def _committed(instance: object, field: str) -> object:
+    """Значення поля на момент завантаження (до змін у поточному flush)."""
+    history = inspect(instance).attrs[field].history
+    return history.deleted[0] if history.deleted else getattr(instance, field)
+
+
+def _changed(instance: object, fields: tuple[str, ...]) -> bool:
+    state = inspect(instance)
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+
+def _payment_entry(
+    session: Session, payment: Payment, value: Callable[[object, str], object]
+) -> tuple[RevenueKey, float]:
+    rental = session.get(Rental, value(payment, "rental_id"))
+    reader = session.get(Reader, value(rental, "reader_id"))
+    book = session.get(Book, value(rental, "book_id"))
+    return (value(payment, "paid_date").date(), reader.category, book.genre), value(payment, "total_amount")
+
+
+def _before_flush(session: Session, flush_context, instances) -> None:
+    """Переносить видалені та виправлені платежі й оренди в ``daily_revenue`` у тому ж flush.
+
+    Нові платежі записує ``RentalService``; тут — лише зміни вже збережених. Зміни категорії
+    читача та жанру книги обробляє ``_after_flush``.
+    """
+    deleted = [obj for obj in session.deleted if isinstance(obj, Payment)]
+    corrected = [obj for obj in session.dirty if isinstance(obj, Payment) and _changed(obj, _PAYMENT_FIELDS)]
+    handled = {id(payment) for payment in (*deleted, *corrected)}
+    for rental in session.dirty:
+        if isinstance(rental, Rental) and _changed(rental, _RENTAL_FIELDS):
+            corrected.extend(
+                payment
+                for payment in rental.payments
+                if id(payment) not in handled and inspect(payment).persistent
+            )
+    if not deleted and not corrected:
+        return
+    retracted = [_payment_entry(session, payment, _committed) for payment in (*deleted, *corrected)]
+    recorded = [_payment_entry(session, payment, getattr) for payment in corrected]
+    revenue_repository.record(retracted, sign=-1)
+    revenue_repository.record(recorded)
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    """Зміна категорії читача чи жанру книги переносить усі їхні платежі в інші ключі.
+
+    Після flush база вже містить нові значення, тож дні з такими платежами перераховуються
+    з ``payments`` — так само, як це зробив би повний ``rebuild``.
+    """
+    readers = [obj.id for obj in session.dirty if isinstance(obj, Reader) and _changed(obj, ("category",))]
+    books = [obj.id for obj in session.dirty if isinstance(obj, Book) and _changed(obj, ("genre",))]
+    if not readers and not books:
+        return
+    days = (
+        select(func.date(Payment.paid_date))
+        .join(Rental, Rental.id == Payment.rental_id)
+        .where(or_(Rental.reader_id.in_(readers), Rental.book_id.in_(books)))
+        .distinct()
+    )
+    revenue_repository.rebuild_days(days)
+
+
+def init_revenue_tracking(app: Flask) -> None:
+    if not event.contains(db.session, "before_flush", _before_flush):
+        event.listen(db.session, "before_flush", _before_flush)
+        event.listen(db.session, "after_flush", _after_flush)
+
+
+__all__ = ["init_revenue_tracking"]
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable
+
+from flask import Flask
+
+from library_app.models import db
+from library_app.services import job_lease_repository
+
+logger = logging.getLogger(__name__)
+
+OVERDUE_SWEEP_JOB = "overdue_sweep"
+NOTIFICATION_RETENTION_JOB = "notification_retention"
+
+
+@dataclass
+class ScheduledJob:
+    name: str
+    func: Callable[[], object]
+    interval: timedelta
+
+
+class JobScheduler:
+    """Періодичні задачі з lease у базі: кожну задачу одночасно виконує лише один воркер.
+
+    Задачі запускаються у фоновому потоці застосунку (``SCHEDULER_ENABLED``, увімкнено
+    за замовчуванням) та/або окремим процесом ``flask scheduler run``.
+    """
+
+    def __init__(self, lease_for: timedelta, tick: timedelta) -> None:
+        self.lease_for = lease_for
+        self.tick = tick
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._jobs: dict[str, ScheduledJob] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def register(self, name: str, func: Callable[[], object], interval: timedelta) -> None:
+        self._jobs[name] = ScheduledJob(name, func, interval)
+
+    def run_pending(self, now: datetime | None = None) -> list[str]:
+        """Виконує задачі, для яких настав час і вдалося захопити lease. Потребує app context."""
+        executed: list[str] = []
+        now = now or datetime.utcnow()
+        for job in self._jobs.values():
+            if not job_lease_repository.try_acquire(
+                job.name, self.owner, now, self.lease_for, due_before=now - job.interval
+            ):
+                continue
+            try:
+                result = job.func()
+            except Exception as exc:  # noqa: BLE001 — помилка задачі не зупиняє планувальник
+                db.session.rollback()
+                logger.exception("Scheduled job %s failed", job.name)
+                result = f"error: {exc}"
+            job_lease_repository.release(job.name, self.owner, datetime.utcnow(), str(result))
+            executed.append(job.name)
+        return executed
+
+    def run_forever(self, app: Flask) -> None:
+        while not self._stop.is_set():
+            with app.app_context():
+                try:
+                    self.run_pending()
+                except Exception:  # noqa: BLE001
+                    logger.exception("Scheduler tick failed")
+                finally:
+                    db.session.remove()
+            self._stop.wait(self.tick.total_seconds())
+
+    def start_background(self, app: Flask) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.run_forever, args=(app,), name="library-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def _overdue_sweep() -> str:
+    from library_app.services.notification_service import NotificationService
+
+    NotificationService.bootstrap()
+    created = NotificationService.check_all_rentals()
+    return f"created {created}"
+
+
+def _notification_retention() -> str:
+    from library_app.services.retention_service import run_retention
+
+    return run_retention()
+
+
+def init_scheduler(app: Flask) -> JobScheduler:
+    scheduler = JobScheduler(
+        lease_for=timedelta(seconds=app.config["SCHEDULER_LEASE_SECONDS"]),
+        tick=timedelta(seconds=app.config["SCHEDULER_TICK_SECONDS"]),
+    )
+    scheduler.register(
+        OVERDUE_SWEEP_JOB,
+        _overdue_sweep,
+        timedelta(seconds=app.config["OVERDUE_SWEEP_INTERVAL"]),
+    )
+    if app.config["NOTIFICATIONS_RETENTION_INTERVAL"]:
+        scheduler.register(
+            NOTIFICATION_RETENTION_JOB,
+            _notification_retention,
+            timedelta(seconds=app.config["NOTIFICATIONS_RETENTION_INTERVAL"]),
+        )
+    app.extensions["scheduler"] = scheduler
+    if app.config["SCHEDULER_ENABLED"] and not app.testing:
+        # Потік стартує з першим HTTP-запитом, тож CLI-команди (імпорт, ``flask scheduler run``)
+        # не запускають ще один.
+        @app.before_request
+        def start_scheduler() -> None:
+            scheduler.start_background(app)
+
+    return scheduler
+
+
+def last_sweep_at() -> datetime | None:
+    return job_lease_repository.last_run_at(OVERDUE_SWEEP_JOB)
+
+
+__all__ = [
+    "JobScheduler",
+    "ScheduledJob",
+    "NOTIFICATION_RETENTION_JOB",
+    "OVERDUE_SWEEP_JOB",
+    "init_scheduler",
+    "last_sweep_at",
+]
@@ -1,4 +1,5 @@
 import pytest
+from sqlalchemy import event
 
 from library_app import create_app
 from library_app.models import db
@@ -25,3 +26,15 @@ def app(tmp_path):
 def client(app):
     return app.test_client()
 
+
+@pytest.fixture
+def sql_statements(app):
+    """Збирає SQL-інструкції, виконані рушієм під час тесту."""
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", record)
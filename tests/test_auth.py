@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from library_app.models import db
 from library_app.models.user import UserRole
 from library_app.services import user_repository
 
@@ -52,3 +53,31 @@ def test_login_stores_session(app, client):
     with client.session_transaction() as sess:
         assert "user_id" in sess
 
+
+def _user_queries(statements: list[str]) -> list[str]:
+    return [sql for sql in statements if "FROM users" in sql]
+
+
+def test_logged_user_is_cached_between_requests(app, client, sql_statements):
+    client.post("/auth/signup", data=signup_payload("cache@example.com"), follow_redirects=True)
+    sql_statements.clear()
+
+    client.get("/static/css/style.css")
+    client.get("/store/")
+    client.get("/store/")
+    assert _user_queries(sql_statements) == []
+
+
+def test_user_cache_invalidated_on_update(app, client, sql_statements):
+    client.post("/auth/signup", data=signup_payload("first@example.com"), follow_redirects=True)
+    client.post("/auth/logout")
+    client.post("/auth/signup", data=signup_payload("second@example.com"), follow_redirects=True)
+    assert client.get("/reports/", headers={"Accept": "application/json"}).status_code == 403
+
+    user = user_repository.find_by_email("second@example.com")
+    user.role = UserRole.ADMIN
+    db.session.commit()
+    sql_statements.clear()
+
+    assert client.get("/reports/").status_code == 200
+    assert len(_user_queries(sql_statements)) == 1
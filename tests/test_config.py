@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import pytest
+
+from library_app import create_app
+from library_app.models import db
+
+
+def pragma(name: str) -> object:
+    return db.session.connection().exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_default_profile_enables_wal_and_busy_timeout(app):
+    assert app.config["DATABASE_PROFILE"] == "balanced"
+    assert pragma("journal_mode") == "wal"
+    assert pragma("synchronous") == 1  # NORMAL
+    assert pragma("busy_timeout") == 5000
+    assert db.engine.pool.size() == 10
+
+
+def test_profile_is_selectable_per_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("LIBRARY_DB_PROFILE", "legacy")
+    legacy_app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'l.db'}"})
+    with legacy_app.app_context():
+        assert pragma("journal_mode") == "delete"
+        assert pragma("cache_size") == -2000  # значення SQLite за замовчуванням
+        db.engine.dispose()
+
+    with pytest.raises(ValueError):
+        create_app({"DATABASE_PROFILE": "turbo", "SQLALCHEMY_DATABASE_URI": "sqlite://"})
+
+
+def test_metrics_are_off_by_default(client):
+    response = client.get("/store/")
+    assert "Server-Timing" not in response.headers
+    assert "metrics" not in client.application.extensions
+
+
+def test_metrics_record_statements_and_expose_prometheus_text(tmp_path):
+    from test_rentals import login_admin
+
+    metrics_app = create_app(
+        {
+            "TESTING": True,
+            "METRICS_ENABLED": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'm.db'}",
+        }
+    )
+    with metrics_app.app_context():
+        db.create_all()
+    client = metrics_app.test_client()
+    login_admin(client)
+
+    timing = client.get("/store/").headers["Server-Timing"]
+    assert timing.startswith("db;dur=") and "app;dur=" in timing
+
+    body = client.get("/metrics").get_data(as_text=True)
+    assert "# TYPE library_db_statements_total counter" in body
+    assert 'library_http_requests_total{endpoint="store.catalog",method="GET",status="200"} 1' in body
+    with metrics_app.app_context():
+        db.engine.dispose()
+
+
+def test_request_unit_of_work_rolls_back_client_errors(tmp_path):
+    from library_app.models.reader import ReaderCategory
+    from library_app.services import reader_repository
+    from library_app.services.reader_factory import get_reader_creator
+
+    uow_app = create_app(
+        {
+            "TESTING": True,
+            "UNIT_OF_WORK_PER_REQUEST": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'u.db'}",
+        }
+    )
+
+    @uow_app.post("/_probe/<int:status>")
+    def probe(status: int):
+        reader_repository.add(get_reader_creator(ReaderCategory.REGULAR).create_reader(f"#{status}", "вул. 1", "+380"))
+        return "", status
+
+    with uow_app.app_context():
+        db.create_all()
+    client = uow_app.test_client()
+    for status in (200, 400, 404, 500):
+        client.post(f"/_probe/{status}")
+    with uow_app.app_context():
+        assert [r.full_name for r in reader_repository.all()] == ["#200"]
+        db.engine.dispose()
+
+
+def test_failed_statement_leaves_no_timing_state_on_connection(tmp_path):
+    from flask import g
+    from sqlalchemy.exc import OperationalError
+
+    metrics_app = create_app(
+        {
+            "TESTING": True,
+            "METRICS_ENABLED": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'f.db'}",
+        }
+    )
+    with metrics_app.test_request_context("/"):
+        metrics_app.preprocess_request()
+        connection = db.session.connection()
+        info_before = dict(connection.info)
+        with pytest.raises(OperationalError):
+            connection.exec_driver_sql("SELECT * FROM missing_table")
+        connection.exec_driver_sql("SELECT 1")
+        assert dict(connection.info) == info_before
+        assert g.request_metrics.statements == 1
+        db.session.rollback()
+        db.engine.dispose()
+
+
+def test_scheduler_runs_in_background_by_default(tmp_path, monkeypatch):
+    monkeypatch.delenv("LIBRARY_SCHEDULER_ENABLED", raising=False)
+    served_app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 's.db'}"})
+    with served_app.app_context():
+        db.create_all()
+    scheduler = served_app.extensions["scheduler"]
+    assert served_app.config["SCHEDULER_ENABLED"]
+    assert scheduler._thread is None  # CLI-команди потік не запускають
+
+    served_app.test_client().get("/store/")
+    try:
+        assert scheduler._thread is not None and scheduler._thread.is_alive()
+    finally:
+        scheduler.stop()
+        with served_app.app_context():
+            db.engine.dispose()
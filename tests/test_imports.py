@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import io
+import json
+
+from library_app.models.reader import ReaderCategory
+from library_app.services import book_repository, reader_repository
+from library_app.services.catalog_service import catalog_service
+from test_rentals import login_admin
+
+BOOKS_CSV = """title,author,genre,collateral_value,daily_rent_price,available_copies
+Кобзар,Тарас Шевченко,Поезія,120,8,3
+Без назви,,Проза,100,5,1
+Лісова пісня,Леся Українка,Драма,90,-1,2
+Місто,Валер'ян Підмогильний,Проза,150,10,
+"""
+
+
+def test_book_upload_imports_valid_rows_and_reports_errors(app, client, tmp_path):
+    app.config["IMPORT_ERRORS_DIR"] = str(tmp_path)
+    login_admin(client)
+    assert catalog_service.available_books() == []
+
+    response = client.post(
+        "/books/import",
+        data={"file": (io.BytesIO(BOOKS_CSV.encode()), "books.csv")},
+        headers={"Accept": "application/json"},
+    )
+
+    body = response.get_json()
+    assert (body["imported"], body["failed"]) == (2, 2)
+    assert body["errors"] == [
+        {"line": 3, "error": "author is required"},
+        {"line": 4, "error": "daily_rent_price must not be negative"},
+    ]
+    assert body["error_report"].startswith("/books/import/errors/books-")
+    report = client.get(body["error_report"]).get_data(as_text=True)
+    assert report.splitlines()[0] == "line,error,record"
+    assert client.get("/books/import/errors/..%2Fsecret.csv").status_code == 404
+    assert {book.title: book.available_copies for book in book_repository.all()} == {"Кобзар": 3, "Місто": 1}
+    assert len(catalog_service.available_books()) == 2  # кеш каталогу скинуто після імпорту
+
+
+def test_book_upload_rejects_unreadable_files_and_non_finite_prices(app, client, tmp_path):
+    app.config["IMPORT_ERRORS_DIR"] = str(tmp_path)
+    login_admin(client)
+    headers = {"Accept": "application/json"}
+
+    def upload(content: bytes):
+        return client.post("/books/import", data={"file": (io.BytesIO(content), "books.csv")}, headers=headers)
+
+    assert upload("title,author\nКобзар,Шевченко\n".encode("cp1251")).status_code == 400
+    assert upload(b'title,author\n"' + b"x" * 200_000 + b'",y\n').status_code == 400  # csv.Error: field limit
+    header = "title,author,genre,collateral_value,daily_rent_price\n"
+    body = upload(f"{header}А,Б,В,nan,5\nГ,Д,Е,10,inf\n".encode()).get_json()
+    assert (body["imported"], body["failed"]) == (0, 2)
+    assert {error["error"].split()[0] for error in body["errors"]} == {"collateral_value", "daily_rent_price"}
+    assert book_repository.all() == []
+
+
+def test_cli_imports_readers_from_jsonl_in_chunks(app, tmp_path):
+    source = tmp_path / "readers.jsonl"
+    rows = [{"full_name": f"Читач {i}", "address": "вул. 1", "phone": "+380", "category": "vip"} for i in range(5)]
+    lines = [json.dumps(row, ensure_ascii=False) for row in rows]
+    lines.insert(2, "{not json")
+    lines.append(json.dumps({"full_name": "X", "address": "Y", "phone": "Z", "category": "gold"}))
+    source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    result = app.test_cli_runner().invoke(args=["import", "run", "readers", str(source), "--chunk-size", "2"])
+
+    assert "Імпортовано: 5, відхилено: 2" in result.output
+    assert {reader.category for reader in reader_repository.all()} == {ReaderCategory.VIP}
+    errors = (tmp_path / "readers.jsonl.errors.csv").read_text(encoding="utf-8").splitlines()
+    assert [line.split(",")[0] for line in errors[1:]] == ["3", "7"]
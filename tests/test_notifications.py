@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import json
+
+from library_app.models.notification import Notification, NotificationKind
+from library_app.services import notification_repository, user_repository
+from test_auth import signup_payload
+
+
+def signup_reader(client, email: str = "reader@example.com") -> int:
+    client.post("/auth/signup", data=signup_payload(email), follow_redirects=True)
+    return user_repository.find_by_email(email).reader_id
+
+
+def notify(reader_id: int, message: str = "Книга прострочена") -> Notification:
+    return notification_repository.add(
+        Notification(reader_id=reader_id, kind=NotificationKind.OVERDUE, message=message)
+    )
+
+
+def unread(client) -> int:
+    return client.get("/notifications/unread-count").get_json()["unread"]
+
+
+def test_unread_counter_follows_created_and_read_notifications(app, client):
+    reader_id = signup_reader(client)
+    first = notify(reader_id)
+    notification_repository.add_many(
+        [Notification(reader_id=reader_id, kind=NotificationKind.OVERDUE, message=f"#{i}") for i in range(3)]
+    )
+    user_cache = app.extensions["user_cache"]
+    invalidations = user_cache.stats.invalidations
+
+    assert unread(client) == 4
+    assert client.post(f"/notifications/{first.id}/mark-read").status_code == 200
+    assert client.post(f"/notifications/{first.id}/mark-read").status_code == 200
+    assert unread(client) == 3
+    # Оновлення лічильника в readers не скидає кеш користувачів.
+    assert user_cache.stats.invalidations == invalidations
+
+
+def test_stream_pushes_new_notifications_and_counter(app, client):
+    app.config["NOTIFICATIONS_STREAM_HEARTBEAT"] = 0.05
+    reader_id = signup_reader(client)
+    response = client.get("/notifications/stream")
+    assert response.mimetype == "text/event-stream"
+    events = iter(response.response)
+
+    def next_event() -> tuple[str, dict]:
+        chunk = next(events)
+        while chunk.startswith(b":"):  # keepalive
+            chunk = next(events)
+        name, data = chunk.decode().strip().split("\n")
+        return name.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+    assert next_event() == ("unread", {"unread": 0})
+    notify(reader_id, "Сьогодні останній день оренди")
+    assert next_event() == ("notification", {"kind": "overdue", "message": "Сьогодні останній день оренди"})
+    assert next_event() == ("unread", {"unread": 1})
+    response.close()
+    assert app.extensions["notification_broker"].subscriber_count() == 0
+
+
+def test_stream_capacity_falls_back_to_polling(app, client):
+    app.extensions["notification_broker"].max_subscribers = 1
+    signup_reader(client)
+    first = client.get("/notifications/stream")
+    assert first.status_code == 200
+
+    refused = client.get("/notifications/stream")
+    assert refused.status_code == 503
+    assert refused.headers["Retry-After"] == str(app.config["NOTIFICATIONS_POLL_INTERVAL"])
+    assert refused.get_json()["poll"] == "/notifications/unread-count"
+
+    first.close()  # слот звільняється, навіть якщо подій ще не було
+    assert app.extensions["notification_broker"].subscriber_count() == 0
+    again = client.get("/notifications/stream")
+    assert again.status_code == 200
+    again.close()
+
+
+def test_bulk_mark_read_is_one_update_scoped_to_the_reader(app, client, sql_statements):
+    from datetime import datetime, timedelta
+
+    from library_app.models import db
+
+    other_reader = signup_reader(client, "other@example.com")
+    client.post("/auth/logout")
+    reader_id = signup_reader(client)
+    old = [notify(reader_id, f"old {i}") for i in range(3)]
+    for notification in old:
+        notification.created_at = datetime(2024, 1, 1)
+    db.session.commit()
+    recent = [notify(reader_id, f"new {i}") for i in range(3)]
+    foreign = notify(other_reader)
+
+    sql_statements.clear()
+    response = client.post("/notifications/mark-read", json={"before": "2024-06-01"})
+    assert response.get_json() == {"updated": 3, "unread": 3}
+    assert len([sql for sql in sql_statements if sql.startswith("UPDATE notifications")]) == 1
+
+    # Чужі id ігноруються, а повторне позначення не зменшує лічильник удруге.
+    response = client.post("/notifications/mark-read", json={"ids": [recent[0].id, old[0].id, foreign.id]})
+    assert response.get_json() == {"updated": 1, "unread": 2}
+    assert notification_repository.unread_count(other_reader) == 1
+
+    assert client.post("/notifications/mark-read", json={"all": True}).get_json() == {"updated": 2, "unread": 0}
+    assert client.post("/notifications/mark-read", json={}).status_code == 400
+    assert client.post("/notifications/mark-read", json={"ids": ["x"]}).status_code == 400
+
+
+def _seed_retention_data(reader_id: int) -> dict[str, list[Notification]]:
+    from datetime import datetime, timedelta
+
+    from library_app.models import db
+    from library_app.models.book import Book
+    from library_app.services.rental_service import rental_service
+
+    book = Book(title="Книга", author="Автор", genre="Проза", collateral_value=1, daily_rent_price=1, available_copies=2)
+    db.session.add(book)
+    db.session.commit()
+    first, second = (rental_service.rent_book(book.id, reader_id, days=1) for _ in range(2))
+
+    def reminder(rental_id: int, kind: str = NotificationKind.OVERDUE) -> Notification:
+        return Notification(reader_id=reader_id, rental_id=rental_id, kind=kind, message=f"{rental_id} {kind}")
+
+    groups = {
+        "first": [reminder(first.id) for _ in range(3)],
+        "second": [reminder(second.id) for _ in range(2)],
+        "due": [reminder(first.id, NotificationKind.DUE_TODAY)],
+        "old": [Notification(reader_id=reader_id, message=f"old {i}") for i in range(3)],
+    }
+    for notification in [*groups["first"], *groups["second"], *groups["due"], *groups["old"]]:
+        notification_repository.add(notification)
+    notification_repository.mark_read(groups["first"][0])  # найстаріше нагадування вже прочитане
+    notification_repository.mark_read(groups["old"][0])
+    for notification in groups["old"]:
+        notification.created_at = datetime.utcnow() - timedelta(days=400)
+    db.session.commit()
+    return groups
+
+
+def test_retention_collapses_reminders_and_archives_old_rows(app, client):
+    from library_app.models import db
+    from library_app.models.notification import NotificationArchive
+    from library_app.services.retention_service import RetentionPolicy, retention_service
+
+    reader_id = signup_reader(client)
+    groups = _seed_retention_data(reader_id)
+    assert notification_repository.unread_count(reader_id) == 7
+
+    report = retention_service.run(RetentionPolicy(keep_days=180, chunk_size=1))
+    assert (report.collapsed, report.archived, report.purged, report.reclaimed) == (3, 3, 0, 6)
+    assert report.chunks == 2 + 3  # по одній оренді / одному сповіщенню на порцію
+
+    db.session.expire_all()
+    remaining = {n.id: n.repeat_count for n in notification_repository.all()}
+    assert remaining == {groups["first"][-1].id: 3, groups["second"][-1].id: 2, groups["due"][0].id: 1}
+    assert sorted(row.message for row in NotificationArchive.query) == ["old 0", "old 1", "old 2"]
+    # Мінус 2 згорнуті непрочитані та 2 архівовані непрочитані — як і за повного перерахунку.
+    assert notification_repository.unread_count(reader_id) == 3
+    notification_repository.recount_unread()
+    assert notification_repository.unread_count(reader_id) == 3
+
+    assert retention_service.run(RetentionPolicy(keep_days=180)).reclaimed == 0
+
+
+def test_retention_archives_into_separate_database(app, client, tmp_path):
+    from sqlalchemy import create_engine, text
+
+    from library_app.services.retention_service import RetentionPolicy, retention_service
+
+    reader_id = signup_reader(client)
+    _seed_retention_data(reader_id)
+    archive_uri = f"sqlite:///{tmp_path / 'archive.db'}"
+
+    policy = RetentionPolicy(keep_days=180, collapse_reminders=False, archive_uri=archive_uri)
+    assert retention_service.run(policy).archived == 3
+    with create_engine(archive_uri).connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM notifications_archive")).scalar_one() == 3
+
+    purge = RetentionPolicy(keep_days=1, collapse_reminders=False, archive=False)
+    assert retention_service.run(purge).purged == 0
+
+
+def test_broadcast_targets_segments_with_one_insert(app, client, sql_statements):
+    from datetime import date, timedelta
+
+    from library_app.models import db
+    from library_app.services.rental_service import rental_service
+    from test_rentals import create_books_and_readers, login_admin
+
+    login_admin(client)
+    (book, _), (admin_reader, vip_reader) = create_books_and_readers()
+    rental = rental_service.rent_book(book.id, vip_reader, days=1)
+
+    def broadcast(message: str, **segment) -> int:
+        return client.post("/notifications/broadcast", json={"message": message, **segment}).get_json()["created"]
+
+    sql_statements.clear()
+    assert broadcast("Бібліотека зачинена 1 травня") == 2
+    assert len([sql for sql in sql_statements if sql.startswith("INSERT INTO notifications")]) == 1
+
+    assert broadcast("Знижка", segment="category", category="vip") == 1
+    assert broadcast("Поверніть книги", segment="active_rentals") == 1
+    assert broadcast("Штраф", segment="overdue") == 0
+    rental.due_date = date.today() - timedelta(days=1)
+    db.session.commit()
+    assert broadcast("Штраф", segment="overdue") == 1
+
+    assert notification_repository.unread_count(admin_reader) == 1
+    assert notification_repository.unread_count(vip_reader) == 4
+    notification_repository.recount_unread()
+    assert notification_repository.unread_count(vip_reader) == 4
+
+    assert client.post("/notifications/broadcast", json={"message": ""}).status_code == 400
+    assert client.post("/notifications/broadcast", json={"message": "x", "segment": "nobody"}).status_code == 400
+    assert client.post("/notifications/broadcast", json={"message": "x", "segment": "category"}).status_code == 400
+    client.post("/auth/logout")
+    signup_reader(client)
+    assert client.post("/notifications/broadcast", json={"message": "x"}).status_code == 403
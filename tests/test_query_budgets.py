@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import pytest
+
+from library_app.models import db
+from library_app.models.book import Book
+from library_app.models.reader import ReaderCategory
+from library_app.models.rental import Rental
+from library_app.services import book_repository, reader_repository, rental_repository
+from library_app.services.reader_factory import get_reader_creator
+from test_rentals import login_admin
+
+# Максимальна кількість SQL-інструкцій на запит (включно з автентифікацією та вибірками для форм).
+# Бюджет не залежить від кількості оренд: перевищення означає ліниве завантаження у циклі (N+1).
+ENDPOINT_BUDGETS = {
+    ("GET", "/rentals/", "text/html"): 5,
+    ("GET", "/rentals/", "application/json"): 3,
+    ("POST", "/rentals/check-overdue", "text/html"): 10,
+    ("POST", "/rentals/check-overdue", "application/json"): 7,
+    ("GET", "/store/my-rentals", "text/html"): 3,
+    ("GET", "/store/my-rentals", "application/json"): 3,
+    ("GET", "/reports/", "text/html"): 6,
+    ("GET", "/auth/profile", "application/json"): 2,
+}
+
+
+def seed_rentals(count: int) -> None:
+    """Створює ``count`` книг і читачів та по дві оренди на книгу (одна — адміністратора); частина прострочена."""
+    today = date.today()
+    creator = get_reader_creator(ReaderCategory.REGULAR)
+    books = [
+        Book(
+            title=f"Книга {index}",
+            author=f"Автор {index}",
+            genre="Проза",
+            collateral_value=100.0,
+            daily_rent_price=10.0,
+            available_copies=1,
+        )
+        for index in range(count)
+    ]
+    readers = [creator.create_reader(f"Читач {index}", "вул. 1", "+380") for index in range(count)]
+    for instance in [*books, *readers]:
+        book_repository.stage(instance)
+    book_repository.update()
+    for index, (book, reader) in enumerate(zip(books, readers)):
+        for reader_id in (1, reader.id):
+            rental_repository.stage(
+                Rental(
+                    book_id=book.id,
+                    reader_id=reader_id,
+                    rent_date=today - timedelta(days=20),
+                    due_date=today + timedelta(days=5 if index % 2 else -5),
+                )
+            )
+    rental_repository.update()
+
+
+@pytest.mark.parametrize("method, path, accept", sorted(ENDPOINT_BUDGETS))
+def test_rental_views_stay_within_statement_budget(app, client, sql_statements, method, path, accept):
+    login_admin(client)
+    seed_rentals(12)
+    db.session.expunge_all()  # інакше ліниві звернення обслуговує identity map тестової сесії
+
+    sql_statements.clear()
+    response = client.open(path, method=method, headers={"Accept": accept})
+
+    assert response.status_code == 200
+    budget = ENDPOINT_BUDGETS[(method, path, accept)]
+    assert len(sql_statements) <= budget, f"{len(sql_statements)} statements:\n" + "\n".join(sql_statements)
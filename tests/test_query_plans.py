@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import re
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import event
+
+from library_app.models import db
+from library_app.repositories.pagination import encode_cursor
+from library_app.schema import upgrade_schema
+from library_app.services import (
+    book_repository,
+    notification_repository,
+    payment_repository,
+    rental_repository,
+)
+
+INDEXED_TABLES = ("books", "rentals", "notifications", "payments")
+FULL_SCAN = re.compile(rf"^SCAN ({'|'.join(INDEXED_TABLES)})$")
+
+HOT_QUERIES = {
+    "books.find_available": lambda: book_repository.find_available(),
+    "books.search_available": lambda: book_repository.search_available("кобзар"),
+    "books.inventory_rows": lambda: book_repository.inventory_rows(after_id=0, limit=50),
+    "books.page": lambda: book_repository.page(limit=20, cursor=encode_cursor([100])),
+    "rentals.active_rentals": lambda: rental_repository.active_rentals(),
+    "rentals.overdue_rentals": lambda: rental_repository.overdue_rentals(date(2024, 1, 1)),
+    "rentals.overdue_rows": lambda: rental_repository.overdue_rows(date(2024, 1, 1)),
+    "rentals.page_with_details": lambda: rental_repository.page_with_details(20, encode_cursor([100])),
+    "rentals.due_or_overdue": lambda: rental_repository.due_or_overdue(date(2024, 1, 1)),
+    "rentals.for_reader": lambda: rental_repository.for_reader(1),
+    "rentals.for_reader_active": lambda: rental_repository.for_reader(1, active_only=True),
+    "notifications.unread_for_reader": lambda: notification_repository.unread_for_reader(1),
+    "notifications.for_reader": lambda: notification_repository.for_reader(1),
+    "notifications.by_reader_and_date": lambda: notification_repository.get_by_reader_and_date(
+        1, date(2024, 1, 1)
+    ),
+    "notifications.page_recent": lambda: notification_repository.page_recent(
+        20, encode_cursor([datetime(2024, 1, 1), 100])
+    ),
+    "notifications.page_recent_reader": lambda: notification_repository.page_recent(
+        20, encode_cursor([datetime(2024, 1, 1), 100]), reader_id=1
+    ),
+    "notifications.rental_ids_notified_on": lambda: notification_repository.rental_ids_notified_on(
+        date(2024, 1, 1)
+    ),
+    "payments.between_dates": lambda: payment_repository.between_dates(
+        date(2024, 1, 1), date(2024, 12, 31)
+    ),
+}
+
+
+def captured_statements(call) -> list[tuple[str, object]]:
+    captured: list[tuple[str, object]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        call()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+    return captured
+
+
+def query_plan(statement: str, parameters: object) -> list[str]:
+    rows = db.session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return [row.detail for row in rows]
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_repository_queries_use_indexes(app, name):
+    statements = captured_statements(HOT_QUERIES[name])
+    assert statements, f"{name} did not execute any SELECT"
+    for statement, parameters in statements:
+        plan = query_plan(statement, parameters)
+        full_scans = [step for step in plan if FULL_SCAN.match(step)]
+        assert not full_scans, f"{name} regressed to a full table scan: {plan}"
+
+
+def test_upgrade_schema_adds_indexes_to_existing_database(app):
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql("DROP INDEX ix_rentals_active_due_date")
+        connection.exec_driver_sql("DROP INDEX ix_payments_paid_date")
+
+    assert sorted(upgrade_schema()) == ["index ix_payments_paid_date", "index ix_rentals_active_due_date"]
+    assert upgrade_schema() == []
+
+
+def test_upgrade_schema_backfills_new_revenue_rollup(app):
+    from library_app.services import revenue_repository
+
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql("DROP TABLE daily_revenue")
+
+    assert upgrade_schema() == ["table daily_revenue", "backfill daily_revenue"]
+    assert revenue_repository.all() == []
+
+
+def test_upgrade_schema_backfills_unread_counters(app):
+    from library_app.models.notification import Notification
+    from library_app.models.reader import Reader
+
+    reader = Reader(full_name="Читач", address="вул. 1", phone="+380")
+    db.session.add(reader)
+    db.session.flush()
+    db.session.add_all(
+        Notification(reader_id=reader.id, message=message, is_read=message == "c") for message in "abc"
+    )
+    db.session.commit()
+    reader_id = reader.id
+    db.session.close()
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql("ALTER TABLE readers DROP COLUMN unread_notifications")
+
+    assert upgrade_schema() == ["column readers.unread_notifications", "backfill readers.unread_notifications"]
+    assert notification_repository.unread_count(reader_id) == 2
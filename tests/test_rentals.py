@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from library_app.models.book import Book
+from library_app.models.reader import ReaderCategory
+from library_app.repositories.pagination import encode_cursor
+from library_app.services import book_repository, payment_repository, reader_repository
+from library_app.services.reader_factory import get_reader_creator
+from test_auth import signup_payload
+
+
+def login_admin(client) -> None:
+    client.post("/auth/signup", data=signup_payload("admin@example.com"))
+
+
+def create_books_and_readers() -> tuple[list[Book], list[int]]:
+    books = [
+        Book(
+            title=f"Книга {index}",
+            author="Автор",
+            genre="Проза",
+            collateral_value=100.0,
+            daily_rent_price=10.0,
+            available_copies=copies,
+        )
+        for index, copies in enumerate((2, 1))
+    ]
+    for book in books:
+        book_repository.add(book)
+    vip = get_reader_creator(ReaderCategory.VIP).create_reader("VIP Гість", "пр. Свободи, 10", "+380111111111")
+    reader_repository.add(vip)
+    return books, [1, vip.id]
+
+
+def test_batch_rent_and_return_report_partial_failures(app, client, sql_statements):
+    login_admin(client)
+    (first, second), (admin_reader, vip_reader) = create_books_and_readers()
+
+    sql_statements.clear()
+    response = client.post(
+        "/rentals/batch",
+        json={
+            "items": [
+                {"book_id": first.id, "reader_id": admin_reader, "days": 7},
+                {"book_id": second.id, "reader_id": vip_reader},
+                {"book_id": second.id, "reader_id": admin_reader},
+                {"book_id": 999, "reader_id": admin_reader},
+                {"reader_id": admin_reader},
+            ]
+        },
+    )
+    assert response.status_code == 207
+    body = response.get_json()
+    assert (body["succeeded"], body["failed"]) == (2, 3)
+    statuses = [(r["index"], r["status"], r.get("error")) for r in body["results"]]
+    assert statuses == [
+        (0, "ok", None),
+        (1, "ok", None),
+        (2, "error", "No available copies"),
+        (3, "error", "Book or reader not found"),
+        (4, "error", "Invalid item"),
+    ]
+    # Книги та читачі завантажуються двома запитами IN, а не по одному на позицію.
+    assert sum(1 for s in sql_statements if "FROM books" in s and "IN" in s) == 1
+
+    rental_ids = [r["rental_id"] for r in body["results"][:2]]
+    response = client.post(
+        "/rentals/batch-return",
+        json={"items": [{"rental_id": rental_ids[0]}, {"rental_id": rental_ids[1]}, {"rental_id": rental_ids[1]}]},
+    )
+    assert response.status_code == 207
+    results = response.get_json()["results"]
+    assert [r["status"] for r in results] == ["ok", "ok", "error"]
+    assert results[1]["discount_applied"] == 2.0  # VIP: 20% від 10 грн за день
+    assert results[2]["error"] == "Rental already closed"
+    assert len(list(payment_repository.all())) == 2
+    assert [book_repository.get(b.id).available_copies for b in (first, second)] == [2, 1]
+
+
+def test_batch_endpoints_validate_payload(app, client):
+    login_admin(client)
+    assert client.post("/rentals/batch", json={"items": []}).status_code == 400
+    assert client.post("/rentals/batch-return", json={"rentals": [1]}).status_code == 400
+    assert client.post("/rentals/batch", json=[1, 2]).status_code == 400
+    assert client.post("/rentals/batch-return", json="items").status_code == 400
+
+    (book, _), (reader, _) = create_books_and_readers()
+    items = [{"book_id": book.id, "reader_id": reader, "days": days} for days in (-30, 0, 10**9, 7)]
+    response = client.post("/rentals/batch", json={"items": items})
+    assert response.status_code == 207
+    assert [r["status"] for r in response.get_json()["results"]] == ["error", "error", "error", "ok"]
+    single = {"book_id": book.id, "reader_id": reader, "days": 10**9}
+    assert client.post("/rentals/", json=single).status_code == 400
+
+
+def test_list_endpoints_page_with_stable_cursors(app, client):
+    login_admin(client)
+    create_books_and_readers()
+    headers = {"Accept": "application/json"}
+
+    first = client.get("/books/?limit=1", headers=headers).get_json()
+    assert len(first["items"]) == 1 and first["next_cursor"]
+    book_repository.add(
+        Book(title="Нова", author="Автор", genre="Проза", collateral_value=1.0, daily_rent_price=1.0)
+    )
+    second = client.get(f"/books/?limit=2&cursor={first['next_cursor']}", headers=headers).get_json()
+    assert [book["title"] for book in first["items"] + second["items"]] == ["Книга 0", "Книга 1", "Нова"]
+    assert second["next_cursor"] is None
+
+    assert client.get("/books/?cursor=not-a-cursor", headers=headers).status_code == 400
+    for forged in ([[1]], [{"a": 1}], ["Книга 0", 1], [True]):
+        cursor = encode_cursor(forged)
+        assert client.get(f"/books/?cursor={cursor}", headers=headers).status_code == 400
+    for forged in ([123, 1], ["not-a-date", 1]):
+        response = client.get(f"/notifications/?cursor={encode_cursor(forged)}", headers=headers)
+        assert (response.status_code, response.get_json()) == (400, {"error": "invalid_cursor"})
+    assert "Далі" in client.get("/readers/?limit=1").get_data(as_text=True)
+
+
+def test_financial_report_endpoint_validates_group_by(app, client):
+    login_admin(client)
+    url = "/reports/financial?start=2024-01-01&end=2024-12-31"
+
+    assert client.get(f"{url}&group_by=year").status_code == 400
+    body = client.get(f"{url}&group_by=month").get_json()
+    assert body == {"total_income": 0.0, "payments_count": 0, "group_by": "month", "buckets": []}
+
+
+def test_report_exports_stream_csv_ndjson_and_gzip(app, client):
+    import csv
+    import gzip
+    import io
+    import json
+    from datetime import date
+
+    from library_app.services.rental_service import rental_service
+
+    login_admin(client)
+    (first, second), (admin_reader, vip_reader) = create_books_and_readers()
+    rental = rental_service.rent_book(first.id, vip_reader, days=7)
+    rental_service.rent_book(second.id, admin_reader, days=7)
+    rental_service.return_book(rental.id)
+
+    response = client.get("/reports/export/rentals")
+    assert response.mimetype == "text/csv" and response.is_streamed
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [(row["book_title"], row["reader_name"]) for row in rows] == [
+        ("Книга 0", "VIP Гість"),
+        ("Книга 1", "Тестовий Користувач"),
+    ]
+
+    payments = client.get("/reports/export/payments?format=ndjson&gzip=1")
+    assert payments.headers["Content-Encoding"] == "gzip"
+    [payment] = [json.loads(line) for line in gzip.decompress(payments.get_data()).splitlines()]
+    assert payment["rental_id"] == rental.id and payment["reader_category"] == "vip"
+
+    tomorrow = date.fromordinal(date.today().toordinal() + 1).isoformat()
+    filtered = client.get(f"/reports/export/rentals?start={tomorrow}").get_data(as_text=True)
+    assert filtered.strip().count("\n") == 0  # лише заголовок
+    assert client.get("/reports/export/everything").status_code == 404
+    assert client.get("/reports/export/rentals?format=xml").status_code == 400
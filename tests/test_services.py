@@ -13,6 +13,7 @@ from library_app.services import (
     reader_repository,
     rental_repository,
     payment_repository,
+    revenue_repository,
 )
 
 
@@ -95,3 +96,461 @@ def test_overdue_notification_generated(app):
     assert len(notifications) == 1
     assert reader.full_name in notifications[0].message
 
+
+def test_search_available_uses_ranked_prefix_index(app):
+    book, _ = create_sample_data()
+    book_repository.add(
+        Book(
+            title="Фентезі для початківців",
+            author="Невідомий",
+            genre="Довідник",
+            collateral_value=50.0,
+            daily_rent_price=5.0,
+            available_copies=1,
+        )
+    )
+    book_repository.add(
+        Book(
+            title="Гобіт",
+            author="Дж.Р.Р. Толкін",
+            genre="Фентезі",
+            collateral_value=80.0,
+            daily_rent_price=8.0,
+            available_copies=0,
+        )
+    )
+
+    assert [b.title for b in book_repository.search_available("толк")] == ["Володар Перснів"]
+    titles = [b.title for b in book_repository.search_available("фентез")]
+    assert titles == ["Фентезі для початківців", "Володар Перснів"]
+
+    book.title = "Сильмариліон"
+    book_repository.update()
+    assert [b.title for b in book_repository.search_available("сильмар")] == ["Сильмариліон"]
+    assert book_repository.search_available("володар") == []
+
+
+def test_readers_rental_report_uses_constant_query_count(app, sql_statements):
+    from library_app.services.report_service import report_service
+
+    def seed_readers(count: int) -> None:
+        book, _ = create_sample_data()
+        for index in range(count):
+            reader = get_reader_creator(ReaderCategory.VIP).create_reader(
+                full_name=f"Читач {index}", address="вул. Тестова, 1", phone="+380000000001"
+            )
+            reader_repository.add(reader)
+            first = rental_service.rent_book(book.id, reader.id, days=7)
+            rental_service.rent_book(book.id, reader.id, days=7)
+            rental_service.return_book(first.id)
+            book.available_copies = 3
+            book_repository.update()
+
+    seed_readers(2)
+    db.session.expire_all()
+    sql_statements.clear()
+    small = report_service.readers_rental_report()
+    small_count = len(sql_statements)
+
+    seed_readers(8)
+    db.session.expire_all()
+    sql_statements.clear()
+    large = report_service.readers_rental_report()
+
+    assert len(sql_statements) == small_count <= 2
+    assert len(large) == len(small) + 9
+    vip = large[1]
+    assert (vip.total_rentals, vip.active_rentals) == (2, 1)
+    assert vip.book_rentals == [{"book_title": "Володар Перснів", "rental_count": 2}]
+    assert large[0].total_rentals == 0 and large[0].book_rentals == []
+
+
+def test_book_inventory_report_counts_unreturned_and_pages(app):
+    from library_app.services.report_service import report_service
+
+    book, reader = create_sample_data()
+    second = Book(
+        title="Кобзар",
+        author="Тарас Шевченко",
+        genre="Поезія",
+        collateral_value=60.0,
+        daily_rent_price=6.0,
+        available_copies=2,
+    )
+    book_repository.add(second)
+    returned = rental_service.rent_book(book.id, reader.id, days=7)
+    rental_service.rent_book(book.id, reader.id, days=7)
+    rental_service.return_book(returned.id)
+
+    items = report_service.book_inventory_report()
+    assert [(i.title, i.available_copies, i.lent_out) for i in items] == [
+        ("Володар Перснів", 2, 1),
+        ("Кобзар", 2, 0),
+    ]
+
+    first_page = report_service.book_inventory_report(limit=1)
+    assert [i.book_id for i in first_page] == [book.id]
+    next_page = report_service.book_inventory_report(limit=1, after_id=first_page[-1].book_id)
+    assert [i.book_id for i in next_page] == [second.id]
+    assert list(report_service.iter_book_inventory(chunk_size=1)) == items
+
+
+def test_check_all_rentals_batches_and_deduplicates_per_day(app, sql_statements):
+    from library_app.models.notification import NotificationKind
+
+    NotificationService.bootstrap()
+    book, reader = create_sample_data()
+    overdue = rental_service.rent_book(book.id, reader.id, days=1)
+    overdue.due_date = date.today() - timedelta(days=2)
+    due_today = rental_service.rent_book(book.id, reader.id, days=0)
+    rental_service.rent_book(book.id, reader.id, days=5)
+    db.session.commit()
+
+    sql_statements.clear()
+    assert NotificationService.check_all_rentals() == 2
+    inserts = [s for s in sql_statements if s.startswith("INSERT INTO notifications")]
+    assert len(inserts) == 1
+
+    kinds = {n.rental_id: n.kind for n in notification_repository.all()}
+    assert kinds == {overdue.id: NotificationKind.OVERDUE, due_today.id: NotificationKind.DUE_TODAY}
+    assert NotificationService.check_all_rentals() == 0
+    assert len(list(notification_repository.all())) == 2
+
+
+def test_scheduler_lease_runs_overdue_sweep_once_per_interval(app):
+    from datetime import datetime
+
+    from library_app.services import job_lease_repository
+    from library_app.services.scheduler import OVERDUE_SWEEP_JOB, init_scheduler, last_sweep_at
+
+    book, reader = create_sample_data()
+    rental = rental_service.rent_book(book.id, reader.id, days=1)
+    rental.due_date = date.today() - timedelta(days=1)
+    db.session.commit()
+
+    first, second = init_scheduler(app), init_scheduler(app)
+    now = datetime.utcnow()
+    assert first.run_pending(now) == [OVERDUE_SWEEP_JOB]
+    assert len(list(notification_repository.all())) == 1
+    assert last_sweep_at() is not None
+
+    # Інтервал ще не минув — жоден воркер не запускає задачу повторно.
+    assert second.run_pending(now) == []
+
+    # Поки lease утримує інший воркер, задача не виконується навіть після інтервалу.
+    later = now + timedelta(seconds=app.config["OVERDUE_SWEEP_INTERVAL"] + 1)
+    assert job_lease_repository.try_acquire(
+        OVERDUE_SWEEP_JOB, first.owner, later, first.lease_for, due_before=later
+    )
+    assert second.run_pending(later) == []
+    assert second.run_pending(later + first.lease_for + timedelta(seconds=1)) == [OVERDUE_SWEEP_JOB]
+
+
+def test_unit_of_work_commits_once_and_rolls_back_on_error(app):
+    import pytest
+    from sqlalchemy import event
+
+    from library_app.repositories import unit_of_work
+
+    commits: list[int] = []
+    event.listen(db.engine, "commit", lambda conn: commits.append(1))
+    book, reader = create_sample_data()
+
+    commits.clear()
+    rental = rental_service.rent_book(book.id, reader.id, days=3)
+    assert len(commits) == 1
+    commits.clear()
+    rental_service.return_book(rental.id)
+    assert len(commits) == 1
+
+    with pytest.raises(RuntimeError):
+        with unit_of_work():
+            reader_repository.add(
+                get_reader_creator(ReaderCategory.REGULAR).create_reader("Тимчасовий", "вул. 1", "+380")
+            )
+            with unit_of_work():
+                book_repository.update()
+            raise RuntimeError("boom")
+    assert [r.full_name for r in reader_repository.all()] == [reader.full_name]
+
+
+def test_nested_unit_of_work_and_repository_writes_roll_back_with_the_block(app):
+    import pytest
+
+    from library_app.models.notification import Notification
+    from library_app.repositories import unit_of_work
+
+    book, reader = create_sample_data()
+    creator = get_reader_creator(ReaderCategory.REGULAR)
+
+    with unit_of_work():
+        try:
+            with unit_of_work():
+                reader_repository.add(creator.create_reader("Внутрішній", "вул. 2", "+380"))
+                raise RuntimeError("inner")
+        except RuntimeError:
+            pass
+        reader_repository.add(creator.create_reader("Зовнішній", "вул. 3", "+380"))
+    names = sorted(r.full_name for r in reader_repository.all())
+    assert names == sorted([reader.full_name, "Зовнішній"])
+
+    with pytest.raises(RuntimeError):
+        with unit_of_work():
+            with unit_of_work():
+                reader_repository.add(creator.create_reader("Вкладений", "вул. 4", "+380"))
+            raise RuntimeError("outer")
+    assert len(list(reader_repository.all())) == 2
+
+    with pytest.raises(RuntimeError):
+        with unit_of_work():
+            notification_repository.add_many([Notification(reader_id=reader.id, message="Чернетка")])
+            raise RuntimeError("boom")
+    assert notification_repository.all() == []
+    assert notification_repository.unread_count(reader.id) == 0
+
+
+def test_concurrent_rentals_never_oversell_last_copies(app):
+    import threading
+
+    from library_app.models.rental import Rental
+    from library_app.services.rental_service import RentalError
+
+    book, reader = create_sample_data()
+    book.available_copies = 10
+    book_repository.update()
+    book_id, reader_id = book.id, reader.id
+    outcomes: list[str] = []
+    start = threading.Barrier(8)
+
+    def hammer() -> None:
+        with app.app_context():
+            start.wait()
+            for _ in range(5):
+                try:
+                    rental_service.rent_book(book_id, reader_id, days=7)
+                    outcomes.append("rented")
+                except RentalError:
+                    outcomes.append("sold_out")
+            db.session.remove()
+
+    threads = [threading.Thread(target=hammer) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    db.session.expire_all()
+    assert outcomes.count("rented") == 10
+    assert outcomes.count("sold_out") == 30
+    assert book_repository.get(book_id).available_copies == 0
+    assert Rental.query.filter_by(book_id=book_id).count() == 10
+
+
+def test_catalog_cache_serves_hits_and_invalidates_on_stock_changes(app, sql_statements):
+    from library_app.services.catalog_service import catalog_service
+
+    book, reader = create_sample_data()
+    stats = catalog_service.cache().stats
+
+    assert [entry.available_copies for entry in catalog_service.available_books()] == [3]
+    sql_statements.clear()
+    catalog_service.available_books()
+    assert sql_statements == []
+    assert (stats.hits, stats.misses) == (1, 1)
+
+    rental = rental_service.rent_book(book.id, reader.id, days=3)
+    assert [entry.available_copies for entry in catalog_service.available_books()] == [2]
+    rental_service.return_book(rental.id)
+    assert [entry.available_copies for entry in catalog_service.available_books()] == [3]
+
+    book.title = "Гобіт"
+    db.session.rollback()
+    assert catalog_service.available_books("гобіт") == []
+    book.title = "Гобіт"
+    book_repository.update()
+    assert [entry.title for entry in catalog_service.available_books("гобіт")] == ["Гобіт"]
+
+
+def test_financial_report_aggregates_rollup_with_buckets(app, sql_statements):
+    from datetime import datetime
+
+    from library_app.models.payment import Payment
+    from library_app.models.rental import Rental
+    from library_app.services.report_service import PaymentGrouping, report_service
+
+    book, reader = create_sample_data()
+    rental = Rental(book_id=book.id, reader_id=reader.id, rent_date=date(2024, 1, 1), due_date=date(2024, 1, 8))
+    rental_repository.add(rental)
+    for paid, amount in ((datetime(2024, 1, 1, 9), 10.0), (datetime(2024, 1, 7, 18), 5.0), (datetime(2024, 2, 2), 20.0)):
+        payment_repository.stage(Payment(rental_id=rental.id, total_amount=amount, paid_date=paid))
+    payment_repository.update()
+    revenue_repository.rebuild()
+
+    sql_statements.clear()
+    summary = report_service.financial_report(date(2024, 1, 1), date(2024, 1, 31))
+    assert (summary.total_income, summary.payments_count) == (15.0, 2)
+    assert len(sql_statements) == 1
+
+    def buckets(group_by):
+        rows = report_service.financial_breakdown(date(2024, 1, 1), date(2024, 12, 31), group_by)
+        return [(row.key, row.total_income, row.payments_count) for row in rows]
+
+    assert buckets(PaymentGrouping.DAY) == [("2024-01-01", 10.0, 1), ("2024-01-07", 5.0, 1), ("2024-02-02", 20.0, 1)]
+    assert buckets(PaymentGrouping.WEEK) == [("2024-01-01", 15.0, 2), ("2024-01-29", 20.0, 1)]
+    assert buckets(PaymentGrouping.MONTH) == [("2024-01", 15.0, 2), ("2024-02", 20.0, 1)]
+    assert buckets(PaymentGrouping.CATEGORY) == [("regular", 35.0, 3)]
+    assert buckets(PaymentGrouping.GENRE) == [("Фентезі", 35.0, 3)]
+
+
+def test_returns_keep_daily_revenue_in_step_with_payments(app):
+    from library_app.models.daily_revenue import DailyRevenue
+    from library_app.services.rental_service import ReturnRequest
+    from library_app.services.report_service import report_service
+
+    book, reader = create_sample_data()
+    first = rental_service.rent_book(book.id, reader.id, days=3)
+    second = rental_service.rent_book(book.id, reader.id, days=3)
+    third = rental_service.rent_book(book.id, reader.id, days=3)
+    rental_service.return_book(first.id)
+    rental_service.return_books([ReturnRequest(second.id), ReturnRequest(third.id, damage_amount=7.0)])
+
+    payments = list(payment_repository.all())
+    today = payments[0].paid_date.date()  # UTC-день платежу
+    paid = sum(payment.total_amount for payment in payments)
+    summary = report_service.financial_report(today, today)
+    assert (summary.payments_count, summary.total_income) == (3, paid)
+
+    def rollup():
+        db.session.expire_all()
+        return [(r.day, r.category, r.genre, r.payments_count, r.total_amount) for r in DailyRevenue.query]
+
+    incremental = rollup()
+    revenue_repository.rebuild()
+    assert incremental == rollup() == [(today, ReaderCategory.REGULAR, "Фентезі", 3, paid)]
+
+
+def test_payment_corrections_and_deletions_adjust_daily_revenue(app):
+    from datetime import datetime
+
+    from library_app.models.daily_revenue import DailyRevenue
+
+    book, reader = create_sample_data()
+    vip = get_reader_creator(ReaderCategory.VIP).create_reader("VIP", "вул. 2", "+380")
+    reader_repository.add(vip)
+    rentals = [rental_service.rent_book(book.id, reader.id, days=3) for _ in range(3)]
+    for rental in rentals:
+        rental_service.return_book(rental.id)
+
+    def rollup():
+        db.session.expire_all()
+        rows = DailyRevenue.query.order_by(DailyRevenue.day, DailyRevenue.category)
+        return [(r.day, r.category, r.genre, r.payments_count, round(r.total_amount, 6)) for r in rows]
+
+    def assert_matches_rebuild():
+        incremental = rollup()
+        revenue_repository.rebuild()
+        assert incremental == rollup()
+
+    payment = rentals[0].payments[0]
+    payment.total_amount += 12.5
+    payment.paid_date = datetime(2024, 3, 1, 12)
+    payment_repository.update()
+    assert_matches_rebuild()
+
+    rentals[1].reader_id = vip.id
+    rental_repository.update()
+    assert_matches_rebuild()
+    assert {row[1] for row in rollup()} == {ReaderCategory.REGULAR, ReaderCategory.VIP}
+
+    rental_repository.delete(rentals[0])
+    assert_matches_rebuild()
+    assert date(2024, 3, 1) not in {row[0] for row in rollup()}
+
+    reader_repository.delete(vip)
+    assert_matches_rebuild()
+    assert [row[3] for row in rollup()] == [1]
+
+    reader.category = ReaderCategory.VIP
+    book.genre = "Поезія"
+    book_repository.update()
+    assert_matches_rebuild()
+    assert [row[1:3] for row in rollup()] == [(ReaderCategory.VIP, "Поезія")]
+
+
+def test_profile_stats_follow_returns_and_match_rebuild(app):
+    from library_app.models.reader_genre_stats import ReaderGenreStats
+    from library_app.services import reader_stats_repository
+    from library_app.services.profile_service import profile_service
+    from library_app.services.rental_service import ReturnRequest
+
+    fantasy, reader = create_sample_data()
+    poetry = Book(
+        title="Кобзар",
+        author="Т. Шевченко",
+        genre="Поезія",
+        collateral_value=50.0,
+        daily_rent_price=5.0,
+        available_copies=3,
+    )
+    book_repository.add(poetry)
+    assert profile_service.get_profile_stats(reader).books_read == 0
+
+    first_fantasy = rental_service.rent_book(fantasy.id, reader.id, days=3)
+    first_poetry = rental_service.rent_book(poetry.id, reader.id, days=3)
+    second_poetry = rental_service.rent_book(poetry.id, reader.id, days=3)
+    second_fantasy = rental_service.rent_book(fantasy.id, reader.id, days=3)
+    rental_service.rent_book(fantasy.id, reader.id, days=3)  # не повернена — не рахується
+
+    # Повернення не за порядком видачі: нічия 2:2 вирішується на користь жанру, виданого раніше.
+    rental_service.return_book(second_poetry.id)
+    rental_service.return_books([ReturnRequest(second_fantasy.id), ReturnRequest(first_poetry.id)])
+    rental_service.return_book(first_fantasy.id)
+
+    stats = profile_service.get_profile_stats(reader)
+    assert (stats.books_read, stats.favorite_genre) == (4, "Фентезі")
+
+    def rows():
+        db.session.expire_all()
+        return sorted((r.reader_id, r.genre, r.books_read, r.first_rental_id) for r in ReaderGenreStats.query)
+
+    incremental = rows()
+    reader_stats_repository.rebuild()
+    assert incremental == rows() == [
+        (reader.id, "Поезія", 2, first_poetry.id),
+        (reader.id, "Фентезі", 2, first_fantasy.id),
+    ]
+
+    fantasy.genre = "Проза"
+    book_repository.update()
+    incremental = rows()
+    reader_stats_repository.rebuild()
+    assert incremental == rows() == [
+        (reader.id, "Поезія", 2, first_poetry.id),
+        (reader.id, "Проза", 2, first_fantasy.id),
+    ]
+
+    reader_repository.delete(reader)
+    assert rows() == []
+
+
+def test_notified_rentals_use_local_day_bounds(app, monkeypatch):
+    import time
+    from datetime import datetime
+
+    from library_app.models.notification import Notification
+
+    monkeypatch.setenv("TZ", "Europe/Kyiv")  # UTC+2 у січні
+    time.tzset()
+    try:
+        book, reader = create_sample_data()
+        rentals = [rental_service.rent_book(book.id, reader.id, days=1) for _ in range(3)]
+        created = [datetime(2024, 1, 14, 21, 30), datetime(2024, 1, 14, 22, 30), datetime(2024, 1, 15, 22, 30)]
+        for rental, created_at in zip(rentals, created):
+            notification_repository.add(
+                Notification(reader_id=reader.id, rental_id=rental.id, message="#", created_at=created_at)
+            )
+        # Локальна доба 15.01 — це [14.01 22:00, 15.01 22:00) UTC.
+        assert notification_repository.rental_ids_notified_on(date(2024, 1, 15)) == {rentals[1].id}
+    finally:
+        monkeypatch.undo()
+        time.tzset()